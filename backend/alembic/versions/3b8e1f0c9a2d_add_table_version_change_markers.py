@@ -0,0 +1,48 @@
+"""Add table_version change markers for ETag support
+
+Revision ID: 3b8e1f0c9a2d
+Revises: c6ded5412a59
+Create Date: 2026-01-12 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e1f0c9a2d'
+down_revision: Union[str, Sequence[str], None] = 'c6ded5412a59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = [
+    'person',
+    'artist',
+    'artistperson',
+    'album',
+    'album_artist',
+    'track',
+    'trackartist',
+    'track_person_share',
+    'excel_reports',
+    'raw_usage_data_strict',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table_version = op.create_table('table_version',
+    sa.Column('table_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    # Строки заводим сразу: приложение только увеличивает счётчики через UPDATE
+    op.bulk_insert(table_version, [{'table_name': name, 'version': 0} for name in TRACKED_TABLES])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_version')
@@ -0,0 +1,136 @@
+"""Partition raw_usage_data_strict by excel_report_id (PostgreSQL)
+
+Revision ID: 5d1a9c3e7b20
+Revises: 8f4c2a7d1e5b
+Create Date: 2026-01-26 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1a9c3e7b20'
+down_revision: Union[str, Sequence[str], None] = '8f4c2a7d1e5b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'raw_usage_data_strict'
+LEGACY_TABLE = 'raw_usage_data_strict_legacy'
+ID_SEQUENCE = 'raw_usage_data_strict_id_seq'
+DEFAULT_PARTITION = 'raw_usage_data_strict_default'
+
+# Индексы, заведённые на родительской таблице, PostgreSQL создаёт и на каждой секции
+INDEXES = [
+    ('ix_raw_usage_data_strict_id', ['id']),
+    ('ix_raw_usage_data_strict_excel_report_id', ['excel_report_id']),
+    ('ix_raw_usage_data_strict_isrc', ['isrc']),
+    ('ix_raw_usage_data_strict_report_row', ['excel_report_id', 'row_index']),
+    ('ix_raw_usage_data_strict_report_status', ['excel_report_id', 'processed_status']),
+]
+
+
+def _data_columns():
+    return [
+        sa.Column('excel_report_id', sa.Integer(), nullable=False),
+        sa.Column('row_index', sa.Integer(), nullable=False),
+        sa.Column('period', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('platform', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('right_type', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('territory', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('content_type', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('usage_type', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('performer_name_excel', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('track_title_excel', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('album_title_excel', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('author_words_name_excel', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('author_music_name_excel', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('licensor_share_author_percent', sa.Numeric(precision=10, scale=4), nullable=True),
+        sa.Column('licensor_share_neighboring_percent', sa.Numeric(precision=10, scale=4), nullable=True),
+        sa.Column('isrc', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('upc', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('copyright', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=True),
+        sa.Column('total_royalty_author', sa.Numeric(precision=15, scale=4), nullable=True),
+        sa.Column('total_royalty_neighboring', sa.Numeric(precision=15, scale=4), nullable=True),
+        sa.Column('licensor_share_author_licensor_percent', sa.Numeric(precision=10, scale=4), nullable=True),
+        sa.Column('licensor_share_neighboring_licensor_percent', sa.Numeric(precision=10, scale=4), nullable=True),
+        sa.Column('calculated_royalty_author', sa.Numeric(precision=15, scale=4), nullable=True),
+        sa.Column('calculated_royalty_neighboring', sa.Numeric(precision=15, scale=4), nullable=True),
+        sa.Column('calculated_total_royalty', sa.Numeric(precision=15, scale=4), nullable=True),
+        sa.Column('processed_status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    ]
+
+
+def _column_list() -> str:
+    return ', '.join(['id'] + [column.name for column in _data_columns()])
+
+
+def _rename_legacy_table() -> None:
+    op.rename_table(TABLE, LEGACY_TABLE)
+    # Имена индексов и PK уникальны в схеме — освобождаем их для новой таблицы
+    op.execute(f'ALTER TABLE {LEGACY_TABLE} RENAME CONSTRAINT {TABLE}_pkey TO {LEGACY_TABLE}_pkey')
+    for name, _columns in INDEXES:
+        op.execute(f'ALTER INDEX IF EXISTS {name} RENAME TO {name}_legacy')
+
+
+def _create_indexes() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, TABLE, columns, unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite (локальная разработка) секционирование не поддерживает — таблица остаётся обычной
+        return
+
+    _rename_legacy_table()
+
+    # Ключ секционирования обязан входить в PK; id по-прежнему уникален благодаря общей последовательности
+    op.create_table(TABLE,
+    sa.Column('id', sa.Integer(), server_default=sa.text(f"nextval('{ID_SEQUENCE}')"), autoincrement=False, nullable=False),
+    *_data_columns(),
+    sa.ForeignKeyConstraint(['excel_report_id'], ['excel_reports.id'], ),
+    sa.PrimaryKeyConstraint('excel_report_id', 'id', name=f'{TABLE}_pkey'),
+    postgresql_partition_by='LIST (excel_report_id)',
+    )
+    # Последовательность принадлежала старой таблице и удалилась бы вместе с ней
+    op.execute(f'ALTER SEQUENCE {ID_SEQUENCE} OWNED BY {TABLE}.id')
+    _create_indexes()
+    # Страховка: строки отчёта без своей секции не теряются, а попадают сюда
+    op.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT')
+
+    report_ids = op.get_bind().execute(
+        sa.text(f'SELECT DISTINCT excel_report_id FROM {LEGACY_TABLE} ORDER BY excel_report_id')
+    ).scalars().all()
+    for report_id in report_ids:
+        op.execute(f'CREATE TABLE {TABLE}_p{int(report_id)} PARTITION OF {TABLE} FOR VALUES IN ({int(report_id)})')
+
+    op.execute(f'INSERT INTO {TABLE} ({_column_list()}) SELECT {_column_list()} FROM {LEGACY_TABLE}')
+    op.drop_table(LEGACY_TABLE)
+    op.execute(f'ANALYZE {TABLE}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _rename_legacy_table()
+
+    op.create_table(TABLE,
+    sa.Column('id', sa.Integer(), server_default=sa.text(f"nextval('{ID_SEQUENCE}')"), autoincrement=False, nullable=False),
+    *_data_columns(),
+    sa.ForeignKeyConstraint(['excel_report_id'], ['excel_reports.id'], ),
+    sa.PrimaryKeyConstraint('id', name=f'{TABLE}_pkey'),
+    )
+    op.execute(f'ALTER SEQUENCE {ID_SEQUENCE} OWNED BY {TABLE}.id')
+    op.execute(f'INSERT INTO {TABLE} ({_column_list()}) SELECT {_column_list()} FROM {LEGACY_TABLE}')
+    _create_indexes()
+
+    # Секции удаляются вместе с родительской таблицей
+    op.drop_table(LEGACY_TABLE)
@@ -0,0 +1,121 @@
+"""Dictionary-encode repeated raw_usage_data_strict strings into dimension tables
+
+Revision ID: 7c2e4b9f1a36
+Revises: 5d1a9c3e7b20
+Create Date: 2026-02-02 10:15:00.000000
+
+На PostgreSQL UPDATE всех строк оставляет по мёртвой версии каждой строки, а DROP COLUMN
+не освобождает место удалённых колонок, — без перезаписи таблица становится больше, а не меньше.
+Поэтому миграция завершается VACUUM FULL (перезапись под ACCESS EXCLUSIVE, таблица недоступна
+на время выполнения). Чтобы переписать таблицу без долгой блокировки, запустите
+    alembic -x raw_vacuum=skip upgrade head
+и затем pg_repack --parent-table=raw_usage_data_strict (таблица секционирована — перепаковываются все секции).
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e4b9f1a36'
+down_revision: Union[str, Sequence[str], None] = '5d1a9c3e7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'raw_usage_data_strict'
+VIEW = 'raw_usage_data_strict_decoded'
+
+# Текстовая колонка → справочник; в строках остаётся <колонка>_id
+DIMENSIONS = {
+    'period': 'raw_dim_period',
+    'platform': 'raw_dim_platform',
+    'right_type': 'raw_dim_right_type',
+    'territory': 'raw_dim_territory',
+    'content_type': 'raw_dim_content_type',
+    'usage_type': 'raw_dim_usage_type',
+    'copyright': 'raw_dim_copyright',
+    'performer_name_excel': 'raw_dim_performer',
+}
+
+# Колонки представления — поля RawUsageDataResponse (плюс excel_report_id для фильтра) в их порядке
+VIEW_COLUMNS = [
+    'id', 'excel_report_id', 'row_index', 'period', 'platform', 'right_type', 'territory', 'content_type',
+    'usage_type', 'performer_name_excel', 'track_title_excel', 'album_title_excel', 'author_words_name_excel',
+    'author_music_name_excel', 'licensor_share_author_percent', 'licensor_share_neighboring_percent', 'isrc',
+    'upc', 'copyright', 'quantity', 'total_royalty_author', 'total_royalty_neighboring',
+    'licensor_share_author_licensor_percent', 'licensor_share_neighboring_licensor_percent',
+    'calculated_royalty_author', 'calculated_royalty_neighboring', 'calculated_total_royalty', 'processed_status',
+]
+
+
+def _create_view() -> None:
+    select_list = ',\n    '.join(
+        f'{DIMENSIONS[name]}.value AS {name}' if name in DIMENSIONS else f'r.{name}'
+        for name in VIEW_COLUMNS
+    )
+    joins = '\n'.join(
+        f'LEFT JOIN {dim_table} ON {dim_table}.id = r.{name}_id'
+        for name, dim_table in DIMENSIONS.items()
+    )
+    op.execute(f'CREATE VIEW {VIEW} AS\nSELECT\n    {select_list}\nFROM {TABLE} r\n{joins}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for dim_table in DIMENSIONS.values():
+        op.create_table(dim_table,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('value', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('value')
+        )
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for name, dim_table in DIMENSIONS.items():
+            batch_op.add_column(sa.Column(f'{name}_id', sa.Integer(), sa.ForeignKey(f'{dim_table}.id'), nullable=True))
+
+    # Заполняем справочники различными значениями и переводим строки на ключи — одним UPDATE на все колонки
+    for name, dim_table in DIMENSIONS.items():
+        op.execute(f'INSERT INTO {dim_table} (value) SELECT DISTINCT {name} FROM {TABLE} WHERE {name} IS NOT NULL')
+    op.execute(f'UPDATE {TABLE} SET ' + ', '.join(
+        f'{name}_id = (SELECT d.id FROM {dim_table} d WHERE d.value = {TABLE}.{name})'
+        for name, dim_table in DIMENSIONS.items()
+    ))
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for name in DIMENSIONS:
+            batch_op.drop_column(name)
+
+    _create_view()
+
+    if op.get_bind().dialect.name == 'postgresql':
+        if context.get_x_argument(as_dictionary=True).get('raw_vacuum') == 'skip':
+            # Место вернёт pg_repack (см. описание миграции); статистика нужна сразу
+            op.execute(f'ANALYZE {TABLE}')
+        else:
+            # Перезапись секций: убирает мёртвые версии после UPDATE и место удалённых колонок
+            with op.get_context().autocommit_block():
+                op.execute(f'VACUUM (FULL, ANALYZE) {TABLE}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(f'DROP VIEW IF EXISTS {VIEW}')
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for name in DIMENSIONS:
+            batch_op.add_column(sa.Column(name, sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+    op.execute(f'UPDATE {TABLE} SET ' + ', '.join(
+        f'{name} = (SELECT d.value FROM {dim_table} d WHERE d.id = {TABLE}.{name}_id)'
+        for name, dim_table in DIMENSIONS.items()
+    ))
+
+    with op.batch_alter_table(TABLE) as batch_op:
+        for name in DIMENSIONS:
+            batch_op.drop_column(f'{name}_id')
+
+    for dim_table in reversed(list(DIMENSIONS.values())):
+        op.drop_table(dim_table)
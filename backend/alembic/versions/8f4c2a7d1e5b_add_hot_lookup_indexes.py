@@ -0,0 +1,83 @@
+"""Add indexes for hot lookup columns, draft queues and list views
+
+Revision ID: 8f4c2a7d1e5b
+Revises: 3b8e1f0c9a2d
+Create Date: 2026-01-20 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4c2a7d1e5b'
+down_revision: Union[str, Sequence[str], None] = '3b8e1f0c9a2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Условия частичных индексов. PostgreSQL сводит is_approved = true к is_approved сам,
+# а SQLite сравнивает условие индекса с WHERE запроса буквально — там оно в том виде,
+# в каком его пишет SQLAlchemy (is_approved = 1 / 0)
+APPROVED = {'postgresql_where': sa.text('is_approved'), 'sqlite_where': sa.text('is_approved = 1')}
+DRAFT = {'postgresql_where': sa.text('NOT is_approved'), 'sqlite_where': sa.text('is_approved = 0')}
+EVERY_ROW = {}
+
+# (имя, таблица, колонки, условие частичного индекса)
+CATALOG_INDEXES = [
+    ('ix_track_isrc_approved', 'track', ['isrc'], APPROVED),
+    ('ix_track_drafts', 'track', ['created_by_user_id', 'id'], DRAFT),
+    # Порядок списка утверждённых и отбор треков в запросе связей с артистами; index-only scan
+    # для самого списка невозможен — он выбирает все колонки TrackResponse, поэтому без INCLUDE
+    ('ix_track_approved_list', 'track', ['id'], APPROVED),
+    ('ix_track_album_id', 'track', ['album_id'], EVERY_ROW),
+    ('ix_album_upc_approved', 'album', ['upc'], APPROVED),
+    ('ix_album_isrc_approved', 'album', ['isrc'], APPROVED),
+    ('ix_album_title', 'album', ['title'], EVERY_ROW),
+    ('ix_album_drafts', 'album', ['created_by_user_id', 'id'], DRAFT),
+    ('ix_artist_isni', 'artist', ['isni'], EVERY_ROW),
+    ('ix_artist_name', 'artist', ['name'], EVERY_ROW),
+    ('ix_artist_drafts', 'artist', ['created_by_user_id', 'id'], DRAFT),
+    ('ix_person_email_approved', 'person', ['email'], APPROVED),
+    ('ix_person_drafts', 'person', ['created_by_user_id', 'id'], DRAFT),
+    # PK связующих таблиц начинается с track_id/album_id/artist_id — индексируем обратное направление
+    ('ix_track_artist_artist_id', 'trackartist', ['artist_id'], EVERY_ROW),
+    ('ix_album_artist_artist_id', 'album_artist', ['artist_id'], EVERY_ROW),
+    ('ix_artist_person_person_id', 'artistperson', ['person_id'], EVERY_ROW),
+    ('ix_track_person_share_person_id', 'track_person_share', ['person_id'], EVERY_ROW),
+]
+
+# Большая таблица строк отчётов: строим без блокировки записи (CONCURRENTLY, вне транзакции)
+RAW_DATA_INDEXES = [
+    ('ix_raw_usage_data_strict_isrc', ['isrc']),
+    ('ix_raw_usage_data_strict_report_row', ['excel_report_id', 'row_index']),
+    ('ix_raw_usage_data_strict_report_status', ['excel_report_id', 'processed_status']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns, where in CATALOG_INDEXES:
+        op.create_index(name, table, columns, unique=False, **where)
+
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, columns in RAW_DATA_INDEXES:
+            op.create_index(
+                name, 'raw_usage_data_strict', columns, unique=False,
+                postgresql_concurrently=is_postgres, if_not_exists=True,
+            )
+
+    # Свежая статистика, чтобы планировщик сразу начал использовать индексы
+    if is_postgres:
+        for table in ('track', 'album', 'artist', 'person', 'raw_usage_data_strict'):
+            op.execute(f'ANALYZE {table}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _columns in reversed(RAW_DATA_INDEXES):
+        op.drop_index(name, table_name='raw_usage_data_strict')
+    for name, table, _columns, _where in reversed(CATALOG_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,103 @@
+"""Add track_artist_share with numeric artist percent per TrackArtist link
+
+Revision ID: b4e8d2a6c913
+Revises: 7c2e4b9f1a36
+Create Date: 2026-02-09 14:30:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8d2a6c913'
+down_revision: Union[str, Sequence[str], None] = '7c2e4b9f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'track_artist_share'
+# Строка «Artist A:60%, Artist B:40%» — была в track.artist_monetization_shares у баз,
+# созданных до миграций; в схеме из миграций этой колонки нет, и переносить нечего
+LEGACY_COLUMN = 'artist_monetization_shares'
+SHARE_RE = re.compile(r'\s*([^:;,]+?)\s*:\s*(\d+(?:[.,]\d+)?)\s*%?\s*(?:[,;]|$)')
+INSERT_CHUNK_SIZE = 1000
+
+
+def _parse(value: str):
+    shares, position = [], 0
+    value = value.strip()
+    while position < len(value):
+        match = SHARE_RE.match(value, position)
+        if not match:
+            return None  # неразборчивая строка — долей для трека не заводим
+        shares.append((match.group(1), round(float(match.group(2).replace(',', '.')), 2)))
+        position = match.end()
+    return shares
+
+
+def _migrate_legacy_strings() -> None:
+    bind = op.get_bind()
+    columns = {column['name'] for column in sa.inspect(bind).get_columns('track')}
+    if LEGACY_COLUMN not in columns:
+        return
+
+    # Два запроса на весь каталог: строки долей и артисты треков с этими строками
+    strings = dict(bind.execute(sa.text(
+        f"SELECT id, {LEGACY_COLUMN} FROM track WHERE {LEGACY_COLUMN} IS NOT NULL AND {LEGACY_COLUMN} <> ''"
+    )).all())
+    artists = {}
+    for track_id, artist_id, name in bind.execute(sa.text(
+        f"SELECT ta.track_id, ta.artist_id, a.name FROM trackartist ta "
+        f"JOIN artist a ON a.id = ta.artist_id "
+        f"JOIN track t ON t.id = ta.track_id "
+        f"WHERE t.{LEGACY_COLUMN} IS NOT NULL AND t.{LEGACY_COLUMN} <> ''"
+    )).all():
+        artists.setdefault(track_id, {})[name] = artist_id
+
+    rows = []
+    for track_id, value in strings.items():
+        shares = _parse(value)
+        if not shares:
+            continue
+        by_name = artists.get(track_id, {})
+        for name, percent in shares:
+            if name in by_name and 0 <= percent <= 100:
+                rows.append({'track_id': track_id, 'artist_id': by_name[name], 'percent': percent})
+
+    # Повтор артиста в строке — берём последнюю долю, как при разборе в API
+    rows = list({(row['track_id'], row['artist_id']): row for row in rows}.values())
+    table = sa.table(
+        TABLE, sa.column('track_id'), sa.column('artist_id'), sa.column('percent'),
+    )
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        op.bulk_insert(table, rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(TABLE,
+    sa.Column('track_id', sa.Integer(), nullable=False),
+    sa.Column('artist_id', sa.Integer(), nullable=False),
+    sa.Column('percent', sa.Numeric(precision=5, scale=2), nullable=False),
+    sa.CheckConstraint('percent >= 0 AND percent <= 100', name='ck_track_artist_share_percent'),
+    sa.ForeignKeyConstraint(
+        ['track_id', 'artist_id'], ['trackartist.track_id', 'trackartist.artist_id'], ondelete='CASCADE',
+    ),
+    sa.PrimaryKeyConstraint('track_id', 'artist_id')
+    )
+    op.create_index('ix_track_artist_share_artist_percent', TABLE, ['artist_id', 'percent'], unique=False)
+
+    _migrate_legacy_strings()
+
+    # Счётчик изменений для ETag карточки трека
+    op.execute(sa.text("INSERT INTO table_version (table_name, version) VALUES (:name, 0)").bindparams(name=TABLE))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("DELETE FROM table_version WHERE table_name = :name").bindparams(name=TABLE))
+    op.drop_index('ix_track_artist_share_artist_percent', table_name=TABLE)
+    op.drop_table(TABLE)
@@ -0,0 +1,44 @@
+"""Add change_outbox journal for catalog change feed
+
+Revision ID: e1c7a3f58b42
+Revises: b4e8d2a6c913
+Create Date: 2026-02-16 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c7a3f58b42'
+down_revision: Union[str, Sequence[str], None] = 'b4e8d2a6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # На PostgreSQL каждая строка помнит транзакцию, которая её записала: лента отдаёт только строки
+    # транзакций старше самой старой незавершённой (см. app/services/outbox.py, read_changes)
+    xid_default = None
+    if op.get_bind().dialect.name == 'postgresql':
+        xid_default = sa.text('(pg_current_xact_id()::text::bigint)')
+    op.create_table('change_outbox',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('entity_type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('op', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.Column('xid', sa.BigInteger(), server_default=xid_default, nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_change_outbox_xid_id', 'change_outbox', ['xid', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_change_outbox_xid_id', table_name='change_outbox')
+    op.drop_table('change_outbox')
@@ -1,15 +1,20 @@
 # app/api/v1/controllers/album.py
 from fastapi import HTTPException, status
-from sqlalchemy import delete
+from sqlalchemy import delete, or_
+from sqlalchemy.orm import selectinload
 from sqlmodel import select
-from typing import List
+from typing import Dict, List
 from app.database import DBSessionDep
 from app.api.v1.models.album import AlbumCreateRequest, AlbumResponse, AlbumDetailResponse, AlbumUpdateRequest
 from app.api.v1.models.artist import ArtistResponse
+from app.api.v1.models.track import TrackResponse
+from app.api.v1.controllers.track import TrackController
+from app.sqlmodels.track import Track
 from app.sqlmodels.album import Album
 from app.sqlmodels.artist import Artist
 from app.sqlmodels.album_artist import AlbumArtist
 from app.sqlmodels.user import User, Role
+from app.services.link_sync import sync_links
 
 class AlbumController:
     def __init__(self, db_session: DBSessionDep):
@@ -124,6 +129,59 @@ class AlbumController:
         albums = result.scalars().all()
         return await self._build_album_detail_list(albums)
 
+    async def _tracks_by_album(self, album_ids: List[int], current_user: User) -> Dict[int, List[TrackResponse]]:
+        """Треки альбомов в формате TrackResponse — два запроса на все альбомы, видимость как у GET /tracks/{id}."""
+        if not album_ids:
+            return {}
+        criteria = [Track.album_id.in_(album_ids)]
+        if current_user.role != Role.ADMIN:
+            criteria.append(or_(Track.is_approved == True, Track.created_by_user_id == current_user.id))
+        tracks: Dict[int, List[TrackResponse]] = {}
+        for row in await TrackController(self.db_session)._build_track_rows(*criteria):
+            tracks.setdefault(row["album_id"], []).append(TrackResponse.model_validate(row))
+        return tracks
+
+    async def get_albums_batch(self, ids: List[int], current_user: User) -> List[AlbumDetailResponse]:
+        """
+        Альбомы по списку id с артистами и треками, как у GET /albums/{id}: запрос на альбомы,
+        один (selectin) на артистов и два на треки всех альбомов.
+        """
+        query = (
+            select(Album)
+            .where(Album.id.in_(ids))
+            .options(selectinload(Album.artists))
+        )
+        if current_user.role != Role.ADMIN:
+            query = query.where(or_(Album.is_approved == True, Album.created_by_user_id == current_user.id))
+        result = await self.db_session.execute(query)
+        by_id = {a.id: a for a in result.scalars().all()}
+        tracks = await self._tracks_by_album(list(by_id), current_user)
+        return [
+            AlbumDetailResponse(
+                id=album.id,
+                title=album.title,
+                type=album.type,
+                release_date=album.release_date,
+                upc=album.upc,
+                artists=[
+                    ArtistResponse(
+                        id=a.id,
+                        name=a.name,
+                        isni=a.isni,
+                        is_approved=a.is_approved,
+                        created_by_user_id=a.created_by_user_id,
+                    )
+                    for a in album.artists
+                ],
+                tracks=tracks.get(album.id, []),
+                version=album.version,
+                subgenre=album.subgenre,
+                isrc=album.isrc,
+                is_approved=album.is_approved,
+            )
+            for album in (by_id[i] for i in dict.fromkeys(ids) if i in by_id)
+        ]
+
     async def get_album_drafts(self, current_user: User) -> List[AlbumDetailResponse]:
         self._ensure_admin(current_user)
         result = await self.db_session.execute(
@@ -224,8 +282,9 @@ class AlbumController:
         else:
             raise HTTPException(status_code=404, detail="Album not found")
 
-        detail_list = await self._build_album_detail_list(albums)
-        return detail_list[0]
+        detail = (await self._build_album_detail_list(albums))[0]
+        detail.tracks = (await self._tracks_by_album([album.id], current_user)).get(album.id, [])
+        return detail
 
     async def update_album(
         self,
@@ -264,9 +323,6 @@ class AlbumController:
                 setattr(album, key, value)
 
         if data.artist_ids is not None:
-            await self.db_session.execute(
-                delete(AlbumArtist).where(AlbumArtist.album_id == album_id)
-            )
             if data.artist_ids:
                 artist_result = await self.db_session.execute(
                     select(Artist).where(Artist.id.in_(data.artist_ids))
@@ -274,8 +330,7 @@ class AlbumController:
                 found = artist_result.scalars().all()
                 if len(found) != len(data.artist_ids):
                     raise HTTPException(status_code=400, detail="Some artist IDs do not exist")
-                for aid in data.artist_ids:
-                    self.db_session.add(AlbumArtist(album_id=album.id, artist_id=aid))
+            await sync_links(self.db_session, AlbumArtist.album_id, album.id, AlbumArtist.artist_id, data.artist_ids)
 
         self.db_session.add(album)
         await self.db_session.commit()
@@ -13,9 +13,10 @@ from app.sqlmodels.artist import Artist
 from app.sqlmodels.person import Person
 from app.sqlmodels.artist_person import ArtistPerson
 from app.sqlmodels.user import User, Role
+from app.services.link_sync import sync_links
 
 from fastapi import HTTPException, status
-from sqlalchemy import delete
+from sqlalchemy import delete, or_
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from typing import List, Optional
@@ -32,6 +33,13 @@ from app.sqlmodels.person import Person
 from app.sqlmodels.artist_person import ArtistPerson
 
 from app.sqlmodels.user import Role
+from app.responses import FastJSONResponse
+
+# Колонки PersonResponse для списков, собираемых из строк запроса
+PERSON_LIST_COLUMNS = (
+    Person.id, Person.first_name, Person.last_name, Person.middle_name, Person.email,
+    Person.phone, Person.is_approved, Person.created_by_user_id,
+)
 
 
 class ArtistController:
@@ -101,24 +109,47 @@ class ArtistController:
             is_approved=new_artist.is_approved,  # ← добавь это в модель!
         )
 
-    async def get_all_artists(self) -> List[ArtistDetailResponse]:
-        result = await self.db_session.execute(
+    async def get_all_artists(self) -> FastJSONResponse:
+        return FastJSONResponse(await self._build_artist_rows(Artist.is_approved == True))
+
+    async def get_artists_batch(self, ids: List[int], current_user: UserResponse) -> List[ArtistDetailResponse]:
+        """Артисты по списку id: один запрос на артистов и один (selectin) на участников."""
+        query = (
             select(Artist)
-            .where(Artist.is_approved == True)
+            .where(Artist.id.in_(ids))
             .options(selectinload(Artist.members))
         )
-        artists = result.scalars().all()
-        return self._build_artist_detail_list(artists)
+        if current_user.role != Role.ADMIN:
+            query = query.where(or_(Artist.is_approved == True, Artist.created_by_user_id == current_user.id))
+        result = await self.db_session.execute(query)
+        by_id = {a.id: a for a in result.scalars().all()}
+        return [self._build_artist_detail(by_id[i]) for i in dict.fromkeys(ids) if i in by_id]
 
-    async def get_artist_drafts(self, current_user: UserResponse) -> List[ArtistDetailResponse]:
+    async def get_artist_drafts(self, current_user: UserResponse) -> FastJSONResponse:
         self._ensure_admin(current_user)
-        result = await self.db_session.execute(
-            select(Artist)
-            .where(Artist.is_approved == False)
-            .options(selectinload(Artist.members))
+        return FastJSONResponse(await self._build_artist_rows(Artist.is_approved == False))
+
+    async def _build_artist_rows(self, *criteria) -> List[dict]:
+        """Список в формате ArtistDetailResponse из строк двух запросов: артисты и их участники."""
+        artists_result = await self.db_session.execute(
+            select(Artist.id, Artist.name, Artist.isni).where(*criteria).order_by(Artist.id)
+        )
+        rows = [dict(row) for row in artists_result.mappings()]
+
+        members_result = await self.db_session.execute(
+            select(ArtistPerson.artist_id, *PERSON_LIST_COLUMNS)
+            .join(Person, Person.id == ArtistPerson.person_id)
+            .join(Artist, Artist.id == ArtistPerson.artist_id)
+            .where(*criteria)
         )
-        drafts = result.scalars().all()
-        return self._build_artist_detail_list(drafts)
+        members_by_artist = {}
+        for row in members_result.mappings():
+            member = dict(row)
+            members_by_artist.setdefault(member.pop("artist_id"), []).append(member)
+
+        for row in rows:
+            row["members"] = members_by_artist.get(row["id"], [])
+        return rows
 
     def _build_artist_detail_list(self, artists) -> List[ArtistDetailResponse]:
         return [self._build_artist_detail(a) for a in artists]
@@ -203,9 +234,6 @@ class ArtistController:
             setattr(artist, key, value)
 
         if data.member_ids is not None:
-            await self.db_session.execute(
-                delete(ArtistPerson).where(ArtistPerson.artist_id == artist_id)
-            )
             if data.member_ids:
                 persons = await self.db_session.execute(
                     select(Person).where(Person.id.in_(data.member_ids))
@@ -213,8 +241,7 @@ class ArtistController:
                 found = persons.scalars().all()
                 if len(found) != len(data.member_ids):
                     raise HTTPException(status_code=400, detail="Some person IDs do not exist")
-                for pid in data.member_ids:
-                    self.db_session.add(ArtistPerson(artist_id=artist.id, person_id=pid))
+            await sync_links(self.db_session, ArtistPerson.artist_id, artist.id, ArtistPerson.person_id, data.member_ids)
 
         self.db_session.add(artist)
         await self.db_session.commit()
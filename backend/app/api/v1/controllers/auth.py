@@ -10,7 +10,8 @@ from typing import Annotated
 
 from fastapi import Depends
 
-from app.services.auth import verify_password
+from app.services.auth import verify_password_async
+from app.services.user_cache import CLAIM as USER_CLAIM, user_claim
 from app.settings import settings
 from app.database import DBSessionDep
 from app.sqlmodels.user import User
@@ -48,7 +49,8 @@ class AuthController:
                 detail="Account is deactivated. Contact administrator."  # ← Сообщение
             )
 
-        if not verify_password(password, user.hashed_password):
+        # bcrypt — в пуле хэширования, цикл событий продолжает обслуживать другие запросы
+        if not await verify_password_async(password, user.hashed_password):
             raise HTTPException(
                 status_code=401,
                 detail="Incorrect email or password"
@@ -56,8 +58,11 @@ class AuthController:
 
         expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
         to_encode = {"sub": user.email, "role": user.role.value}
-        expire = datetime.now(timezone.utc) + timedelta(minutes=expire_minutes)
+        now = datetime.now(timezone.utc)
+        expire = now + timedelta(minutes=expire_minutes)
         to_encode.update({"exp": expire})
+        if settings.USER_CLAIM_TTL_SECONDS > 0:
+            to_encode[USER_CLAIM] = user_claim(user, now.timestamp())
 
         token = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
@@ -0,0 +1,254 @@
+# app/api/v1/controllers/drafts.py
+from dataclasses import dataclass
+from typing import Annotated, Any, Dict, List, Set, Tuple
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import delete, exists, func, literal, union, union_all, update
+from sqlmodel import select
+
+from app.api.v1.models.drafts import (
+    DraftBulkRequest, DraftBulkResponse, DraftClosureResponse, DraftClosureRoot, DraftEntity,
+    DraftCreatorSummary, DraftSummaryResponse,
+)
+from app.database import DBSessionDep
+from app.sqlmodels import (
+    Album, AlbumArtist, Artist, ArtistPerson, Person, Track, TrackArtist, TrackArtistShare, TrackPersonShare,
+    UsageReport,
+)
+from app.sqlmodels.user import User, Role
+
+
+@dataclass(frozen=True)
+class DraftSpec:
+    model: Any
+    # Строки связей, которые удаляются вместе с черновиком (как при отклонении по одному)
+    cascade: Tuple[Any, ...] = ()
+    # Ссылки из других сущностей: пока они есть, черновик не удаляем и возвращаем в skipped_ids
+    blockers: Tuple[Any, ...] = ()
+
+
+DRAFT_SPECS = {
+    DraftEntity.PERSONS: DraftSpec(
+        model=Person,
+        blockers=(
+            ArtistPerson.person_id, TrackPersonShare.person_id,
+            UsageReport.performer_id, UsageReport.author_words_id, UsageReport.author_music_id,
+        ),
+    ),
+    DraftEntity.ARTISTS: DraftSpec(
+        model=Artist,
+        cascade=(ArtistPerson.artist_id,),
+        blockers=(TrackArtist.artist_id, AlbumArtist.artist_id),
+    ),
+    DraftEntity.ALBUMS: DraftSpec(
+        model=Album,
+        cascade=(AlbumArtist.album_id,),
+        blockers=(Track.album_id,),
+    ),
+    DraftEntity.TRACKS: DraftSpec(
+        model=Track,
+        cascade=(TrackArtistShare.track_id, TrackArtist.track_id, TrackPersonShare.track_id),
+        blockers=(UsageReport.track_id,),
+    ),
+}
+
+
+class DraftsController:
+    """Массовое утверждение и отклонение черновиков: несколько set-based запросов в одной транзакции."""
+
+    def __init__(self, db_session: DBSessionDep):
+        self.db_session = db_session
+
+    def _ensure_admin(self, current_user: User) -> None:
+        if current_user.role != Role.ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied: admin only"
+            )
+
+    @staticmethod
+    def _conditions(spec: DraftSpec, data: DraftBulkRequest) -> list:
+        model = spec.model
+        conditions = [model.is_approved == False]
+        if data.ids is not None:
+            conditions.append(model.id.in_(data.ids))
+        if data.created_by_user_id is not None:
+            conditions.append(model.created_by_user_id == data.created_by_user_id)
+        return conditions
+
+    @staticmethod
+    def _response(data: DraftBulkRequest, ids: List[int]) -> DraftBulkResponse:
+        done = set(ids)
+        skipped = sorted(set(data.ids) - done) if data.ids is not None else []
+        return DraftBulkResponse(processed=len(ids), ids=sorted(done), skipped_ids=skipped)
+
+    async def get_summary(self, current_user: User) -> DraftSummaryResponse:
+        """
+        Число черновиков по типам и авторам для бейджей админки — один запрос.
+        Каждая ветка — GROUP BY по частичному индексу ix_<entity>_drafts (created_by_user_id, id)
+        WHERE NOT is_approved: читается только индекс очереди, без строк таблиц и без сборки ответов.
+        """
+        self._ensure_admin(current_user)
+        counts = await self.db_session.execute(union_all(*(
+            select(
+                literal(entity.value).label("entity"),
+                spec.model.created_by_user_id,
+                func.count().label("drafts"),
+            )
+            .where(spec.model.is_approved == False)
+            .group_by(spec.model.created_by_user_id)
+            for entity, spec in DRAFT_SPECS.items()
+        )))
+
+        by_entity = {entity.value: 0 for entity in DRAFT_SPECS}
+        by_creator: Dict[Any, DraftCreatorSummary] = {}
+        for entity, user_id, drafts in counts.all():
+            by_entity[entity] += drafts
+            creator = by_creator.setdefault(user_id, DraftCreatorSummary(created_by_user_id=user_id))
+            setattr(creator, entity, getattr(creator, entity) + drafts)
+            creator.total += drafts
+
+        return DraftSummaryResponse(
+            total=sum(by_entity.values()),
+            by_entity=by_entity,
+            by_creator=sorted(by_creator.values(), key=lambda c: (-c.total, c.created_by_user_id or 0)),
+        )
+
+    async def approve_drafts(
+        self, entity: DraftEntity, data: DraftBulkRequest, current_user: User
+    ) -> DraftBulkResponse:
+        self._ensure_admin(current_user)
+        spec = DRAFT_SPECS[entity]
+        model = spec.model
+
+        result = await self.db_session.execute(
+            update(model)
+            .where(*self._conditions(spec, data))
+            .values(is_approved=True)
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+        ids = list(result.scalars().all())
+        await self.db_session.commit()
+        return self._response(data, ids)
+
+    async def reject_drafts(
+        self, entity: DraftEntity, data: DraftBulkRequest, current_user: User
+    ) -> DraftBulkResponse:
+        self._ensure_admin(current_user)
+        spec = DRAFT_SPECS[entity]
+        model = spec.model
+
+        conditions = self._conditions(spec, data)
+        conditions.extend(~exists().where(column == model.id) for column in spec.blockers)
+
+        # Блокируем выбранные черновики, чтобы их не утвердили параллельно, пока удаляем связи
+        locked = await self.db_session.execute(
+            select(model.id).where(*conditions).with_for_update()
+        )
+        ids = list(locked.scalars().all())
+        if not ids:
+            return self._response(data, ids)
+
+        # Связи и сами черновики — подзапросом по тем же условиям, без списка id в параметрах
+        selected = select(model.id).where(*conditions)
+        for column in spec.cascade:
+            await self.db_session.execute(
+                delete(column.class_)
+                .where(column.in_(selected))
+                .execution_options(synchronize_session=False)
+            )
+        result = await self.db_session.execute(
+            delete(model)
+            .where(*conditions)
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+        ids = list(result.scalars().all())
+        await self.db_session.commit()
+        return self._response(data, ids)
+
+    async def _dependency_closure(self, root: DraftClosureRoot, root_id: int) -> Dict[DraftEntity, List[int]]:
+        """
+        Черновики, от которых зависит трек или альбом: альбом → артисты (трека и альбома) →
+        участники артистов (ArtistPerson) и персоны из долей трека (TrackPersonShare).
+        Один запрос на уровень графа и один — на отбор черновиков.
+        """
+        if root == DraftClosureRoot.TRACKS:
+            album_id = (await self.db_session.execute(
+                select(Track.album_id).where(Track.id == root_id)
+            )).scalar_one_or_none()
+            if album_id is None:
+                raise HTTPException(status_code=404, detail="Track not found")
+            track_ids, album_ids = [root_id], [album_id]
+        else:
+            found = (await self.db_session.execute(
+                select(Album.id).where(Album.id == root_id)
+            )).scalar_one_or_none()
+            if found is None:
+                raise HTTPException(status_code=404, detail="Album not found")
+            track_ids, album_ids = [], [root_id]
+
+        artist_ids: Set[int] = set((await self.db_session.execute(union(
+            select(TrackArtist.artist_id).where(TrackArtist.track_id.in_(track_ids)),
+            select(AlbumArtist.artist_id).where(AlbumArtist.album_id.in_(album_ids)),
+        ))).scalars().all())
+
+        person_ids: Set[int] = set((await self.db_session.execute(union(
+            select(ArtistPerson.person_id).where(ArtistPerson.artist_id.in_(artist_ids)),
+            select(TrackPersonShare.person_id).where(TrackPersonShare.track_id.in_(track_ids)),
+        ))).scalars().all())
+
+        candidates = {
+            DraftEntity.TRACKS: track_ids,
+            DraftEntity.ALBUMS: album_ids,
+            DraftEntity.ARTISTS: artist_ids,
+            DraftEntity.PERSONS: person_ids,
+        }
+        # Уже утверждённые сущности остаются в обходе (их участники могут быть черновиками), но не в результате
+        drafts = await self.db_session.execute(union_all(*(
+            select(literal(entity.value).label("entity"), DRAFT_SPECS[entity].model.id)
+            .where(DRAFT_SPECS[entity].model.id.in_(ids), DRAFT_SPECS[entity].model.is_approved == False)
+            for entity, ids in candidates.items()
+        )))
+        closure: Dict[DraftEntity, List[int]] = {entity: [] for entity in candidates}
+        for entity, entity_id in drafts.all():
+            closure[DraftEntity(entity)].append(entity_id)
+        return {entity: sorted(ids) for entity, ids in closure.items()}
+
+    @staticmethod
+    def _closure_response(closure: Dict[DraftEntity, List[int]]) -> DraftClosureResponse:
+        return DraftClosureResponse(**{entity.value: ids for entity, ids in closure.items()})
+
+    async def preview_closure(
+        self, root: DraftClosureRoot, root_id: int, current_user: User
+    ) -> DraftClosureResponse:
+        self._ensure_admin(current_user)
+        return self._closure_response(await self._dependency_closure(root, root_id))
+
+    async def approve_closure(
+        self, root: DraftClosureRoot, root_id: int, current_user: User
+    ) -> DraftClosureResponse:
+        self._ensure_admin(current_user)
+        closure = await self._dependency_closure(root, root_id)
+
+        # По одному UPDATE на тип сущности; повторная проверка is_approved отсекает параллельные утверждения
+        approved: Dict[DraftEntity, List[int]] = {}
+        for entity, ids in closure.items():
+            model = DRAFT_SPECS[entity].model
+            if not ids:
+                approved[entity] = []
+                continue
+            result = await self.db_session.execute(
+                update(model)
+                .where(model.id.in_(ids), model.is_approved == False)
+                .values(is_approved=True)
+                .returning(model.id)
+                .execution_options(synchronize_session=False)
+            )
+            approved[entity] = sorted(result.scalars().all())
+        await self.db_session.commit()
+        return self._closure_response(approved)
+
+
+DraftsControllerDep = Annotated[DraftsController, Depends(DraftsController)]
@@ -5,7 +5,7 @@ from fastapi import Depends
 
 from app.api.v1.models.user import ManagerCreateRequest, ManagerCreateResponse
 from app.database import DBSessionDep
-from app.services.security import get_password_hash
+from app.services.security import get_password_hash_async
 from app.sqlmodels.user import User, Role
 
 
@@ -22,7 +22,7 @@ class UserController:
 
         new_user = User(
             email=data.email,
-            hashed_password=get_password_hash(data.password),
+            hashed_password=await get_password_hash_async(data.password),
             nickname=data.nickname,
             role=Role.MANAGER,
             is_active=True,
@@ -58,6 +58,7 @@ class UserController:
             raise HTTPException(status_code=400, detail="Only managers can be deactivated through this endpoint")
 
         manager.is_active = False
+        # Кэш пользователей и подписанные данные в уже выданных токенах сбрасываются после commit (app/services/user_cache.py)
         await self.db_session.commit()
 
 
@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status, Depends
+from sqlalchemy import or_
 from sqlmodel import select
 from typing import List, Optional, Annotated
 
@@ -78,6 +79,15 @@ class PersonController:
             PersonResponse.model_validate(p) for p in people
         ]
 
+    async def get_people_batch(self, ids: List[int], current_user: User) -> List[PersonResponse]:
+        """Персоны по списку id одним запросом; невидимые пользователю черновики и несуществующие id пропускаются."""
+        query = select(Person).where(Person.id.in_(ids))
+        if current_user.role != Role.ADMIN:
+            query = query.where(or_(Person.is_approved == True, Person.created_by_user_id == current_user.id))
+        result = await self.db_session.execute(query)
+        by_id = {p.id: p for p in result.scalars().all()}
+        return [PersonResponse.model_validate(by_id[i]) for i in dict.fromkeys(ids) if i in by_id]
+
     async def get_person_drafts(self, current_user: User) -> List[PersonResponse]:
         self._ensure_admin(current_user)
         result = await self.db_session.execute(
@@ -4,17 +4,28 @@ from io import BytesIO
 from typing import Optional, List, Dict, Any
 from fastapi import Depends, HTTPException, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update, func
 import pandas as pd
 import numpy as np
 from decimal import Decimal # Импортируем Decimal
+from datetime import datetime, timedelta
 
 from app.database import DBSessionDep
-from app.sqlmodels.raw_excel_data import ExcelReport, RawUsageDataStrict # Обновляем импорт
+from app.sqlmodels.raw_excel_data import ExcelReport, RawUsageDataStrict, RAW_DIMENSIONS # Обновляем импорт
 # Импортируем новые модели ответов
 from app.api.v1.models.raw_data import (
     ExcelReportResponse, RawUsageDataResponse, UploadRawReportResponse,
-    DeleteReportResponse, GetReportInfoResponse
+    DeleteReportResponse, GetReportInfoResponse,
+    ArchiveReportResponse, PruneArchivedReportsResponse
+)
+from app.responses import FastJSONResponse
+from app.settings import settings
+from app.services import raw_partitions, report_archive
+from app.services.raw_dimensions import DimensionEncoder, raw_usage_data_decoded
+
+# Колонки RawUsageDataResponse в порядке полей модели ответа — из представления с расшифрованными справочниками
+RAW_USAGE_DATA_COLUMNS = tuple(
+    raw_usage_data_decoded.c[name] for name in RawUsageDataResponse.model_fields
 )
 
 def safe_str(value) -> Optional[str]:
@@ -50,6 +61,38 @@ def safe_int(value, default: int = 0) -> int:
     except (ValueError, TypeError):
         return default
 
+def parse_excel_row(index: int, row) -> Dict[str, Any]:
+    """Сопоставляет колонки Excel с полями RawUsageDataResponse (поля справочников — текстом)."""
+    # Используем safe_* функции для безопасного преобразования, .get() — для отсутствующих колонок
+    return dict(
+        row_index=index,
+        period=safe_str(row.get('Период использования')),
+        platform=safe_str(row.get('Площадка')),
+        right_type=safe_str(row.get('Тип прав')),
+        territory=safe_str(row.get('Территория')),
+        content_type=safe_str(row.get('Тип контента')),
+        usage_type=safe_str(row.get('Вид использования')),
+        performer_name_excel=safe_str(row.get('Исполнитель')),
+        track_title_excel=safe_str(row.get('Название трека')),
+        album_title_excel=safe_str(row.get('Название альбома')),
+        author_words_name_excel=safe_str(row.get('Автор слов')),
+        author_music_name_excel=safe_str(row.get('Автор музыки')),
+        licensor_share_author_percent=safe_decimal(row.get('Доля авторских прав Лицензиара')),
+        licensor_share_neighboring_percent=safe_decimal(row.get('Доля смежных прав Лицензиара')),
+        isrc=safe_str(row.get('ISRC')),
+        upc=safe_str(row.get('UPC')),
+        copyright=safe_str(row.get('Копирайт')),
+        quantity=safe_int(row.get('Количество')),
+        total_royalty_author=safe_decimal(row.get('Сумма денежных средств, полученных ЛИЦЕНЗИАТОМ за авторские права')),
+        total_royalty_neighboring=safe_decimal(row.get('Сумма денежных средств, полученных ЛИЦЕНЗИАТОМ за смежные права')),
+        licensor_share_author_licensor_percent=safe_decimal(row.get('Доля монетизации Лицензиара авторских прав')), # Предполагаемое имя колонки
+        licensor_share_neighboring_licensor_percent=safe_decimal(row.get('Доля монетизации Лицензиара смежных прав')), # Предполагаемое имя колонки
+        calculated_royalty_author=safe_decimal(row.get('Вознаграждение ЛИЦЕНЗИАРА за авторские права')), # Предполагаемое имя колонки
+        calculated_royalty_neighboring=safe_decimal(row.get('Вознаграждение ЛИЦЕНЗИАРА за смежные права')), # Предполагаемое имя колонки
+        calculated_total_royalty=safe_decimal(row.get('Итого вознаграждение ЛИЦЕНЗИАРА')), # Предполагаемое имя колонки
+        # Добавь сопоставление для других колонок, если они есть в Excel
+    )
+
 class RawDataController:
     def __init__(self, db_session: DBSessionDep):
         self.db_session = db_session
@@ -58,68 +101,81 @@ class RawDataController:
         if not file.filename.endswith(('.xlsx', '.xls')):
             raise HTTPException(status_code=400, detail="Файл должен быть в формате .xlsx или .xls")
 
+        # 1. Читаем Excel-файл до любых изменений в БД: битый файл не оставляет ни отчёта, ни секции
+        try:
+            file_content = await file.read()
+            df = pd.read_excel(BytesIO(file_content), dtype=object) # dtype=object, чтобы сохранить типы как есть
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Не удалось прочитать Excel-файл: {str(e)}")
+
         try:
-            # 1. Создаем запись об отчете
+            # 2. Создаем запись об отчете и его секцию в raw_usage_data_strict.
+            # Отдельная короткая транзакция: DDL секции блокирует родительскую таблицу только на её время
             excel_report = ExcelReport(
                 filename=file.filename,
                 original_name=file.filename, # Сохраняем оригинальное имя
+                upload_status='processing',
                 description=description or f"Загруженный файл: {file.filename}"
             )
             self.db_session.add(excel_report)
             # flush, чтобы получить ID отчета до commit
             await self.db_session.flush()
+            if raw_partitions.is_partitioned(self.db_session):
+                await raw_partitions.create_report_partition(self.db_session, excel_report.id)
+            await self.db_session.commit()
+            report_id = excel_report.id
+        except Exception as e:
+            await self.db_session.rollback()
+            print(f"Ошибка при обработке файла: {e}")
+            raise HTTPException(status_code=500, detail=f"Ошибка сервера при обработке файла: {str(e)}")
 
-            # 2. Читаем Excel-файл
-            file_content = await file.read()
-            df = pd.read_excel(BytesIO(file_content), dtype=object) # dtype=object, чтобы сохранить типы как есть
-
-            # 3. Сохраняем каждую строку в RawUsageDataStrict
-            for index, row in df.iterrows():
-                # Сопоставляем колонки Excel с полями модели RawUsageDataStrict
-                # Используем safe_* функции для безопасного преобразования
-                raw_data_entry = RawUsageDataStrict(
-                    excel_report_id=excel_report.id,
-                    row_index=index,
-                    # Сопоставление колонок Excel с полями модели
-                    period=safe_str(row.get('Период использования')), # Используем .get() для безопасности
-                    platform=safe_str(row.get('Площадка')),
-                    right_type=safe_str(row.get('Тип прав')),
-                    territory=safe_str(row.get('Территория')),
-                    content_type=safe_str(row.get('Тип контента')),
-                    usage_type=safe_str(row.get('Вид использования')),
-                    performer_name_excel=safe_str(row.get('Исполнитель')),
-                    track_title_excel=safe_str(row.get('Название трека')),
-                    album_title_excel=safe_str(row.get('Название альбома')),
-                    author_words_name_excel=safe_str(row.get('Автор слов')),
-                    author_music_name_excel=safe_str(row.get('Автор музыки')),
-                    licensor_share_author_percent=safe_decimal(row.get('Доля авторских прав Лицензиара')),
-                    licensor_share_neighboring_percent=safe_decimal(row.get('Доля смежных прав Лицензиара')),
-                    isrc=safe_str(row.get('ISRC')),
-                    upc=safe_str(row.get('UPC')),
-                    copyright=safe_str(row.get('Копирайт')),
-                    quantity=safe_int(row.get('Количество')),
-                    total_royalty_author=safe_decimal(row.get('Сумма денежных средств, полученных ЛИЦЕНЗИАТОМ за авторские права')),
-                    total_royalty_neighboring=safe_decimal(row.get('Сумма денежных средств, полученных ЛИЦЕНЗИАТОМ за смежные права')),
-                    licensor_share_author_licensor_percent=safe_decimal(row.get('Доля монетизации Лицензиара авторских прав')), # Предполагаемое имя колонки
-                    licensor_share_neighboring_licensor_percent=safe_decimal(row.get('Доля монетизации Лицензиара смежных прав')), # Предполагаемое имя колонки
-                    calculated_royalty_author=safe_decimal(row.get('Вознаграждение ЛИЦЕНЗИАРА за авторские права')), # Предполагаемое имя колонки
-                    calculated_royalty_neighboring=safe_decimal(row.get('Вознаграждение ЛИЦЕНЗИАРА за смежные права')), # Предполагаемое имя колонки
-                    calculated_total_royalty=safe_decimal(row.get('Итого вознаграждение ЛИЦЕНЗИАРА')) # Предполагаемое имя колонки
-                    # Добавь сопоставление для других колонок, если они есть в Excel
-                )
-                self.db_session.add(raw_data_entry)
+        try:
+            # 3. Разбираем строки, кодируем повторяющиеся значения ключами справочников
+            # и сохраняем в RawUsageDataStrict (строки попадают в свежую секцию отчёта)
+            rows = [parse_excel_row(index, row) for index, row in df.iterrows()]
+            encoder = DimensionEncoder(self.db_session)
+            await encoder.load({name: {r[name] for r in rows} for name in RAW_DIMENSIONS})
+            for values in rows:
+                self.db_session.add(RawUsageDataStrict(excel_report_id=report_id, **encoder.encode(values)))
 
+            excel_report.upload_status = 'completed'
+            self.db_session.add(excel_report)
             await self.db_session.commit()
+            if settings.REPORT_ARCHIVE_ON_UPLOAD:
+                await self._archive_quietly(report_id)
             return UploadRawReportResponse(
-                message=f"Файл '{file.filename}' успешно загружен и сохранен как отчет ID {excel_report.id}",
-                report_id=excel_report.id
+                message=f"Файл '{file.filename}' успешно загружен и сохранен как отчет ID {report_id}",
+                report_id=report_id
             )
 
         except Exception as e:
             await self.db_session.rollback()
             print(f"Ошибка при обработке файла: {e}")
+            await self._mark_report_failed(report_id)
             raise HTTPException(status_code=500, detail=f"Ошибка сервера при обработке файла: {str(e)}")
 
+    async def _archive_quietly(self, report_id: int) -> None:
+        """Выгрузка в архив после загрузки — не критична: при ошибке отчёт можно выгрузить позже вручную."""
+        if not report_archive.archive_available():
+            return
+        try:
+            await report_archive.export_report(self.db_session, report_id)
+        except Exception as e:
+            print(f"Не удалось выгрузить отчет ID {report_id} в архив: {e}")
+
+    async def _mark_report_failed(self, report_id: int) -> None:
+        """Загрузка строк не удалась: пустая секция больше не нужна, отчёт остаётся со статусом 'failed'."""
+        try:
+            if raw_partitions.is_partitioned(self.db_session):
+                await raw_partitions.drop_report_partition(self.db_session, report_id)
+            await self.db_session.execute(
+                update(ExcelReport).where(ExcelReport.id == report_id).values(upload_status='failed')
+            )
+            await self.db_session.commit()
+        except Exception as e:
+            await self.db_session.rollback()
+            print(f"Не удалось пометить отчет ID {report_id} как failed: {e}")
+
     # Метод для получения списка всех загруженных отчетов
     async def get_all_reports(self) -> List[ExcelReportResponse]:
         result = await self.db_session.execute(select(ExcelReport))
@@ -137,44 +193,14 @@ class RawDataController:
         ]
 
     # Метод для получения "сырых" данных по ID отчета
-    # Возвращаем словари с конкретными полями модели, а не JSON
-    async def get_raw_data_by_report_id(self, report_id: int) -> List[RawUsageDataResponse]:
+    # Строки запроса сразу кодируются в JSON (формат RawUsageDataResponse), без ORM-объектов и моделей
+    async def get_raw_data_by_report_id(self, report_id: int) -> FastJSONResponse:
         result = await self.db_session.execute(
-            select(RawUsageDataStrict).where(RawUsageDataStrict.excel_report_id == report_id)
+            select(*RAW_USAGE_DATA_COLUMNS)
+            .where(raw_usage_data_decoded.c.excel_report_id == report_id)
+            .order_by(raw_usage_data_decoded.c.row_index)
         )
-        raw_data_entries = result.scalars().all()
-        return [
-            RawUsageDataResponse(
-                id=r.id,
-                row_index=r.row_index,
-                period=r.period,
-                platform=r.platform,
-                right_type=r.right_type,
-                territory=r.territory,
-                content_type=r.content_type,
-                usage_type=r.usage_type,
-                performer_name_excel=r.performer_name_excel,
-                track_title_excel=r.track_title_excel,
-                album_title_excel=r.album_title_excel,
-                author_words_name_excel=r.author_words_name_excel,
-                author_music_name_excel=r.author_music_name_excel,
-                licensor_share_author_percent=r.licensor_share_author_percent,
-                licensor_share_neighboring_percent=r.licensor_share_neighboring_percent,
-                isrc=r.isrc,
-                upc=r.upc,
-                copyright=r.copyright,
-                quantity=r.quantity,
-                total_royalty_author=r.total_royalty_author,
-                total_royalty_neighboring=r.total_royalty_neighboring,
-                licensor_share_author_licensor_percent=r.licensor_share_author_licensor_percent,
-                licensor_share_neighboring_licensor_percent=r.licensor_share_neighboring_licensor_percent,
-                calculated_royalty_author=r.calculated_royalty_author,
-                calculated_royalty_neighboring=r.calculated_royalty_neighboring,
-                calculated_total_royalty=r.calculated_total_royalty,
-                processed_status=r.processed_status,
-            )
-            for r in raw_data_entries
-        ]
+        return FastJSONResponse([dict(row) for row in result.mappings()])
 
     # Опционально: метод для получения информации о конкретном отчете
     async def get_report_info(self, report_id: int) -> GetReportInfoResponse:
@@ -193,6 +219,79 @@ class RawDataController:
             description=report.description
         )
 
+    # --- Архив отчётов в Parquet ---
+    def _require_archive(self) -> None:
+        if not report_archive.archive_available():
+            raise HTTPException(status_code=503, detail="Архив отчетов недоступен: не установлен pyarrow")
+
+    async def archive_report(self, report_id: int) -> ArchiveReportResponse:
+        """Выгружает (или перевыгружает) строки завершённого отчета в архив Parquet."""
+        self._require_archive()
+        report = await self.get_report_info(report_id)
+        if report.upload_status != 'completed':
+            raise HTTPException(
+                status_code=409,
+                detail=f"Отчет ID {report_id} в статусе '{report.upload_status}', выгружать можно только 'completed'"
+            )
+        manifest = await report_archive.export_report(self.db_session, report_id)
+        return ArchiveReportResponse(report_id=report_id, rows=manifest["rows"], files=len(manifest["files"]))
+
+    async def prune_archived_reports(self, older_than_days: int) -> PruneArchivedReportsResponse:
+        """
+        Удаляет из БД строки выгруженных в архив отчетов, загруженных раньше older_than_days дней назад.
+        Сам отчет остается со статусом 'archived', строки доступны через аналитику по архиву.
+        """
+        self._require_archive()
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        result = await self.db_session.execute(
+            select(ExcelReport.id)
+            .where(ExcelReport.upload_status == 'completed', ExcelReport.upload_date < cutoff)
+            .order_by(ExcelReport.id)
+        )
+        pruned = []
+        for report_id in result.scalars().all():
+            # Без выгрузки (или с неполной) строки не трогаем
+            manifest = report_archive.read_manifest(report_id)
+            if manifest is None:
+                continue
+            rows_in_db = await self.db_session.scalar(
+                select(func.count()).select_from(RawUsageDataStrict).where(RawUsageDataStrict.excel_report_id == report_id)
+            )
+            if rows_in_db != manifest["rows"]:
+                continue
+            try:
+                await self._delete_report_rows(report_id)
+                await self.db_session.execute(
+                    update(ExcelReport).where(ExcelReport.id == report_id).values(upload_status='archived')
+                )
+                await self.db_session.commit()
+                pruned.append(report_id)
+            except Exception as e:
+                await self.db_session.rollback()
+                print(f"Ошибка при очистке строк отчета ID {report_id}: {e}")
+        return PruneArchivedReportsResponse(
+            message=f"Удалены строки {len(pruned)} архивированных отчетов",
+            pruned_report_ids=pruned
+        )
+
+    async def query_archive(self, group_by: List[str], filters: Dict[str, List[Any]]) -> FastJSONResponse:
+        self._require_archive()
+        unknown = [name for name in [*group_by, *filters] if name not in report_archive.GROUP_BY_COLUMNS]
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Недопустимые поля: {', '.join(unknown)}. Допустимы: {', '.join(report_archive.GROUP_BY_COLUMNS)}"
+            )
+        return FastJSONResponse(await report_archive.query_archive(group_by, filters))
+
+    async def _delete_report_rows(self, report_id: int) -> None:
+        if raw_partitions.is_partitioned(self.db_session):
+            # PostgreSQL: строки отчёта лежат в отдельной секции — отсоединяем и удаляем её целиком
+            await raw_partitions.drop_report_partition(self.db_session, report_id)
+        # Без секционирования (SQLite) — удаляем строки; на PostgreSQL это снимет остатки из DEFAULT-секции
+        stmt_raw_data = delete(RawUsageDataStrict).where(RawUsageDataStrict.excel_report_id == report_id)
+        await self.db_session.execute(stmt_raw_data)
+
     # --- Обновлённый метод для удаления отчета ---
     # Обновляем имя модели в запросах
     async def delete_report(self, report_id: int) -> DeleteReportResponse:
@@ -203,15 +302,15 @@ class RawDataController:
         report_info = await self.get_report_info(report_id) # get_report_info теперь выбрасывает 404, если не найден
 
         try:
-            # Удаляем все связанные строки из raw_usage_data_strict
-            stmt_raw_data = delete(RawUsageDataStrict).where(RawUsageDataStrict.excel_report_id == report_id)
-            await self.db_session.execute(stmt_raw_data)
+            await self._delete_report_rows(report_id)
 
             # Затем удаляем сам отчет из excel_reports
             stmt_report = delete(ExcelReport).where(ExcelReport.id == report_id)
             await self.db_session.execute(stmt_report)
 
             await self.db_session.commit()
+            if report_archive.archive_available():
+                await report_archive.remove_report_archive(report_id)
             return DeleteReportResponse(
                 message=f"Отчет ID {report_id} и все связанные с ним 'сырые' данные успешно удалены.",
                 deleted_report_id=report_id
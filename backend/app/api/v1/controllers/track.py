@@ -1,18 +1,44 @@
 # app/api/v1/controllers/track.py
 from fastapi import HTTPException, status
-from sqlalchemy import delete
+from sqlalchemy import delete, insert, or_
+from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import select
-from typing import List
+from typing import Dict, List, Optional
 from app.database import DBSessionDep
-from app.api.v1.models.track import TrackResponse, TrackDetailResponse, TrackCreateRequest, TrackUpdateRequest, TrackPersonShareResponse
+from app.api.v1.models.track import (
+    TrackResponse, TrackDetailResponse, TrackCreateRequest, TrackUpdateRequest, TrackPersonShareResponse,
+    TrackBulkCreateResponse, TrackBulkItemResult, TrackArtistShareItem,
+    ShareIntegrityResponse, ShareViolationResponse,
+)
 from app.api.v1.models.artist import ArtistResponse, ArtistDetailResponse
-from app.api.v1.models.album import AlbumResponse
+from app.api.v1.models.person import PersonResponse
 from app.sqlmodels import TrackPersonShare, Person
 from app.sqlmodels.track import Track
 from app.sqlmodels.album import Album
 from app.sqlmodels.artist import Artist
 from app.sqlmodels.track_artist import TrackArtist
+from app.sqlmodels.track_artist_share import TrackArtistShare
 from app.sqlmodels.user import User, Role
+from app.responses import FastJSONResponse
+from app.services.artist_shares import format_artist_shares, resolve_artist_shares
+from app.services import share_integrity
+from app.services.link_sync import sync_link_values, sync_links
+
+# Колонки TrackResponse / ArtistResponse для списков, собираемых из строк запроса
+TRACK_LIST_COLUMNS = (
+    Track.id, Track.title, Track.isrc, Track.genre, Track.label_id, Track.label_share_percentage,
+    Track.scope_of_copyright, Track.scope_of_related_rights, Track.neighboring_rights_share,
+    Track.label_rights_share, Track.label_monetization_share, Track.marketing_expenses,
+    Track.advance_expenses, Track.is_approved, Track.created_by_user_id, Track.is_ringtone_added,
+    Track.has_video_clip, Track.is_lyrics_added, Track.is_karaoke_sync_added, Track.text,
+    Track.karaoke, Track.synclab, Track.copyright, Track.related_rights, Track.advance,
+    Track.marketing, Track.album_id,
+)
+ARTIST_LIST_COLUMNS = (
+    Artist.id, Artist.name, Artist.isni, Artist.is_approved, Artist.created_by_user_id,
+)
+# Поля TrackCreateRequest, которые являются колонками track
+TRACK_CREATE_FIELDS = tuple(name for name in TrackCreateRequest.model_fields if name in Track.__table__.columns)
 
 class TrackController:
     def __init__(self, db_session: DBSessionDep):
@@ -57,6 +83,10 @@ class TrackController:
         found_artists = artist_result.scalars().all()
         if len(found_artists) != len(data.artist_ids):
             raise HTTPException(status_code=404, detail="One or more artists not found")
+        try:
+            artist_shares = self._requested_artist_shares(data, {a.id: a.name for a in found_artists})
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         is_approved = (current_user.role == Role.ADMIN)
 
@@ -72,7 +102,6 @@ class TrackController:
             neighboring_rights_share=data.neighboring_rights_share,
             label_rights_share=data.label_rights_share,
             label_monetization_share=data.label_monetization_share,
-            artist_monetization_shares=data.artist_monetization_shares,
             marketing_expenses=data.marketing_expenses,
             advance_expenses=data.advance_expenses,
             advance=data.advance,
@@ -95,6 +124,8 @@ class TrackController:
 
         for artist_id in data.artist_ids:
             self.db_session.add(TrackArtist(track_id=new_track.id, artist_id=artist_id))
+        for artist_id, percent in (artist_shares or {}).items():
+            self.db_session.add(TrackArtistShare(track_id=new_track.id, artist_id=artist_id, percent=percent))
 
         if data.author_rights:
             for share_data in data.author_rights:
@@ -188,20 +219,257 @@ class TrackController:
             is_approved=new_track.is_approved
         )
 
-    async def get_all_tracks(self) -> List[TrackResponse]:
-        result = await self.db_session.execute(
-            select(Track).where(Track.is_approved == True)
+    async def create_tracks_bulk(
+        self,
+        items: List[TrackCreateRequest],
+        current_user: User
+    ) -> TrackBulkCreateResponse:
+        """
+        Создание нескольких треков за одну транзакцию.
+        Проверки — по одному IN-запросу на альбомы, артистов, персон и дубликаты ISRC;
+        вставка — пакетами: треки (с RETURNING id), связи с артистами, доли правообладателей.
+        Невалидные элементы получают статус error и не мешают остальным.
+        """
+        album_ids = {item.album_id for item in items}
+        artist_ids = {artist_id for item in items for artist_id in item.artist_ids}
+        person_ids = {
+            share.person_id
+            for item in items
+            for share in [*(item.author_rights or []), *(item.neighboring_rights or [])]
+        }
+        isrcs = {item.isrc for item in items if item.isrc}
+
+        found_albums = set((await self.db_session.execute(
+            select(Album.id).where(Album.id.in_(album_ids))
+        )).scalars().all())
+        found_artists = dict((await self.db_session.execute(
+            select(Artist.id, Artist.name).where(Artist.id.in_(artist_ids))
+        )).all()) if artist_ids else {}
+        found_persons = set((await self.db_session.execute(
+            select(Person.id).where(Person.id.in_(person_ids))
+        )).scalars().all()) if person_ids else set()
+        taken_isrcs = set((await self.db_session.execute(
+            select(Track.isrc).where(Track.isrc.in_(isrcs), Track.is_approved == True)
+        )).scalars().all()) if isrcs else set()
+
+        results: List[TrackBulkItemResult] = []
+        valid: List[tuple] = []  # (индекс, запрос)
+        artist_shares: Dict[int, Dict[int, float]] = {}  # индекс → доли артистов
+        batch_isrcs = set()
+        for index, item in enumerate(items):
+            error = None
+            if not item.isrc:
+                # track.isrc в БД NOT NULL — иначе упала бы вся пачка
+                error = "ISRC is required"
+            elif item.album_id not in found_albums:
+                error = "Album not found"
+            elif item.isrc and item.isrc in taken_isrcs:
+                error = "Track with this ISRC already exists"
+            elif item.isrc and item.isrc in batch_isrcs:
+                error = "Duplicate ISRC within the request"
+            elif any(artist_id not in found_artists for artist_id in item.artist_ids):
+                error = "One or more artists not found"
+            else:
+                missing = [
+                    share.person_id
+                    for share in [*(item.author_rights or []), *(item.neighboring_rights or [])]
+                    if share.person_id not in found_persons
+                ]
+                if missing:
+                    error = f"Person with id {missing[0]} not found"
+            if not error:
+                try:
+                    item_shares = self._requested_artist_shares(
+                        item, {artist_id: found_artists[artist_id] for artist_id in item.artist_ids}
+                    )
+                except ValueError as e:
+                    error = str(e)
+                else:
+                    if item_shares:
+                        artist_shares[index] = item_shares
+            if error:
+                results.append(TrackBulkItemResult(index=index, status="error", error=error))
+                continue
+            if item.isrc:
+                batch_isrcs.add(item.isrc)
+            valid.append((index, item))
+
+        is_approved = (current_user.role == Role.ADMIN)
+        if valid:
+            try:
+                track_ids = (await self.db_session.execute(
+                    insert(Track).returning(Track.id, sort_by_parameter_order=True),
+                    [self._track_insert_values(item, is_approved, current_user.id) for _index, item in valid],
+                )).scalars().all()
+
+                links = [
+                    {"track_id": track_id, "artist_id": artist_id}
+                    for track_id, (_index, item) in zip(track_ids, valid)
+                    for artist_id in dict.fromkeys(item.artist_ids)
+                ]
+                if links:
+                    await self.db_session.execute(insert(TrackArtist), links)
+
+                shares = [
+                    share
+                    for track_id, (_index, item) in zip(track_ids, valid)
+                    for share in self._track_share_values(track_id, item)
+                ]
+                if shares:
+                    await self.db_session.execute(insert(TrackPersonShare), shares)
+
+                artist_share_rows = [
+                    {"track_id": track_id, "artist_id": artist_id, "percent": percent}
+                    for track_id, (index, _item) in zip(track_ids, valid)
+                    for artist_id, percent in artist_shares.get(index, {}).items()
+                ]
+                if artist_share_rows:
+                    await self.db_session.execute(insert(TrackArtistShare), artist_share_rows)
+
+                await self.db_session.commit()
+            except Exception as e:
+                await self.db_session.rollback()
+                raise HTTPException(status_code=500, detail=f"Failed to create tracks: {str(e)}")
+
+            status_label = "created" if is_approved else "draft"
+            results.extend(
+                TrackBulkItemResult(index=index, status=status_label, track_id=track_id)
+                for track_id, (index, _item) in zip(track_ids, valid)
+            )
+
+        results.sort(key=lambda r: r.index)
+        return TrackBulkCreateResponse(
+            created=len(valid),
+            failed=len(items) - len(valid),
+            results=results,
         )
-        tracks = result.scalars().all()
-        return await self._build_track_response_list(tracks)
 
-    async def get_track_drafts(self, current_user: User) -> List[TrackResponse]:
+    @staticmethod
+    def _requested_artist_shares(data, artist_names: Dict[int, str]) -> Optional[Dict[int, float]]:
+        """
+        Доли артистов из запроса: artist_shares или строка artist_monetization_shares,
+        сопоставленная по именам артистов трека (artist_names: id → имя). None — доли не переданы.
+        """
+        if data.artist_shares is not None:
+            shares = {item.artist_id: item.percent for item in data.artist_shares}
+            unknown = sorted(set(shares) - set(artist_names))
+            if unknown:
+                raise ValueError(f"Artist {unknown[0]} is not linked to the track")
+            return shares
+        if data.artist_monetization_shares is not None:
+            return resolve_artist_shares(
+                data.artist_monetization_shares, {name: artist_id for artist_id, name in artist_names.items()}
+            )
+        return None
+
+    @staticmethod
+    def _track_insert_values(data: TrackCreateRequest, is_approved: bool, user_id: int) -> dict:
+        """Значения колонок track для Core-вставки (поля запроса + умолчания модели)."""
+        track = Track(
+            **{name: getattr(data, name) for name in TRACK_CREATE_FIELDS},
+            is_approved=is_approved,
+            created_by_user_id=user_id,
+        )
+        return {column.name: getattr(track, column.name) for column in Track.__table__.columns if column.name != "id"}
+
+    @staticmethod
+    def _track_share_values(track_id: int, data: TrackCreateRequest) -> List[dict]:
+        """Доли как в create_track: по одной строке на персону, авторская доля приоритетнее смежной."""
+        shares = {}
+        for share in data.author_rights or []:
+            shares.setdefault(share.person_id, {
+                "track_id": track_id,
+                "person_id": share.person_id,
+                "share_of_monetization_of_copyrights": float(share.share),
+                "copyrights": float(share.licensor_share),
+                "share_of_monetization_of_related_rights": 0.0,
+                "related_rights": 0.0,
+            })
+        for share in data.neighboring_rights or []:
+            shares.setdefault(share.person_id, {
+                "track_id": track_id,
+                "person_id": share.person_id,
+                "share_of_monetization_of_related_rights": float(share.share),
+                "related_rights": float(share.licensor_share),
+                "share_of_monetization_of_copyrights": 0.0,
+                "copyrights": 0.0,
+            })
+        return list(shares.values())
+
+    async def get_all_tracks(self) -> FastJSONResponse:
+        return FastJSONResponse(await self._build_track_rows(Track.is_approved == True))
+
+    async def get_track_drafts(self, current_user: User) -> FastJSONResponse:
         self._ensure_admin(current_user)
-        result = await self.db_session.execute(
-            select(Track).where(Track.is_approved == False)
+        return FastJSONResponse(await self._build_track_rows(Track.is_approved == False))
+
+    async def get_tracks_batch(self, ids: List[int], current_user: User) -> FastJSONResponse:
+        """Треки по списку id в формате TrackResponse: два запроса на весь список, порядок как в запросе."""
+        criteria = [Track.id.in_(ids)]
+        if current_user.role != Role.ADMIN:
+            criteria.append(or_(Track.is_approved == True, Track.created_by_user_id == current_user.id))
+        by_id = {row["id"]: row for row in await self._build_track_rows(*criteria)}
+        return FastJSONResponse([by_id[i] for i in dict.fromkeys(ids) if i in by_id])
+
+    async def get_tracks_by_artist_share(
+        self, artist_id: int, min_percent: float, current_user: User
+    ) -> FastJSONResponse:
+        """Треки, где доля артиста больше min_percent, — по индексу (artist_id, percent)."""
+        criteria = [Track.id.in_(
+            select(TrackArtistShare.track_id).where(
+                TrackArtistShare.artist_id == artist_id, TrackArtistShare.percent > min_percent
+            )
+        )]
+        if current_user.role != Role.ADMIN:
+            criteria.append(or_(Track.is_approved == True, Track.created_by_user_id == current_user.id))
+        return FastJSONResponse(await self._build_track_rows(*criteria))
+
+    async def check_share_integrity(
+        self, current_user: User, limit: int, code: Optional[str] = None
+    ) -> ShareIntegrityResponse:
+        """Проверка долей всего каталога одним проходом по массивам (см. services/share_integrity)."""
+        self._ensure_admin(current_user)
+        if not share_integrity.integrity_check_available():
+            raise HTTPException(status_code=503, detail="Share integrity check is unavailable: numpy is not installed")
+        report = await share_integrity.check_share_integrity(self.db_session)
+        violations = [v for v in report.violations if code is None or v.code == code]
+        return ShareIntegrityResponse(
+            tracks_checked=report.tracks_checked,
+            links_checked=report.links_checked,
+            violations_total=len(violations),
+            counts_by_code=report.counts_by_code(),
+            violations=[ShareViolationResponse(**share_integrity.violation_dict(v)) for v in violations[:limit]],
+        )
+
+    async def _build_track_rows(self, *criteria) -> List[dict]:
+        """
+        Список треков в формате TrackResponse, собранный прямо из строк запроса:
+        два запроса на весь список (треки с альбомом + связи с артистами), без ORM-объектов и моделей.
+        """
+        tracks_result = await self.db_session.execute(
+            select(*TRACK_LIST_COLUMNS, Album.title.label("album_title"))
+            .outerjoin(Album, Album.id == Track.album_id)
+            .where(*criteria)
+            .order_by(Track.id)
         )
-        drafts = result.scalars().all()
-        return await self._build_track_response_list(drafts)
+        rows = [dict(row) for row in tracks_result.mappings()]
+
+        artists_result = await self.db_session.execute(
+            select(TrackArtist.track_id, *ARTIST_LIST_COLUMNS)
+            .join(Artist, Artist.id == TrackArtist.artist_id)
+            .join(Track, Track.id == TrackArtist.track_id)
+            .where(*criteria)
+        )
+        artists_by_track = {}
+        for row in artists_result.mappings():
+            artist = dict(row)
+            artists_by_track.setdefault(artist.pop("track_id"), []).append(artist)
+
+        for row in rows:
+            artists = artists_by_track.get(row["id"], [])
+            row["artists"] = artists
+            row["artist_ids"] = [a["id"] for a in artists]
+        return rows
 
     async def _build_track_response_list(self, tracks) -> List[TrackResponse]:
         responses = []
@@ -321,6 +589,9 @@ class TrackController:
         if track.is_approved:
             raise HTTPException(status_code=400, detail="Cannot reject already approved track")
 
+        await self.db_session.execute(
+            delete(TrackArtistShare).where(TrackArtistShare.track_id == track_id)
+        )
         await self.db_session.execute(
             delete(TrackArtist).where(TrackArtist.track_id == track_id)
         )
@@ -331,53 +602,49 @@ class TrackController:
         await self.db_session.commit()
 
     async def get_track_by_id(self, track_id: int, current_user: User) -> TrackDetailResponse:
-        track = await self._get_track_by_id(track_id)
+        # Два запроса вместо пяти+: трек с альбомом и долями (JOIN), затем артисты с участниками (selectin)
+        result = await self.db_session.execute(
+            select(Track)
+            .where(Track.id == track_id)
+            .options(
+                joinedload(Track.album),
+                joinedload(Track.track_person_shares).joinedload(TrackPersonShare.person),
+                selectinload(Track.artists).joinedload(Artist.members),
+            )
+        )
+        track = result.unique().scalar_one_or_none()
+        if not track:
+            raise HTTPException(status_code=404, detail="Track not found")
 
         if not track.is_approved and track.created_by_user_id != current_user.id and current_user.role != Role.ADMIN:
             raise HTTPException(status_code=404, detail="Track not found")
 
-        album = await self.db_session.get(Album, track.album_id)
-        album_resp = AlbumResponse(
-            id=album.id,
-            title=album.title,
-            type=album.type,
-            release_date=album.release_date,
-            upc=album.upc,
-            marketing_budget=album.marketing_expenses,
-            advance=album.advance_expenses,
-            aggregator=album.aggregator,
-            yoga=album.Yoga,
-            additional_sites=album.additional_sites,
-            is_approved=track.is_approved
-        ) if album else None
-
-        track_artist_result = await self.db_session.execute(
-            select(TrackArtist).where(TrackArtist.track_id == track_id)
-        )
-        artist_ids = [ta.artist_id for ta in track_artist_result.scalars().all()]
-        artists = []
-        if artist_ids:
-            artists_result = await self.db_session.execute(
-                select(Artist).where(Artist.id.in_(artist_ids))
+        artists = [
+            ArtistDetailResponse(
+                id=a.id,
+                name=a.name,
+                isni=a.isni,
+                members=[PersonResponse.model_validate(p) for p in a.members],
             )
-            artists_data = artists_result.scalars().all()
-            artists = [
-                ArtistDetailResponse(id=a.id, name=a.name, isni=a.isni, members=[])
-                for a in artists_data
-            ]
-
-        shares_result = await self.db_session.execute(
-            select(TrackPersonShare).where(TrackPersonShare.track_id == track_id)
+            for a in track.artists
+        ]
+
+        share_rows = await self.db_session.execute(
+            select(TrackArtistShare.artist_id, TrackArtistShare.percent).where(TrackArtistShare.track_id == track.id)
         )
-        shares = shares_result.scalars().all()
+        percents = dict(share_rows.all())
+        artist_shares = [
+            TrackArtistShareItem(artist_id=a.id, percent=percents[a.id]) for a in track.artists if a.id in percents
+        ]
+
         track_person_shares = [
             TrackPersonShareResponse(
                 person_id=share.person_id,
+                person_name=self._person_display_name(share.person),
                 share_author=share.share_of_monetization_of_copyrights,
                 share_neighboring=share.share_of_monetization_of_related_rights,
-
             )
-            for share in shares
+            for share in track.track_person_shares
         ]
 
         return TrackDetailResponse(
@@ -385,14 +652,18 @@ class TrackController:
             title=track.title,
             isrc=track.isrc,
             genre=track.genre,
-            music_authors=track.music_authors,
-            lyrics_authors=track.lyrics_authors,
+            # У модели Track нет этих колонок: авторы хранятся долями в track_person_shares
+            music_authors=None,
+            lyrics_authors=None,
             scope_of_copyright=track.scope_of_copyright,
             scope_of_related_rights=track.scope_of_related_rights,
             neighboring_rights_share=track.neighboring_rights_share,
             label_rights_share=track.label_rights_share,
             label_monetization_share=track.label_monetization_share,
-            artist_monetization_shares=track.artist_monetization_shares,
+            artist_monetization_shares=format_artist_shares(
+                (a.name, percents[a.id]) for a in track.artists if a.id in percents
+            ) or None,
+            artist_shares=artist_shares,
             marketing_expenses=track.marketing_expenses,
             advance_expenses=track.advance_expenses,
             advance=track.advance,
@@ -407,10 +678,17 @@ class TrackController:
             is_lyrics_added=track.is_lyrics_added,
             is_karaoke_sync_added=track.is_karaoke_sync_added,
             album_id=track.album_id,
+            album_title=track.album.title if track.album else None,
             artists=artists,
             track_person_shares=track_person_shares
         )
 
+    @staticmethod
+    def _person_display_name(person: Optional[Person]) -> Optional[str]:
+        if person is None:
+            return None
+        return " ".join(part for part in (person.last_name, person.first_name, person.middle_name) if part)
+
     async def update_track(
         self,
         track_id: int,
@@ -445,25 +723,60 @@ class TrackController:
                 if len(found) != len(data.artist_ids):
                     raise HTTPException(status_code=400, detail="Some artist IDs do not exist")
 
-        update_data = data.model_dump(exclude_unset=True, exclude={'artist_ids'})
+        artist_shares = None
+        if data.artist_shares is not None or data.artist_monetization_shares is not None:
+            if data.artist_ids is not None:
+                share_artist_ids = data.artist_ids
+            else:
+                share_artist_ids = (await self.db_session.execute(
+                    select(TrackArtist.artist_id).where(TrackArtist.track_id == track_id)
+                )).scalars().all()
+            artist_names = dict((await self.db_session.execute(
+                select(Artist.id, Artist.name).where(Artist.id.in_(share_artist_ids))
+            )).all())
+            try:
+                artist_shares = self._requested_artist_shares(data, artist_names)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        update_data = data.model_dump(
+            exclude_unset=True, exclude={'artist_ids', 'artist_shares', 'artist_monetization_shares'}
+        )
         for key, value in update_data.items():
             if hasattr(track, key):
                 setattr(track, key, value)
 
         if data.artist_ids is not None:
-            await self.db_session.execute(delete(TrackArtist).where(TrackArtist.track_id == track_id))
-            for artist_id in data.artist_ids:
-                self.db_session.add(TrackArtist(track_id=track.id, artist_id=artist_id))
+            _, removed = await sync_links(
+                self.db_session, TrackArtist.track_id, track.id, TrackArtist.artist_id, data.artist_ids
+            )
+            if removed and artist_shares is None:
+                # Доли артистов, убранных из трека (на SQLite внешние ключи не каскадируют)
+                await self.db_session.execute(
+                    delete(TrackArtistShare).where(
+                        TrackArtistShare.track_id == track_id,
+                        TrackArtistShare.artist_id.notin_(data.artist_ids),
+                    )
+                )
+        if artist_shares is not None:
+            # Доли переданы — приводим к ним по разнице: повторное сохранение тех же долей ничего не пишет.
+            # Округление как у колонки Numeric(5, 2), иначе 33.333 каждый раз отличалось бы от сохранённых 33.33
+            await sync_link_values(
+                self.db_session, TrackArtistShare.track_id, track.id, TrackArtistShare.artist_id,
+                TrackArtistShare.percent,
+                {artist_id: round(percent, 2) for artist_id, percent in artist_shares.items()},
+            )
 
         self.db_session.add(track)
         await self.db_session.commit()
         await self.db_session.refresh(track)
 
-        return await self._build_track_response_list([track])[0]
+        return (await self._build_track_response_list([track]))[0]
 
     async def delete_track(self, track_id: int, current_user: User) -> bool:
         self._ensure_admin(current_user)
         track = await self._get_track_by_id(track_id)
+        await self.db_session.execute(delete(TrackArtistShare).where(TrackArtistShare.track_id == track_id))
         await self.db_session.execute(delete(TrackArtist).where(TrackArtist.track_id == track_id))
         await self.db_session.execute(delete(TrackPersonShare).where(TrackPersonShare.track_id == track_id))
         await self.db_session.delete(track)
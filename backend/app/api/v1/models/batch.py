@@ -0,0 +1,8 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+# Ограничение на размер одного batch-запроса
+BATCH_MAX_IDS = 200
+
+class BatchIdsRequest(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=BATCH_MAX_IDS)
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List, Literal
+from pydantic import BaseModel
+
+class ChangeEvent(BaseModel):
+    change_id: int  # id события в журнале; на PostgreSQL порядок ленты — по фиксации, а не по id
+    entity_type: Literal["track", "album", "artist", "person", "track_person_share"]
+    entity_id: int  # для track_person_share — id трека, доли которого изменились
+    op: Literal["upsert", "delete"]
+    changed_at: datetime
+
+class ChangesResponse(BaseModel):
+    changes: List[ChangeEvent]  # по одному (последнему) событию на сущность
+    next_after: int  # передать как after в следующем запросе (change_id последнего прочитанного события)
+    has_more: bool
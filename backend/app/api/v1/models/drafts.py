@@ -0,0 +1,54 @@
+from enum import Enum
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+# Ограничение на число id в одном массовом запросе по черновикам
+DRAFT_BULK_MAX_IDS = 1000
+
+class DraftEntity(str, Enum):
+    PERSONS = "persons"
+    ARTISTS = "artists"
+    ALBUMS = "albums"
+    TRACKS = "tracks"
+
+class DraftBulkRequest(BaseModel):
+    """Какие черновики обработать: список id, все черновики автора или пересечение обоих условий."""
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=DRAFT_BULK_MAX_IDS)
+    created_by_user_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def _require_selector(self) -> "DraftBulkRequest":
+        if self.ids is None and self.created_by_user_id is None:
+            raise ValueError("Either ids or created_by_user_id must be set")
+        return self
+
+class DraftBulkResponse(BaseModel):
+    processed: int
+    ids: List[int]  # обработанные черновики
+    # Не тронуты: переданные id, которых нет среди черновиков, и черновики, на которые ещё ссылаются
+    skipped_ids: List[int] = []
+
+class DraftClosureRoot(str, Enum):
+    """С чего начинается обход зависимостей черновика."""
+    ALBUMS = "albums"
+    TRACKS = "tracks"
+
+class DraftClosureResponse(BaseModel):
+    """Черновики из замыкания зависимостей: для предпросмотра — что будет утверждено, иначе — что утверждено."""
+    tracks: List[int] = []
+    albums: List[int] = []
+    artists: List[int] = []
+    persons: List[int] = []
+
+class DraftCreatorSummary(BaseModel):
+    created_by_user_id: Optional[int] = None
+    persons: int = 0
+    artists: int = 0
+    albums: int = 0
+    tracks: int = 0
+    total: int = 0
+
+class DraftSummaryResponse(BaseModel):
+    total: int
+    by_entity: Dict[str, int]  # persons / artists / albums / tracks → число черновиков
+    by_creator: List[DraftCreatorSummary]
@@ -0,0 +1,30 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+class CheckoutWaitHistogram(BaseModel):
+    count: int
+    sum_ms: float
+    max_ms: float
+    avg_ms: float
+    buckets: Dict[str, int]
+
+class DBPoolStatus(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    checkout_wait: CheckoutWaitHistogram
+
+class DBPoolStatsResponse(DBPoolStatus):
+    """Пул основной БД; пул реплики — в replica (None, если DATABASE_REPLICA_URL не задан)."""
+    pool_size_setting: int
+    max_overflow_setting: int
+    replica: Optional[DBPoolStatus] = None
+
+class SQLStatementStatsResponse(BaseModel):
+    fingerprint: str
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
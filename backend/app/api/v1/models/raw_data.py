@@ -66,6 +66,15 @@ class DeleteReportResponse(BaseModel):
     message: str
     deleted_report_id: int
 
+class ArchiveReportResponse(BaseModel):
+    report_id: int
+    rows: int
+    files: int
+
+class PruneArchivedReportsResponse(BaseModel):
+    message: str
+    pruned_report_ids: List[int]
+
 class GetReportInfoResponse(ExcelReportResponse):
     pass # ExcelReportResponse уже содержит все нужные поля
 
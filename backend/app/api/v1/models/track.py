@@ -1,9 +1,10 @@
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
 from app.api.v1.models.artist import ArtistResponse
 
 class TrackPersonShareResponse(BaseModel):
     person_id: int
+    person_name: Optional[str] = None  # «Фамилия Имя Отчество» правообладателя
     share_author: float
     share_neighboring: float
 
@@ -17,6 +18,10 @@ class NeighboringRightRequest(BaseModel):
     share: float  # <-- Это будет share_neighboring
     licensor_share: float # <-- Это будет licensor_share_neighboring
 
+class TrackArtistShareItem(BaseModel):
+    artist_id: int  # один из artist_ids трека
+    percent: float = Field(ge=0, le=100)
+
 class TrackCreateRequest(BaseModel):
     title: str
     album_id: int
@@ -30,7 +35,8 @@ class TrackCreateRequest(BaseModel):
     neighboring_rights_share: Optional[float] = None
     label_rights_share: Optional[float] = None
     label_monetization_share: Optional[float] = None
-    artist_monetization_shares: Optional[str] = None
+    artist_monetization_shares: Optional[str] = None  # прежний формат «Артист: 60%, ...»; artist_shares приоритетнее
+    artist_shares: Optional[List[TrackArtistShareItem]] = None
     marketing_expenses: Optional[float] = None
     advance_expenses: Optional[float] = None
     advance: Optional[str] = None
@@ -53,6 +59,39 @@ class TrackCreateRequest(BaseModel):
     class Config:
         from_attributes = True
 
+# Ограничение на число треков в одном POST /tracks/bulk
+BULK_MAX_TRACKS = 100
+
+class TrackBulkCreateRequest(BaseModel):
+    tracks: List[TrackCreateRequest] = Field(min_length=1, max_length=BULK_MAX_TRACKS)
+
+class TrackBulkItemResult(BaseModel):
+    index: int  # позиция трека в запросе
+    status: Literal["created", "draft", "error"]
+    track_id: Optional[int] = None
+    error: Optional[str] = None
+
+class TrackBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[TrackBulkItemResult]
+
+class ShareViolationResponse(BaseModel):
+    code: str  # share_out_of_range, author_sum_exceeds_scope, orphan_person_share, ...
+    track_id: int
+    person_id: Optional[int] = None
+    artist_id: Optional[int] = None
+    field: Optional[str] = None
+    value: Optional[float] = None
+    limit: Optional[float] = None
+
+class ShareIntegrityResponse(BaseModel):
+    tracks_checked: int
+    links_checked: int
+    violations_total: int
+    counts_by_code: Dict[str, int]
+    violations: List[ShareViolationResponse]  # первые limit нарушений
+
 class TrackUpdateRequest(BaseModel):
     title: Optional[str] = None
     isrc: Optional[str] = None
@@ -66,7 +105,8 @@ class TrackUpdateRequest(BaseModel):
     neighboring_rights_share: Optional[float] = None
     label_rights_share: Optional[float] = None
     label_monetization_share: Optional[float] = None
-    artist_monetization_shares: Optional[str] = None
+    artist_monetization_shares: Optional[str] = None  # прежний формат «Артист: 60%, ...»; artist_shares приоритетнее
+    artist_shares: Optional[List[TrackArtistShareItem]] = None
     marketing_expenses: Optional[float] = None
     advance_expenses: Optional[float] = None
     advance: Optional[str] = None
@@ -131,7 +171,8 @@ class TrackDetailResponse(BaseModel):
     neighboring_rights_share: Optional[float] = None
     label_rights_share: Optional[float] = None
     label_monetization_share: Optional[float] = None
-    artist_monetization_shares: Optional[str] = None
+    artist_monetization_shares: Optional[str] = None  # те же доли строкой, для старых клиентов
+    artist_shares: List[TrackArtistShareItem] = []
     marketing_expenses: Optional[float] = None
     advance_expenses: Optional[float] = None
     advance: Optional[str] = None
@@ -146,6 +187,7 @@ class TrackDetailResponse(BaseModel):
     is_lyrics_added: bool
     is_karaoke_sync_added: bool
     album_id: int
+    album_title: Optional[str] = None
     artists: List["ArtistDetailResponse"] = []
     track_person_shares: List[TrackPersonShareResponse] = []
     author_rights: Optional[List[AuthorRightRequest]] = []  # <-- Обновлено
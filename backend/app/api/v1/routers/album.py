@@ -1,9 +1,9 @@
 # app/api/v1/routers/album.py
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status
 from app.api.v1.models.album import AlbumCreateRequest, AlbumResponse, AlbumDetailResponse, AlbumUpdateRequest
 from app.api.v1.controllers.album import AlbumControllerDep
+from app.api.v1.models.batch import BatchIdsRequest
 from app.deps import AuthUserDep
-from app.sqlmodels.user import User
 
 router = APIRouter(prefix="/albums", tags=["albums"])
 
@@ -11,7 +11,7 @@ router = APIRouter(prefix="/albums", tags=["albums"])
 async def create_album(
     data:AlbumCreateRequest,
     controller: AlbumControllerDep,
-    current_user: User = Depends(AuthUserDep),
+    current_user: AuthUserDep,
 ) -> AlbumResponse:
     return await controller.create_album(data, current_user)
 
@@ -21,11 +21,19 @@ async def list_albums(
 ) -> list[AlbumDetailResponse]:
     return await controller.get_all_albums()
 
+@router.post("/batch", response_model=list[AlbumDetailResponse])
+async def get_albums_batch(
+    data: BatchIdsRequest,
+    controller: AlbumControllerDep,
+    current_user: AuthUserDep,
+) -> list[AlbumDetailResponse]:
+    return await controller.get_albums_batch(data.ids, current_user)
+
 @router.get("/{album_id}", response_model=AlbumDetailResponse)
 async def get_album(
     album_id: int,
     controller: AlbumControllerDep,
-    current_user: User = Depends(AuthUserDep),
+    current_user: AuthUserDep,
 ) -> AlbumDetailResponse:
     return await controller.get_album_by_id(album_id, current_user)
 
@@ -34,7 +42,7 @@ async def update_album(
     album_id: int,
     data:AlbumUpdateRequest,
     controller: AlbumControllerDep,
-    current_user: User = Depends(AuthUserDep),
+    current_user: AuthUserDep,
 ) -> AlbumResponse:
     return await controller.update_album(album_id, data, current_user)
 
@@ -42,6 +50,6 @@ async def update_album(
 async def delete_album(
     album_id: int,
     controller: AlbumControllerDep,
-    current_user: User = Depends(AuthUserDep),
+    current_user: AuthUserDep,
 ) -> bool:
     return await controller.delete_album(album_id, current_user)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, Response, status
 
 from app.api.v1.models.user import UserResponse
 from app.deps import AuthUserDep
+from app.responses import FastJSONResponse
 from app.api.v1.models.artist import (
     ArtistCreateRequest,
     ArtistResponse,
@@ -9,6 +10,7 @@ from app.api.v1.models.artist import (
     ArtistUpdateRequest
 )
 from app.api.v1.controllers.artist import ArtistControllerDep
+from app.api.v1.models.batch import BatchIdsRequest
 
 router = APIRouter(prefix="/artists", tags=["artists"])
 
@@ -26,14 +28,23 @@ async def create_artist(
     return artist
 
 
-@router.get("/", response_model=list[ArtistDetailResponse])
+@router.get("/", response_model=list[ArtistDetailResponse], response_class=FastJSONResponse)
 async def list_artists(
     controller: ArtistControllerDep,
     current_user: AuthUserDep,
-) -> list[ArtistDetailResponse]:
+) -> FastJSONResponse:
     return await controller.get_all_artists()
 
 
+@router.post("/batch", response_model=list[ArtistDetailResponse])
+async def get_artists_batch(
+    data: BatchIdsRequest,
+    controller: ArtistControllerDep,
+    current_user: AuthUserDep,
+) -> list[ArtistDetailResponse]:
+    return await controller.get_artists_batch(data.ids, current_user)
+
+
 @router.get("/{artist_id}", response_model=ArtistDetailResponse)
 async def get_artist(
     artist_id: int,
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Query
+
+from app.api.v1.models.changes import ChangeEvent, ChangesResponse
+from app.database import DBSessionDep
+from app.deps import AdminUserDep
+from app.services.outbox import read_changes
+from app.settings import settings
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("", response_model=ChangesResponse)
+async def get_changes(
+    db_session: DBSessionDep,
+    user: AdminUserDep,
+    after: int = Query(0, ge=0, description="next_after из предыдущего ответа; 0 — с начала журнала"),
+    limit: int = Query(500, ge=1),
+) -> ChangesResponse:
+    """
+    Лента изменений каталога для внешних потребителей (поиск, кэши, пересчёт роялти):
+    что изменилось после курсора after — без полного перечитывания таблиц.
+    """
+    changes, next_after, has_more = await read_changes(
+        db_session, after, min(limit, settings.CHANGES_PAGE_MAX)
+    )
+    return ChangesResponse(
+        changes=[ChangeEvent(**change) for change in changes],
+        next_after=next_after,
+        has_more=has_more,
+    )
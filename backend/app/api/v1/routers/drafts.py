@@ -1,21 +1,86 @@
 from fastapi import APIRouter, Depends, status
 from app.deps import AdminUserDep # ← Pydantic-модель
+from app.responses import FastJSONResponse
 
 # Controllers
 from app.api.v1.controllers.person import PersonControllerDep
 from app.api.v1.controllers.track import TrackControllerDep
 from app.api.v1.controllers.artist import ArtistControllerDep
 from app.api.v1.controllers.album import AlbumControllerDep
+from app.api.v1.controllers.drafts import DraftsControllerDep
 
 # Response models
 from app.api.v1.models.person import PersonResponse
 from app.api.v1.models.track import TrackResponse
 from app.api.v1.models.artist import ArtistDetailResponse, ArtistResponse
 from app.api.v1.models.album import AlbumDetailResponse, AlbumResponse
+from app.api.v1.models.drafts import (
+    DraftBulkRequest, DraftBulkResponse, DraftClosureResponse, DraftClosureRoot, DraftEntity,
+    DraftSummaryResponse,
+)
 
 router = APIRouter(prefix="/drafts", tags=["Drafts"])
 
 
+# =============== SUMMARY ===============
+
+@router.get("/summary", response_model=DraftSummaryResponse)
+async def get_drafts_summary(
+    controller: DraftsControllerDep,
+    user: AdminUserDep,
+) -> DraftSummaryResponse:
+    """Счётчики очередей черновиков (по типам и авторам) — без загрузки самих черновиков."""
+    return await controller.get_summary(user)
+
+
+# =============== BULK ===============
+
+@router.post("/{entity}/approve", response_model=DraftBulkResponse)
+async def approve_drafts_bulk(
+    entity: DraftEntity,
+    data: DraftBulkRequest,
+    controller: DraftsControllerDep,
+    user: AdminUserDep,
+) -> DraftBulkResponse:
+    """Утверждает черновики по списку id и/или автору одним UPDATE."""
+    return await controller.approve_drafts(entity, data, user)
+
+
+@router.post("/{entity}/reject", response_model=DraftBulkResponse)
+async def reject_drafts_bulk(
+    entity: DraftEntity,
+    data: DraftBulkRequest,
+    controller: DraftsControllerDep,
+    user: AdminUserDep,
+) -> DraftBulkResponse:
+    """Удаляет черновики вместе со связями; черновики, на которые ещё ссылаются, пропускаются."""
+    return await controller.reject_drafts(entity, data, user)
+
+
+# =============== WITH DEPENDENCIES ===============
+
+@router.get("/{root}/{entity_id}/dependencies", response_model=DraftClosureResponse)
+async def preview_draft_dependencies(
+    root: DraftClosureRoot,
+    entity_id: int,
+    controller: DraftsControllerDep,
+    user: AdminUserDep,
+) -> DraftClosureResponse:
+    """Черновики, которые будут утверждены вместе с треком/альбомом; ничего не меняет."""
+    return await controller.preview_closure(root, entity_id, user)
+
+
+@router.post("/{root}/{entity_id}/approve-with-dependencies", response_model=DraftClosureResponse)
+async def approve_draft_with_dependencies(
+    root: DraftClosureRoot,
+    entity_id: int,
+    controller: DraftsControllerDep,
+    user: AdminUserDep,
+) -> DraftClosureResponse:
+    """Утверждает трек/альбом вместе с черновиками альбома, артистов и персон."""
+    return await controller.approve_closure(root, entity_id, user)
+
+
 # =============== PERSONS ===============
 
 @router.get("/persons", response_model=list[PersonResponse])
@@ -46,11 +111,11 @@ async def reject_person_draft(
 
 # =============== TRACKS ===============
 
-@router.get("/tracks", response_model=list[TrackResponse])
+@router.get("/tracks", response_model=list[TrackResponse], response_class=FastJSONResponse)
 async def get_track_drafts(
     controller: TrackControllerDep,
     user: AdminUserDep,
-) -> list[TrackResponse]:
+) -> FastJSONResponse:
     return await controller.get_track_drafts(user)
 
 
@@ -74,11 +139,11 @@ async def reject_track_draft(
 
 # =============== ARTISTS ===============
 
-@router.get("/artists", response_model=list[ArtistDetailResponse])
+@router.get("/artists", response_model=list[ArtistDetailResponse], response_class=FastJSONResponse)
 async def get_artist_drafts(
     controller: ArtistControllerDep,
     user: AdminUserDep,  # ← теперь передаётся!
-) -> list[ArtistDetailResponse]:
+) -> FastJSONResponse:
     return await controller.get_artist_drafts(user)  # ← передаём user
 
 
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Query, status
+
+from app.api.v1.models.metrics import DBPoolStatsResponse, DBPoolStatus, SQLStatementStatsResponse
+from app.database import engine, replica_engine
+from app.deps import AdminUserDep
+from app.services.db_metrics import pool_status, wait_snapshot
+from app.services.sql_logging import sql_statement_stats
+from app.settings import settings
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/db-pool", response_model=DBPoolStatsResponse)
+async def get_db_pool_stats(
+    user: AdminUserDep,
+) -> DBPoolStatsResponse:
+    """Состояние пулов соединений этого воркера (основная БД и реплика) и гистограммы ожидания соединения."""
+    replica = None
+    if replica_engine is not None:
+        # Через реплику идёт большая часть GET-запросов — её пул показываем отдельно
+        replica = DBPoolStatus(
+            **pool_status(replica_engine.sync_engine.pool),
+            checkout_wait=wait_snapshot(replica_engine.sync_engine.pool),
+        )
+    return DBPoolStatsResponse(
+        **pool_status(engine.sync_engine.pool),
+        pool_size_setting=settings.DB_POOL_SIZE,
+        max_overflow_setting=settings.DB_MAX_OVERFLOW,
+        checkout_wait=wait_snapshot(engine.sync_engine.pool),
+        replica=replica,
+    )
+
+
+@router.get("/sql", response_model=list[SQLStatementStatsResponse])
+async def get_sql_stats(
+    user: AdminUserDep,
+    limit: int = Query(50, ge=1, le=500),
+) -> list[SQLStatementStatsResponse]:
+    """Самые затратные запросы по суммарному времени (отпечатки без параметров)."""
+    return [SQLStatementStatsResponse(**item) for item in sql_statement_stats.top(limit)]
+
+
+@router.delete("/sql", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_sql_stats(
+    user: AdminUserDep,
+) -> None:
+    sql_statement_stats.reset()
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 from starlette import status
 
+from app.api.v1.models.batch import BatchIdsRequest
 from app.api.v1.models.person import PersonCreateRequest, PersonResponse, PersonUpdateRequest
 from app.api.v1.controllers.person import PersonControllerDep
 from app.deps import AuthUserDep
-from app.sqlmodels.user import User
 
 router = APIRouter(prefix="/people", tags=["people"])
 
@@ -22,12 +22,20 @@ async def list_people(
 ) -> list[PersonResponse]:
     return await controller.get_all_people()
 
+@router.post("/batch", response_model=list[PersonResponse])
+async def get_people_batch(
+    data: BatchIdsRequest,
+    controller: PersonControllerDep,
+    current_user: AuthUserDep,
+) -> list[PersonResponse]:
+    return await controller.get_people_batch(data.ids, current_user)
+
 @router.put("/{person_id}", response_model=PersonResponse)
 async def update_person(
     person_id: int,
     data: PersonUpdateRequest,
     controller: PersonControllerDep,
-    current_user: User = Depends(AuthUserDep),
+    current_user: AuthUserDep,
 ) -> PersonResponse:
     return await controller.update_person(person_id, data, current_user)
 
@@ -35,7 +43,7 @@ async def update_person(
 async def get_person(
     person_id: int,
     controller: PersonControllerDep,
-    current_user: User = Depends(AuthUserDep),
+    current_user: AuthUserDep,
 ) -> PersonResponse:
     return await controller.get_person_by_id(person_id, current_user)
 
@@ -1,26 +1,29 @@
-# app/api/v1/routers/raw_data.pyfrom typing import List
-from typing import List
+# app/api/v1/routers/raw_data.py
+from typing import List, Optional
 
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, Path, status
 
 from app.api.v1.controllers.raw_data_controller import RawDataControllerDep
-from app.deps import AuthUserDep
+from app.deps import AuthUserDep, AdminUserDep
+from app.responses import FastJSONResponse
+from app.settings import settings
 
 # Импортируем модели запросов/ответов
 from app.api.v1.models.raw_data import (
     UploadRawReportRequest, UploadRawReportResponse,
     ExcelReportResponse, GetReportInfoResponse,
-    RawUsageDataResponse, DeleteReportResponse
+    RawUsageDataResponse, DeleteReportResponse,
+    ArchiveReportResponse, PruneArchivedReportsResponse
 )
 
 router = APIRouter(prefix="/raw-data", tags=["raw_data"])
 
 @router.post("/", response_model=UploadRawReportResponse)
 async def upload_raw_report(
+    controller: RawDataControllerDep,
+    current_user: AuthUserDep, # Добавляем проверку аутентификации/авторизации
     file: UploadFile = File(...),
     description: str = Query(None, description="Описание отчета (например, '3 квартал 2025')"),
-    controller: RawDataControllerDep = Depends(),
-    current_user: AuthUserDep = Depends(), # Добавляем проверку аутентификации/авторизации
 ) -> UploadRawReportResponse:
     """
     Загружает Excel-файл и сохраняет его содержимое в таблицу raw_usage_data_strict,
@@ -31,8 +34,8 @@ async def upload_raw_report(
 
 @router.get("/", response_model=List[ExcelReportResponse])
 async def list_all_reports(
-    controller: RawDataControllerDep = Depends(),
-    current_user: AuthUserDep = Depends(), # Добавляем проверку аутентификации/авторизации
+    controller: RawDataControllerDep,
+    current_user: AuthUserDep, # Добавляем проверку аутентификации/авторизации
 ) -> List[ExcelReportResponse]:
     """
     Возвращает список всех загруженных отчетов.
@@ -40,11 +43,61 @@ async def list_all_reports(
     # В контроллере мы не используем current_user, но можно добавить логику проверки прав
     return await controller.get_all_reports()
 
+# --- Архив отчётов в Parquet (маршруты без report_id — до "/{report_id}") ---
+@router.get("/analytics", response_class=FastJSONResponse)
+async def query_report_archive(
+    controller: RawDataControllerDep,
+    current_user: AuthUserDep,
+    group_by: List[str] = Query(["period", "platform"], description="Поля группировки"),
+    period: Optional[List[str]] = Query(None),
+    platform: Optional[List[str]] = Query(None),
+    right_type: Optional[List[str]] = Query(None),
+    territory: Optional[List[str]] = Query(None),
+    isrc: Optional[List[str]] = Query(None),
+    report_id: Optional[List[int]] = Query(None, description="ID отчетов"),
+) -> FastJSONResponse:
+    """
+    Агрегаты по архиву отчетов: суммы количества и вознаграждений и число строк в разрезе group_by.
+    Фильтры по period/platform отсекают каталоги архива, остальные — группы строк Parquet.
+    """
+    filters = {
+        name: values for name, values in (
+            ("period", period), ("platform", platform), ("right_type", right_type),
+            ("territory", territory), ("isrc", isrc), ("excel_report_id", report_id),
+        ) if values
+    }
+    return await controller.query_archive(group_by, filters)
+
+@router.post("/archive/prune", response_model=PruneArchivedReportsResponse)
+async def prune_archived_reports(
+    controller: RawDataControllerDep,
+    current_user: AdminUserDep,
+    older_than_days: Optional[int] = Query(None, ge=0, description="По умолчанию — REPORT_ARCHIVE_PRUNE_AFTER_DAYS"),
+) -> PruneArchivedReportsResponse:
+    """
+    Удаляет из БД строки отчетов, уже выгруженных в архив и загруженных раньше older_than_days дней назад.
+    """
+    days = older_than_days if older_than_days is not None else settings.REPORT_ARCHIVE_PRUNE_AFTER_DAYS
+    if days is None:
+        raise HTTPException(status_code=400, detail="Не задан срок: older_than_days или REPORT_ARCHIVE_PRUNE_AFTER_DAYS")
+    return await controller.prune_archived_reports(days)
+
+@router.post("/{report_id}/archive", response_model=ArchiveReportResponse)
+async def archive_report(
+    controller: RawDataControllerDep,
+    current_user: AdminUserDep,
+    report_id: int = Path(..., description="ID отчета"),
+) -> ArchiveReportResponse:
+    """
+    Выгружает строки отчета в архив Parquet (повторный вызов перезаписывает выгрузку).
+    """
+    return await controller.archive_report(report_id)
+
 @router.get("/{report_id}", response_model=GetReportInfoResponse)
 async def get_report_info(
+    controller: RawDataControllerDep,
+    current_user: AuthUserDep, # Добавляем проверку аутентификации/авторизации
     report_id: int = Path(..., description="ID отчета"),
-    controller: RawDataControllerDep = Depends(),
-    current_user: AuthUserDep = Depends(), # Добавляем проверку аутентификации/авторизации
 ) -> GetReportInfoResponse:
     """
     Возвращает информацию о конкретном загруженном отчете.
@@ -52,12 +105,12 @@ async def get_report_info(
     # В контроллере мы не используем current_user, но можно добавить логику проверки прав
     return await controller.get_report_info(report_id)
 
-@router.get("/{report_id}/raw-data", response_model=List[RawUsageDataResponse])
+@router.get("/{report_id}/raw-data", response_model=List[RawUsageDataResponse], response_class=FastJSONResponse)
 async def get_raw_data_for_report(
+    controller: RawDataControllerDep,
+    current_user: AuthUserDep, # Добавляем проверку аутентификации/авторизации
     report_id: int = Path(..., description="ID отчета"),
-    controller: RawDataControllerDep = Depends(),
-    current_user: AuthUserDep = Depends(), # Добавляем проверку аутентификации/авторизации
-) -> List[RawUsageDataResponse]:
+) -> FastJSONResponse:
     """
     Возвращает 'сырые' данные для конкретного отчета.
     """
@@ -67,9 +120,9 @@ async def get_raw_data_for_report(
 # --- Новый эндпоинт для удаления отчета ---
 @router.delete("/{report_id}", response_model=DeleteReportResponse)
 async def delete_report(
+    controller: RawDataControllerDep,
+    current_user: AuthUserDep, # Добавляем проверку аутентификации/авторизации
     report_id: int = Path(..., description="ID отчета для удаления"),
-    controller: RawDataControllerDep = Depends(),
-    current_user: AuthUserDep = Depends(), # Добавляем проверку аутентификации/авторизации
 ) -> DeleteReportResponse:
 
     return await controller.delete_report(report_id)
@@ -1,8 +1,14 @@
 # app/api/v1/routers/track.py
-from fastapi import APIRouter, status, Depends
-from app.api.v1.models.track import TrackResponse, TrackDetailResponse, TrackUpdateRequest, TrackCreateRequest
+from typing import Optional
+from fastapi import APIRouter, status, Depends, Query
+from app.api.v1.models.track import (
+    TrackResponse, TrackDetailResponse, TrackUpdateRequest, TrackCreateRequest,
+    TrackBulkCreateRequest, TrackBulkCreateResponse, ShareIntegrityResponse,
+)
 from app.api.v1.controllers.track import TrackControllerDep
-from app.deps import AuthUserDep
+from app.api.v1.models.batch import BatchIdsRequest
+from app.deps import AdminUserDep, AuthUserDep
+from app.responses import FastJSONResponse
 from app.sqlmodels.user import User
 
 router = APIRouter(prefix="/tracks", tags=["tracks"])
@@ -15,12 +21,49 @@ async def create_track(
 ) -> TrackResponse:
     return await controller.create_track(data, current_user)
 
-@router.get("/", response_model=list[TrackResponse])
+@router.post("/bulk", response_model=TrackBulkCreateResponse)
+async def create_tracks_bulk(
+    data: TrackBulkCreateRequest,
+    controller: TrackControllerDep,
+    current_user: AuthUserDep,
+) -> TrackBulkCreateResponse:
+    """Несколько треков (например, весь альбом) за один запрос; результат — по каждому треку."""
+    return await controller.create_tracks_bulk(data.tracks, current_user)
+
+@router.get("/", response_model=list[TrackResponse], response_class=FastJSONResponse)
 async def list_tracks(
     controller: TrackControllerDep,
-) -> list[TrackResponse]:
+) -> FastJSONResponse:
     return await controller.get_all_tracks()
 
+@router.post("/batch", response_model=list[TrackResponse], response_class=FastJSONResponse)
+async def get_tracks_batch(
+    data: BatchIdsRequest,
+    controller: TrackControllerDep,
+    current_user: AuthUserDep,
+) -> FastJSONResponse:
+    return await controller.get_tracks_batch(data.ids, current_user)
+
+@router.get("/by-artist-share", response_model=list[TrackResponse], response_class=FastJSONResponse)
+async def get_tracks_by_artist_share(
+    controller: TrackControllerDep,
+    current_user: AuthUserDep,
+    artist_id: int = Query(...),
+    min_percent: float = Query(0, ge=0, le=100),
+) -> FastJSONResponse:
+    """Треки, в которых артист получает больше min_percent процентов монетизации."""
+    return await controller.get_tracks_by_artist_share(artist_id, min_percent, current_user)
+
+@router.get("/share-integrity", response_model=ShareIntegrityResponse)
+async def check_share_integrity(
+    controller: TrackControllerDep,
+    current_user: AdminUserDep,
+    limit: int = Query(1000, ge=1, le=100000),
+    code: Optional[str] = Query(None, description="Только нарушения с этим кодом"),
+) -> ShareIntegrityResponse:
+    """Проверка долей правообладателей и артистов по всему каталогу."""
+    return await controller.check_share_integrity(current_user, limit, code)
+
 @router.get("/{track_id}", response_model=TrackDetailResponse)
 async def get_track(
     track_id: int,
@@ -1,20 +1,139 @@
-from typing import Annotated
-from fastapi import Depends
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+import hashlib
+import time
+from typing import Annotated, AsyncIterator, Dict, Optional
+from fastapi import Depends, Request, Response
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.settings import settings
 
-# Создаём синхронный движок
-engine = create_engine(settings.DATABASE_URL, echo=True)
+# Регистрирует слушатели сессии, которые ведут счётчики изменений таблиц (ETag)
+import app.services.etag  # noqa: F401
+# Пишет журнал изменений каталога (change_outbox) в тех же транзакциях, что и изменения
+import app.services.outbox  # noqa: F401
+from app.services.db_metrics import InstrumentedQueuePool
+from app.services.sql_logging import install_sql_instrumentation
 
-# Сессия
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Синхронные драйверы в DATABASE_URL заменяем на асинхронные
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-def get_session() -> Session:
-    db = SessionLocal()
+
+def to_async_url(url: str) -> str:
+    """postgresql:// / postgresql+psycopg2:// → postgresql+asyncpg://, sqlite:// → sqlite+aiosqlite://"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend in ASYNC_DRIVERS and parsed.drivername != ASYNC_DRIVERS[backend]:
+        parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    return parsed.render_as_string(hide_password=False)
+
+
+def _engine_options(url: str) -> dict:
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite (локальная разработка): SQLAlchemy берёт NullPool для файла и StaticPool для :memory:,
+        # размеры пула к ним неприменимы
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _create_engine(url: str):
+    new_engine = create_async_engine(url, echo=settings.SQL_ECHO, **_engine_options(url))
+    # Отпечатки запросов, агрегаты, медленные запросы и выборочный лог — на синхронном ядре движка
+    install_sql_instrumentation(
+        new_engine.sync_engine,
+        sample_rate=settings.SQL_LOG_SAMPLE_RATE,
+        slow_query_ms=settings.SQL_SLOW_QUERY_MS,
+    )
+    return new_engine
+
+
+def _create_sessionmaker(bind) -> async_sessionmaker:
+    # expire_on_commit=False — после commit атрибуты читаются без неявных запросов
+    return async_sessionmaker(
+        bind=bind,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+DATABASE_URL = to_async_url(settings.DATABASE_URL)
+DATABASE_REPLICA_URL = to_async_url(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
+
+# Асинхронный движок: asyncpg для PostgreSQL, aiosqlite для SQLite
+engine = _create_engine(DATABASE_URL)
+# Реплика для чтения; без неё чтение идёт в основную БД
+replica_engine = _create_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None
+
+# Сессии основной БД (запись и read-your-writes) и реплики
+AsyncSessionLocal = _create_sessionmaker(engine)
+ReplicaSessionLocal = _create_sessionmaker(replica_engine) if replica_engine else AsyncSessionLocal
+
+# --- Маршрутизация чтения/записи ---
+
+READ_METHODS = ("GET", "HEAD")
+PRIMARY_COOKIE = "db_primary_until"
+
+# Клиенты, недавно изменявшие данные: хэш токена → время (time.time()), до которого читаем из основной БД.
+# Cookie дублирует отметку для остальных воркеров uvicorn
+_recent_writers: Dict[str, float] = {}
+
+
+def _client_key(request: Request) -> Optional[str]:
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha1(authorization.encode("utf-8")).hexdigest()
+
+
+def mark_recent_write(request: Request, response: Response) -> None:
+    until = time.time() + settings.READ_YOUR_WRITES_SECONDS
+    key = _client_key(request)
+    if key:
+        if len(_recent_writers) > 10000:
+            now = time.time()
+            for stale in [k for k, v in _recent_writers.items() if v < now]:
+                del _recent_writers[stale]
+        _recent_writers[key] = until
+    response.set_cookie(
+        PRIMARY_COOKIE, str(int(until) + 1),
+        max_age=settings.READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax",
+    )
+
+
+def _prefers_primary(request: Request) -> bool:
+    now = time.time()
+    key = _client_key(request)
+    if key and _recent_writers.get(key, 0) > now:
+        return True
     try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > now
+    except ValueError:
+        return False
+
+
+def session_factory_for(request: Request) -> async_sessionmaker:
+    """GET/HEAD — реплика (если нет недавних изменений от этого клиента), остальное — основная БД."""
+    if replica_engine is None or request.method not in READ_METHODS or _prefers_primary(request):
+        return AsyncSessionLocal
+    return ReplicaSessionLocal
+
+
+async def get_session(request: Request, response: Response) -> AsyncIterator[AsyncSession]:
+    session_factory = session_factory_for(request)
+    if replica_engine is not None and request.method not in READ_METHODS:
+        mark_recent_write(request, response)
+    # Соединение берётся из пула при первом запросе к БД и возвращается после commit/rollback,
+    # а не держится весь запрос — вместе с проверкой токена и сериализацией ответа
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close()
 
-DBSessionDep = Annotated[Session, Depends(get_session)]
\ No newline at end of file
+DBSessionDep = Annotated[AsyncSession, Depends(get_session)]
@@ -3,20 +3,18 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import jwt
 from jose.exceptions import JWTError
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.v1.models.user import UserResponse
-from app.database import get_session
+from app.database import AsyncSessionLocal
+from app.services.user_cache import user_cache, user_from_claim
 from app.sqlmodels.user import User, Role
 from app.settings import settings # ← импортируем Pydantic-схему
 
 bearer_scheme = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db_session: AsyncSession = Depends(get_session)
-) -> UserResponse:  # ← возвращаем Pydantic, не ORM!
+async def authenticate_token(token: str) -> UserResponse:
+    """Пользователь по JWT: проверка подписи и активности. Общая для зависимостей и ETagMiddleware."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -24,7 +22,7 @@ async def get_current_user(
     )
     try:
         payload = jwt.decode(
-            credentials.credentials,
+            token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
@@ -34,10 +32,18 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    result = await db_session.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    # Подписанные данные пользователя в свежем токене, затем кэш — без обращения к БД
+    user = user_from_claim(payload, email) or user_cache.get(email)
+    if user is not None:
+        return user
 
-    if user is None or not user.is_active:
+    # Сессия открывается только при промахе кэша. Всегда основная БД, а не реплика:
+    # отставшая реплика вернула бы только что деактивированного пользователя как активного
+    async with AsyncSessionLocal() as db_session:
+        result = await db_session.execute(select(User).where(User.email == email))
+        db_user = result.scalar_one_or_none()
+
+    if db_user is None or not db_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Account is deactivated",
@@ -45,7 +51,15 @@ async def get_current_user(
         )
 
     # Важно: конвертируем ORM → Pydantic
-    return UserResponse.model_validate(user)
+    user = UserResponse.model_validate(db_user)
+    user_cache.put(email, user)
+    return user
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+) -> UserResponse:  # ← возвращаем Pydantic, не ORM!
+    return await authenticate_token(credentials.credentials)
 
 
 async def get_current_admin(
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Роутеры
@@ -9,10 +9,15 @@ from app.api.v1.routers.artist import router as artist_router
 from app.api.v1.routers.album import router as album_router
 from app.api.v1.routers.track import router as track_router
 from app.api.v1.routers.drafts import router as drafts_router
-from app.database import DBSessionDep
+from app.api.v1.routers.raw_data import router as raw_data_router
+from app.api.v1.routers.metrics import router as metrics_router
+from app.api.v1.routers.changes import router as changes_router
+from app.database import DBSessionDep, engine, replica_engine
 from app.deps import AuthUserDep
+from app.middlewares import CompressionMiddleware, ETagMiddleware
+from app.settings import settings
+from app.services.security import shutdown_password_hashing
 from app.services.startup import create_first_admin
-from app.sqlmodels.user import User
 
 app = FastAPI(
     title="Music Rights Management API",
@@ -23,6 +28,27 @@ app = FastAPI(
 async def startup():
     await create_first_admin()
 
+@app.on_event("shutdown")
+async def shutdown():
+    # Закрываем соединения пула
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    shutdown_password_hashing()
+
+# ETag / If-None-Match для списков и карточек каталога.
+# Добавляем раньше CORS, чтобы CORS оставался внешним слоем и для ответов 304
+app.add_middleware(ETagMiddleware)
+
+# Сжатие снаружи ETag: видит заголовок ETag и кэширует уже сжатые тела
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    cache_max_bytes=settings.COMPRESSION_CACHE_MAX_BYTES,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -32,6 +58,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # ✅ Все роутеры подключены с префиксом /api/v1
@@ -42,6 +69,9 @@ app.include_router(artist_router, prefix="/api/v1")
 app.include_router(album_router, prefix="/api/v1")
 app.include_router(track_router, prefix="/api/v1")
 app.include_router(drafts_router, prefix="/api/v1")
+app.include_router(raw_data_router, prefix="/api/v1")
+app.include_router(metrics_router, prefix="/api/v1")
+app.include_router(changes_router, prefix="/api/v1")
 
 @app.get("/test")
 async def test_connection():
@@ -54,7 +84,7 @@ async def root():
 @app.get("/debug-test")
 async def debug_test(
     db_session: DBSessionDep,
-    current_user: User = Depends(AuthUserDep),
+    current_user: AuthUserDep,
 ):
     return {
         "status": "Dependencies work!",
@@ -0,0 +1,197 @@
+# app/middlewares.py
+import hashlib
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import session_factory_for
+from app.deps import authenticate_token
+from app.services.compression import (
+    CompressedPayloadCache, StreamCompressor, body_digest, compress, is_compressible, negotiate_encoding
+)
+from app.services.etag import (
+    compute_etag, etag_requires_admin, get_table_versions, matching_etag, resolve_etag_tables, with_encoding
+)
+from app.sqlmodels.user import Role
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """
+    Условные GET для каталога: ETag строится из счётчиков изменений таблиц,
+    и на совпавший If-None-Match отвечаем 304 до вызова роутера (без ORM и сериализации).
+    304 получает только тот, кто получил бы 200: пользователя проверяем так же, как зависимости роутеров.
+    """
+
+    @staticmethod
+    async def _authorized(request: Request) -> bool:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            user = await authenticate_token(token)
+        except HTTPException:
+            return False
+        return user.role == Role.ADMIN or not etag_requires_admin(request.url.path)
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.method != "GET":
+            return await call_next(request)
+
+        tables = resolve_etag_tables(request.url.path)
+        if tables is None:
+            return await call_next(request)
+
+        # Истёкший токен, отключённый пользователь, не та роль — ответ (401/403) формирует роутер
+        if not await self._authorized(request):
+            return await call_next(request)
+
+        # Версии читаем из той же БД (основной или реплики), что и тело ответа
+        async with session_factory_for(request)() as session:
+            versions = await get_table_versions(session, tables)
+
+        # Черновики и детальные ответы зависят от пользователя — ETag привязываем к токену
+        authorization = request.headers.get("authorization", "")
+        scope = hashlib.sha1(authorization.encode("utf-8")).hexdigest() if authorization else ""
+        key = request.url.path + ("?" + request.url.query if request.url.query else "")
+        etag = compute_etag(key, versions, scope)
+
+        matched = matching_etag(request.headers.get("if-none-match"), etag)
+        if matched is not None:
+            return Response(status_code=304, headers={"ETag": matched, "Cache-Control": "private, no-cache"})
+
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        response.headers["Cache-Control"] = "private, no-cache"
+        # Тело могло включить изменение, зафиксированное после чтения версий, — такому телу ETag не даём
+        async with session_factory_for(request)() as session:
+            if await get_table_versions(session, tables) == versions:
+                response.headers["ETag"] = etag
+        return response
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli по Accept-Encoding. Ответы меньше minimum_size уходят как есть,
+    стриминговые ответы сжимаются по кускам, а тела с ETag берутся из кэша уже сжатых ответов.
+    Сжатое представление получает свой ETag (with_encoding), отличный от несжатого.
+    Чистый ASGI, чтобы не буферизовать стриминговые ответы целиком.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = CompressedPayloadCache(cache_max_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.inner_send = send
+        self.start_message: Optional[Message] = None
+        self.etag: Optional[str] = None
+        self.buffer = bytearray()
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            status_code = message["status"]
+            self.passthrough = (
+                "content-encoding" in headers
+                or status_code < 200
+                or status_code in (204, 304)
+                or not is_compressible(headers.get("content-type"))
+            )
+            if self.passthrough:
+                await self.inner_send(message)
+                return
+            self.start_message = message
+            # Ответы с ETag — кэшируемые списки и карточки: их сжатые тела держим в кэше
+            self.etag = headers.get("etag")
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.inner_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            payload = self.compressor.compress(body)
+            if not more_body:
+                payload += self.compressor.finish()
+            await self.inner_send({"type": "http.response.body", "body": payload, "more_body": more_body})
+            return
+
+        self.buffer.extend(body)
+        if not more_body:
+            await self._send_whole(bytes(self.buffer))
+        elif self.etag is None and len(self.buffer) >= self.middleware.minimum_size:
+            await self._start_streaming()
+
+    async def _send_whole(self, body: bytes) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        if len(body) < self.middleware.minimum_size:
+            headers["Content-Length"] = str(len(body))
+            await self.inner_send(self.start_message)
+            await self.inner_send({"type": "http.response.body", "body": body})
+            return
+
+        digest = body_digest(body) if self.etag else None
+        payload = self.middleware.cache.get(digest, self.encoding) if digest else None
+        if payload is None:
+            payload = compress(body, self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            if digest:
+                self.middleware.cache.put(digest, self.encoding, payload)
+
+        if self.etag:
+            headers["ETag"] = with_encoding(self.etag, self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(payload))
+        headers.add_vary_header("Accept-Encoding")
+        await self.inner_send(self.start_message)
+        await self.inner_send({"type": "http.response.body", "body": payload})
+
+    async def _start_streaming(self) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        await self.inner_send(self.start_message)
+
+        self.compressor = StreamCompressor(
+            self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        payload = self.compressor.compress(bytes(self.buffer))
+        self.buffer.clear()
+        await self.inner_send({"type": "http.response.body", "body": payload, "more_body": True})
@@ -0,0 +1,39 @@
+# app/responses.py
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson не установлен — работаем через stdlib json
+    orjson = None
+    import json
+
+
+def _default(value: Any) -> Any:
+    # Pydantic отдаёт Decimal строкой — сохраняем тот же формат ответа
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode_json(content: Any) -> bytes:
+    """Кодирует dict/list (в т.ч. даты и Decimal) сразу в байты ответа."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=lambda v: v.isoformat() if hasattr(v, "isoformat") else _default(v),
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Ответ для больших списков: контроллер отдаёт готовые dict из строк запроса,
+    FastAPI не валидирует их повторно через response_model, а кодирование идёт через orjson.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
@@ -0,0 +1,38 @@
+# app/services/artist_shares.py
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# «Artist A:60%, Artist B:40%» — прежний строковый формат долей артистов (импорт, старые клиенты)
+_SHARE_RE = re.compile(r"\s*([^:;,]+?)\s*:\s*(\d+(?:[.,]\d+)?)\s*%?\s*(?:[,;]|$)")
+
+
+def parse_artist_shares(value: str) -> List[Tuple[str, float]]:
+    """Разбирает строку долей в пары (имя артиста, процент). Неразборчивая строка — ValueError."""
+    value = (value or "").strip()
+    if not value:
+        return []
+    shares = []
+    position = 0
+    while position < len(value):
+        match = _SHARE_RE.match(value, position)
+        if not match:
+            raise ValueError(f"Invalid artist share format: {value!r}")
+        shares.append((match.group(1), float(match.group(2).replace(",", "."))))
+        position = match.end()
+    return shares
+
+
+def format_artist_shares(shares: Iterable[Tuple[str, float]]) -> str:
+    """Обратное преобразование — для поля artist_monetization_shares в ответах."""
+    return ", ".join(f"{name}:{percent:g}%" for name, percent in shares)
+
+
+def resolve_artist_shares(value: str, artist_ids_by_name: Dict[str, int]) -> Dict[int, float]:
+    """Строка долей → {artist_id: процент} по артистам трека; незнакомое имя — ValueError."""
+    shares: Dict[int, float] = {}
+    for name, percent in parse_artist_shares(value):
+        artist_id = artist_ids_by_name.get(name)
+        if artist_id is None:
+            raise ValueError(f"Artist '{name}' is not linked to the track")
+        shares[artist_id] = percent
+    return shares
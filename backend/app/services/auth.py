@@ -5,6 +5,7 @@ from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.services.security import run_password_hashing
 from app.settings import settings
 from app.sqlmodels.user import User
 
@@ -13,6 +14,9 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_password_hashing(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
@@ -22,6 +26,6 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 async def authenticate_user(session: AsyncSession, email: str, password: str) -> Optional[User]:
     result = await session.execute(select(User).where(User.email == email))
     user = result.scalars().first()
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         return None
     return user
\ No newline at end of file
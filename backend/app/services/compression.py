@@ -0,0 +1,115 @@
+# app/services/compression.py
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # без пакета brotli отдаём только gzip
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# Что имеет смысл сжимать: JSON, текст, CSV/XML
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/xml", "application/javascript")
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Выбирает кодировку по Accept-Encoding (с учётом q=0); brotli предпочтительнее gzip."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    for encoding in supported_encodings():
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class StreamCompressor:
+    """Потоковое сжатие: каждый кусок сбрасывается клиенту сразу, не дожидаясь конца ответа."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == BROTLI:
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == BROTLI:
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def body_digest(body: bytes) -> str:
+    """Ключ кэша сжатых тел: хэш на порядок дешевле сжатия того же тела."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class CompressedPayloadCache:
+    """
+    LRU уже сжатых тел ответов по ключу (хэш несжатого тела, кодировка) —
+    горячие списки сжимаются один раз, а не на каждый запрос.
+    Ключ считается по готовому телу, а не по ETag: ETag вычисляется до тела,
+    и изменение, зафиксированное между ними, не должно попасть в кэш под старым ключом.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str, encoding: str) -> Optional[bytes]:
+        with self._lock:
+            payload = self._entries.get((digest, encoding))
+            if payload is not None:
+                self._entries.move_to_end((digest, encoding))
+            return payload
+
+    def put(self, digest: str, encoding: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop((digest, encoding), None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[(digest, encoding)] = payload
+            self._size += len(payload)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
@@ -0,0 +1,104 @@
+# app/services/db_metrics.py
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограммы ожидания соединения, мс (последняя корзина — всё, что больше)
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolWaitHistogram:
+    """Гистограмма ожидания свободного соединения в пуле (в пределах процесса-воркера)."""
+
+    def __init__(self, buckets=WAIT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._counts: List[int] = [0] * (len(self.buckets) + 1)
+        self._total = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, wait_ms: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, wait_ms)] += 1
+            self._total += 1
+            self._sum_ms += wait_ms
+            self._max_ms = max(self._max_ms, wait_ms)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            labels = [f"le_{b}ms" for b in self.buckets] + ["inf"]
+            return {
+                "count": self._total,
+                "sum_ms": round(self._sum_ms, 3),
+                "max_ms": round(self._max_ms, 3),
+                "avg_ms": round(self._sum_ms / self._total, 3) if self._total else 0.0,
+                "buckets": dict(zip(labels, self._counts)),
+            }
+
+
+def record_checkout_wait(histogram: PoolWaitHistogram, wait_ms: float) -> None:
+    histogram.observe(wait_ms)
+    if wait_ms > settings.DB_POOL_WAIT_WARNING_MS:
+        logger.warning(
+            "DB pool checkout took %.1f ms (threshold %.0f ms) — pool is saturated, "
+            "consider raising DB_POOL_SIZE/DB_MAX_OVERFLOW",
+            wait_ms, settings.DB_POOL_WAIT_WARNING_MS,
+        )
+
+
+class _TimedQueue(AsyncAdaptedQueue):
+    """Очередь свободных соединений пула: замеряет, сколько checkout ждал соединение."""
+    histogram: Optional[PoolWaitHistogram] = None
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        started = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            if self.histogram is not None:
+                record_checkout_wait(self.histogram, (time.perf_counter() - started) * 1000)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool с гистограммой ожидания свободного соединения.
+    Замеряется только ожидание в очереди пула: открытие нового соединения, pre-ping и recycle
+    идут после него и в гистограмму не попадают (событие checkout срабатывает уже после них).
+    """
+    _queue_class = _TimedQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = PoolWaitHistogram()
+        self._pool.histogram = self.wait_histogram
+
+
+def wait_snapshot(pool) -> Dict:
+    """Гистограмма ожидания пула; у пулов без очереди (SQLite) — пустая."""
+    histogram = getattr(pool, "wait_histogram", None)
+    return (histogram or PoolWaitHistogram()).snapshot()
+
+
+def pool_status(pool) -> Dict:
+    """Текущее состояние пула; у пулов без очереди (SQLite) части счётчиков нет."""
+    def _call(name):
+        method = getattr(pool, name, None)
+        return method() if callable(method) else None
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": _call("size"),
+        "checked_in": _call("checkedin"),
+        "checked_out": _call("checkedout"),
+        "overflow": _call("overflow"),
+    }
@@ -0,0 +1,167 @@
+# app/services/etag.py
+import hashlib
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.services.compression import supported_encodings
+from app.sqlmodels.table_version import TableVersion
+
+# Таблицы, для которых ведём счётчик изменений (строки заводятся миграцией)
+TRACKED_TABLES = {
+    "person",
+    "artist",
+    "artistperson",
+    "album",
+    "album_artist",
+    "track",
+    "trackartist",
+    "track_artist_share",
+    "track_person_share",
+    "excel_reports",
+    "raw_usage_data_strict",
+}
+
+_TRACK_TABLES = ("track", "trackartist", "artist", "album")
+_TRACK_DETAIL_TABLES = _TRACK_TABLES + ("artistperson", "person", "track_person_share", "track_artist_share")
+_ARTIST_TABLES = ("artist", "artistperson", "person")
+_ALBUM_TABLES = ("album", "album_artist", "artist")
+_PERSON_TABLES = ("person",)
+_REPORT_TABLES = ("excel_reports", "raw_usage_data_strict")
+
+# GET-маршрут → таблицы, от которых зависит ответ
+ETAG_ROUTES: List[Tuple[re.Pattern, Tuple[str, ...]]] = [
+    (re.compile(r"^/api/v1/tracks/?$"), _TRACK_TABLES),
+    (re.compile(r"^/api/v1/tracks/\d+$"), _TRACK_DETAIL_TABLES),
+    (re.compile(r"^/api/v1/artists/?(\d+)?$"), _ARTIST_TABLES),
+    (re.compile(r"^/api/v1/albums/?(\d+)?$"), _ALBUM_TABLES),
+    (re.compile(r"^/api/v1/people/?(\d+)?$"), _PERSON_TABLES),
+    (re.compile(r"^/api/v1/drafts/persons$"), _PERSON_TABLES),
+    (re.compile(r"^/api/v1/drafts/tracks$"), _TRACK_TABLES),
+    (re.compile(r"^/api/v1/drafts/artists$"), _ARTIST_TABLES),
+    (re.compile(r"^/api/v1/drafts/albums$"), _ALBUM_TABLES),
+    (re.compile(r"^/api/v1/drafts/summary$"), ("person", "artist", "album", "track")),
+    (re.compile(r"^/api/v1/raw-data/?(\d+)?(/raw-data)?$"), _REPORT_TABLES),
+]
+
+# Маршруты только для администраторов: 304 отдаём, лишь убедившись в роли
+ADMIN_ONLY_ROUTES = re.compile(r"^/api/v1/drafts/")
+
+
+def resolve_etag_tables(path: str) -> Optional[Tuple[str, ...]]:
+    """Возвращает таблицы, от которых зависит ответ на GET path, или None, если ETag не поддерживается."""
+    for pattern, tables in ETAG_ROUTES:
+        if pattern.match(path):
+            return tables
+    return None
+
+
+def etag_requires_admin(path: str) -> bool:
+    return ADMIN_ONLY_ROUTES.match(path) is not None
+
+
+async def get_table_versions(session: AsyncSession, tables: Iterable[str]) -> Dict[str, int]:
+    """Один запрос по первичному ключу маленькой таблицы — без ORM-сущностей и сериализации."""
+    result = await session.execute(
+        select(TableVersion.table_name, TableVersion.version)
+        .where(TableVersion.table_name.in_(list(tables)))
+    )
+    return {name: version for name, version in result.all()}
+
+
+def compute_etag(key: str, versions: Dict[str, int], scope: str = "") -> str:
+    """Сильный ETag: хэш от пути с query, версий таблиц и области видимости (токена пользователя)."""
+    raw = "|".join(
+        [key, scope] + [f"{name}:{versions.get(name, 0)}" for name in sorted(versions)]
+    )
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def with_encoding(etag: str, encoding: str) -> str:
+    """ETag сжатого представления: у gzip, br и несжатого тела разные ETag (RFC 9110, 8.8.3)."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _without_encoding(tag: str) -> str:
+    for encoding in supported_encodings():
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def matching_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    Тег из If-None-Match, совпавший с etag или с его вариантом для сжатого представления, иначе None.
+    Его и возвращаем в 304: клиент хранит именно это представление.
+    """
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return etag
+    # Для If-None-Match допускается слабое сравнение (RFC 9110, 13.1.2)
+    for candidate in (c.strip().removeprefix("W/") for c in if_none_match.split(",")):
+        if _without_encoding(candidate) == etag:
+            return candidate
+    return None
+
+
+# Ключ в session.info: таблицы, изменённые в текущей транзакции
+_PENDING_KEY = "etag_touched_tables"
+
+
+def _mark_tables(session: Session, tables: Iterable[str]) -> None:
+    touched = set(tables) & TRACKED_TABLES
+    if touched:
+        session.info.setdefault(_PENDING_KEY, set()).update(touched)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_tables(session: Session, flush_context) -> None:
+    # Таблицы всех объектов, записанных этим flush
+    _mark_tables(session, (
+        obj.__table__.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if hasattr(obj, "__table__")
+    ))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state) -> None:
+    # delete(...)/update(...)/insert(...) через session.execute не проходят через flush
+    if not (orm_execute_state.is_delete or orm_execute_state.is_update or orm_execute_state.is_insert):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None:
+        _mark_tables(orm_execute_state.session, [table.name])
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_touched_tables(session: Session) -> None:
+    """
+    Счётчики увеличиваем в той же транзакции, последним запросом перед commit: блокировка строк
+    table_version держится только на время фиксации, а не всю транзакцию изменения.
+    Откат транзакции откатывает и счётчики; своего соединения из пула это не требует.
+    """
+    # before_commit вызывается до последнего flush — сбрасываем изменения сами, чтобы учесть их таблицы
+    session.flush()
+    tables = session.info.pop(_PENDING_KEY, None)
+    if not tables:
+        return
+    version = TableVersion.__table__
+    # Сортировка — чтобы параллельные транзакции брали блокировки строк в одном порядке
+    session.connection().execute(
+        update(version)
+        .where(version.c.table_name.in_(sorted(tables)))
+        .values(version=version.c.version + 1)
+    )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_touched_tables(session: Session, previous_transaction) -> None:
+    # Откат вложенной транзакции (savepoint) не отменяет изменения внешней
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
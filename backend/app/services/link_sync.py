@@ -0,0 +1,95 @@
+# app/services/link_sync.py
+from typing import Any, Dict, Iterable, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Обновление таблиц-связей (TrackArtist, AlbumArtist, ArtistPerson, TrackArtistShare) по разнице множеств:
+# строки, которые уже есть, не трогаем, поэтому повторное сохранение без изменений
+# не пишет в таблицу связей ничего (ни DELETE, ни INSERT).
+
+
+async def sync_links(
+    session: AsyncSession,
+    owner_column,
+    owner_id: int,
+    target_column,
+    target_ids: Iterable[int],
+) -> Tuple[int, int]:
+    """
+    Приводит связи владельца (например, TrackArtist.track_id == track_id) к набору target_ids.
+    Не больше одного DELETE и одного INSERT; возвращает (добавлено, удалено).
+    """
+    link = owner_column.class_
+    wanted = list(dict.fromkeys(target_ids))  # порядок запроса, без повторов
+
+    result = await session.execute(select(target_column).where(owner_column == owner_id))
+    current = set(result.scalars().all())
+
+    removed = current.difference(wanted)
+    added = [target_id for target_id in wanted if target_id not in current]
+
+    if removed:
+        await session.execute(
+            delete(link)
+            .where(owner_column == owner_id, target_column.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    if added:
+        await session.execute(
+            insert(link),
+            [{owner_column.key: owner_id, target_column.key: target_id} for target_id in added],
+        )
+    return len(added), len(removed)
+
+
+async def sync_link_values(
+    session: AsyncSession,
+    owner_column,
+    owner_id: int,
+    target_column,
+    value_column,
+    values: Dict[int, Any],
+) -> Tuple[int, int, int]:
+    """
+    То же для связей со значением (например, TrackArtistShare.percent): строки с тем же значением
+    не трогаем, изменённые — один UPDATE по первичному ключу (executemany).
+    Возвращает (добавлено, изменено, удалено).
+    """
+    link = owner_column.class_
+
+    result = await session.execute(
+        select(target_column, value_column).where(owner_column == owner_id)
+    )
+    current = dict(result.all())
+
+    removed = current.keys() - values.keys()
+    added = [target_id for target_id in values if target_id not in current]
+    changed = [
+        target_id for target_id, value in values.items()
+        if target_id in current and current[target_id] != value
+    ]
+
+    if removed:
+        await session.execute(
+            delete(link)
+            .where(owner_column == owner_id, target_column.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    if changed:
+        await session.execute(
+            update(link),
+            [
+                {owner_column.key: owner_id, target_column.key: target_id, value_column.key: values[target_id]}
+                for target_id in changed
+            ],
+        )
+    if added:
+        await session.execute(
+            insert(link),
+            [
+                {owner_column.key: owner_id, target_column.key: target_id, value_column.key: values[target_id]}
+                for target_id in added
+            ],
+        )
+    return len(added), len(changed), len(removed)
@@ -0,0 +1,167 @@
+# app/services/outbox.py
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, Text, cast, event, func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.sqlmodels.change_outbox import ChangeOutbox
+
+# Таблица → (тип сущности в ленте, колонка с id этой сущности).
+# Изменение связи (артисты трека, участники артиста, доли) — это изменение сущности-владельца.
+OUTBOX_TABLES: Dict[str, Tuple[str, str]] = {
+    "track": ("track", "id"),
+    "album": ("album", "id"),
+    "artist": ("artist", "id"),
+    "person": ("person", "id"),
+    "track_person_share": ("track_person_share", "track_id"),
+    "trackartist": ("track", "track_id"),
+    "track_artist_share": ("track", "track_id"),
+    "album_artist": ("album", "album_id"),
+    "artistperson": ("artist", "artist_id"),
+}
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+_outbox = ChangeOutbox.__table__
+
+
+def _op_for(table_name: str, deleted: bool) -> str:
+    # Удаление строки связи не удаляет владельца — он изменился
+    is_entity = OUTBOX_TABLES[table_name][1] == "id"
+    return DELETE if deleted and is_entity else UPSERT
+
+
+def _write_events(session: Session, events: Iterable[Tuple[str, int, str]]) -> None:
+    """Пишет события через соединение сессии — в той же транзакции, что и изменение."""
+    now = datetime.utcnow()
+    rows = [
+        {"entity_type": entity_type, "entity_id": entity_id, "op": op, "created_at": now}
+        for entity_type, entity_id, op in dict.fromkeys(events)
+        if entity_id is not None
+    ]
+    if rows:
+        session.connection().execute(insert(_outbox), rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session: Session, flush_context) -> None:
+    # dirty включает объекты без реальных изменений колонок — их пропускаем
+    changed = [obj for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    events = []
+    for objects, deleted in ((session.new, False), (changed, False), (session.deleted, True)):
+        for obj in objects:
+            table = getattr(obj, "__table__", None)
+            if table is None or table.name not in OUTBOX_TABLES:
+                continue
+            entity_type, id_column = OUTBOX_TABLES[table.name]
+            events.append((entity_type, getattr(obj, id_column), _op_for(table.name, deleted)))
+    _write_events(session, events)
+
+
+def _ids_from_parameters(parameters, id_column: str) -> Optional[List[int]]:
+    if isinstance(parameters, dict):
+        parameters = [parameters]
+    if not parameters or any(id_column not in params for params in parameters):
+        return None
+    return [params[id_column] for params in parameters]
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_changes(orm_execute_state):
+    """
+    insert/update/delete через session.execute не проходят через flush.
+    id затронутых сущностей берём из параметров (executemany), из RETURNING (вставка сущностей)
+    или выбираем по WHERE того же запроса до его выполнения.
+    """
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    statement = orm_execute_state.statement
+    table = getattr(statement, "table", None)
+    if table is None or table.name not in OUTBOX_TABLES:
+        return None
+    entity_type, id_column = OUTBOX_TABLES[table.name]
+    session = orm_execute_state.session
+    op = _op_for(table.name, orm_execute_state.is_delete)
+
+    ids = _ids_from_parameters(orm_execute_state.parameters, id_column)
+    if ids is not None:
+        _write_events(session, ((entity_type, entity_id, op) for entity_id in ids))
+        return None
+
+    if orm_execute_state.is_insert:
+        # Новые сущности: id известны только из RETURNING — читаем результат и отдаём вызывающему копию
+        if id_column not in {column["name"] for column in statement.returning_column_descriptions}:
+            return None
+        frozen = orm_execute_state.invoke_statement().freeze()
+        ids = [row[id_column] for row in frozen().mappings()]
+        _write_events(session, ((entity_type, entity_id, op) for entity_id in ids))
+        return frozen()
+
+    # update/delete по условию: какие строки оно затронет — до выполнения, в той же транзакции
+    query = select(table.c[id_column]).distinct()
+    if statement.whereclause is not None:
+        query = query.where(statement.whereclause)
+    ids = session.connection().execute(query).scalars().all()
+    _write_events(session, ((entity_type, entity_id, op) for entity_id in ids))
+    return None
+
+
+def _xid8_to_bigint(expression):
+    return cast(cast(expression, Text), BigInteger)
+
+
+def _visible_rows_query(dialect_name: str, after: int, limit: int):
+    """
+    Страница журнала, которая уже не может пополниться строками «из прошлого».
+    PostgreSQL: id выдаются при вставке, а фиксируются транзакции в другом порядке — строка с меньшим id
+    может стать видимой после строки с большим, и курсор по id её пропустит. Поэтому лента идёт
+    в порядке (xid, id) и только по транзакциям старше pg_snapshot_xmin — самой старой незавершённой:
+    такие строки уже зафиксированы (или откачены), а новые получат xid не меньше этой границы.
+    Курсор остаётся id последнего события; его xid берём из журнала.
+    SQLite: пишущие транзакции выполняются строго по очереди, поэтому id выдаются в порядке фиксации.
+    """
+    columns = (_outbox.c.id, _outbox.c.entity_type, _outbox.c.entity_id, _outbox.c.op, _outbox.c.created_at)
+    if dialect_name != "postgresql":
+        return select(*columns).where(_outbox.c.id > after).order_by(_outbox.c.id).limit(limit)
+
+    horizon = _xid8_to_bigint(func.pg_snapshot_xmin(func.pg_current_snapshot()))
+    after_xid = func.coalesce(select(_outbox.c.xid).where(_outbox.c.id == after).scalar_subquery(), -1)
+    return (
+        select(*columns)
+        .where(_outbox.c.xid < horizon, tuple_(_outbox.c.xid, _outbox.c.id) > tuple_(after_xid, after))
+        .order_by(_outbox.c.xid, _outbox.c.id)
+        .limit(limit)
+    )
+
+
+async def read_changes(session: AsyncSession, after: int, limit: int) -> Tuple[List[dict], int, bool]:
+    """
+    Зафиксированные события журнала после курсора after, сжатые до последнего события на сущность.
+    Порядок на PostgreSQL — по xid (началу транзакции), а не по фиксации: op — подсказка,
+    актуальное состояние сущности потребитель перечитывает. Возвращает (события, курсор для следующего запроса, есть ли ещё).
+    """
+    result = await session.execute(_visible_rows_query(session.bind.dialect.name, after, limit + 1))
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Сжатие: по каждой сущности остаётся последнее событие страницы, порядок — по нему
+    latest: Dict[Tuple[str, int], tuple] = {}
+    for row in rows:
+        latest.pop((row.entity_type, row.entity_id), None)
+        latest[(row.entity_type, row.entity_id)] = row
+    changes = [
+        {
+            "change_id": row.id,
+            "entity_type": row.entity_type,
+            "entity_id": row.entity_id,
+            "op": row.op,
+            "changed_at": row.created_at,
+        }
+        for row in latest.values()
+    ]
+    next_after = rows[-1].id if rows else after
+    return changes, next_after, has_more
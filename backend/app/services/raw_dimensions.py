@@ -0,0 +1,69 @@
+# app/services/raw_dimensions.py
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import String, column, select, table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.models.raw_data import RawUsageDataResponse
+from app.sqlmodels.raw_excel_data import RAW_DIMENSIONS, RawUsageDataStrict
+
+DECODED_VIEW = "raw_usage_data_strict_decoded"
+# Значений в одном INSERT/IN справочника — с запасом под лимит параметров драйвера
+DIMENSION_CHUNK_SIZE = 1000
+
+
+def _view_column(name: str):
+    if name in RAW_DIMENSIONS:
+        return column(name, String)
+    return column(name, RawUsageDataStrict.__table__.c[name].type)
+
+
+# Представление (миграция 7c2e4b9f1a36): строки отчёта с расшифрованными справочниками
+# в форме RawUsageDataResponse. Объявлено через table(), чтобы не попасть в метаданные моделей
+raw_usage_data_decoded = table(
+    DECODED_VIEW,
+    *(_view_column(name) for name in ("excel_report_id", *RawUsageDataResponse.model_fields)),
+)
+
+
+def _insert_ignoring_duplicates(session: AsyncSession, model):
+    insert = pg_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+    return insert(model).on_conflict_do_nothing(index_elements=["value"])
+
+
+class DimensionEncoder:
+    """
+    Словари значение → ключ справочника на одну загрузку:
+    по паре запросов на справочник (INSERT ... ON CONFLICT DO NOTHING и SELECT) вместо запроса на строку.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.keys: Dict[str, Dict[str, int]] = {name: {} for name in RAW_DIMENSIONS}
+
+    async def load(self, values: Dict[str, Iterable[Optional[str]]]) -> None:
+        for name, model in RAW_DIMENSIONS.items():
+            known = self.keys[name]
+            # Сортировка — параллельные загрузки вставляют общие значения в одном порядке и не взаимоблокируются
+            missing = sorted({v for v in values.get(name, ()) if v is not None and v not in known})
+            for start in range(0, len(missing), DIMENSION_CHUNK_SIZE):
+                chunk = missing[start:start + DIMENSION_CHUNK_SIZE]
+                await self.session.execute(
+                    _insert_ignoring_duplicates(self.session, model).values([{"value": v} for v in chunk])
+                )
+                result = await self.session.execute(
+                    select(model.id, model.value).where(model.value.in_(chunk))
+                )
+                known.update({value: key for key, value in result.all()})
+
+    def encode(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Заменяет текстовые поля справочников на <поле>_id; остальные поля — как есть."""
+        encoded = {}
+        for name, value in row.items():
+            if name in RAW_DIMENSIONS:
+                encoded[f"{name}_id"] = None if value is None else self.keys[name][value]
+            else:
+                encoded[name] = value
+        return encoded
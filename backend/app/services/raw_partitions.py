@@ -0,0 +1,37 @@
+# app/services/raw_partitions.py
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.sqlmodels.raw_excel_data import RawUsageDataStrict
+
+# На PostgreSQL raw_usage_data_strict разбита LIST-секциями по excel_report_id (миграция 5d1a9c3e7b20):
+# у каждого отчёта своя секция, и удаление отчёта — это DETACH + DROP, а не DELETE миллионов строк.
+# На SQLite таблица обычная, и используется DELETE.
+PARENT_TABLE = RawUsageDataStrict.__tablename__
+
+
+def partition_name(report_id: int) -> str:
+    return f"{PARENT_TABLE}_p{int(report_id)}"
+
+
+def is_partitioned(session: AsyncSession) -> bool:
+    return session.bind.dialect.name == "postgresql"
+
+
+async def create_report_partition(session: AsyncSession, report_id: int) -> None:
+    """Создаёт пустую секцию под отчёт. Вызывать в короткой транзакции до загрузки строк."""
+    report_id = int(report_id)
+    await session.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(report_id)} "
+        f"PARTITION OF {PARENT_TABLE} FOR VALUES IN ({report_id})"
+    ))
+
+
+async def drop_report_partition(session: AsyncSession, report_id: int) -> None:
+    """Отсоединяет и удаляет секцию отчёта — O(1) по числу строк."""
+    name = partition_name(report_id)
+    exists = await session.execute(text("SELECT to_regclass(:name)"), {"name": name})
+    if exists.scalar() is None:
+        return
+    await session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+    await session.execute(text(f"DROP TABLE {name}"))
@@ -0,0 +1,204 @@
+# app/services/report_archive.py
+import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import quote
+
+from sqlalchemy import Integer, Numeric, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.raw_dimensions import raw_usage_data_decoded
+from app.settings import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # без pyarrow архив и аналитика по нему недоступны, загрузка отчётов работает как прежде
+    pa = None
+
+# Колонки секционирования архива (каталоги period=.../platform=...); в самих файлах их нет
+PARTITION_COLUMNS = ("period", "platform")
+# Значение NULL в каталоге секции — как у Hive, pyarrow читает его обратно как null
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# По чему можно группировать и фильтровать в аналитике
+GROUP_BY_COLUMNS = (
+    "period", "platform", "right_type", "territory", "content_type", "usage_type",
+    "performer_name_excel", "isrc", "excel_report_id",
+)
+METRIC_COLUMNS = (
+    "quantity", "total_royalty_author", "total_royalty_neighboring",
+    "calculated_royalty_author", "calculated_royalty_neighboring", "calculated_total_royalty",
+)
+ARCHIVE_COLUMNS = tuple(column.name for column in raw_usage_data_decoded.columns)
+
+
+def archive_available() -> bool:
+    return pa is not None
+
+
+def _root() -> Path:
+    return Path(settings.REPORT_ARCHIVE_DIR)
+
+
+def _dataset_dir() -> Path:
+    return _root() / "dataset"
+
+
+def _manifest_path(report_id: int) -> Path:
+    return _root() / "manifests" / f"{int(report_id)}.json"
+
+
+def _arrow_type(sql_type):
+    if isinstance(sql_type, Numeric):
+        return pa.decimal128(sql_type.precision, sql_type.scale)
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    return pa.string()
+
+
+def _file_schema():
+    return pa.schema([
+        (column.name, _arrow_type(column.type))
+        for column in raw_usage_data_decoded.columns
+        if column.name not in PARTITION_COLUMNS
+    ])
+
+
+def _partitioning():
+    # Сегменты каталогов закодированы как URI (quote в _partition_dir) — segment_encoding="uri" их раскодирует
+    return ds.HivePartitioning(
+        pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]),
+        null_fallback=NULL_PARTITION, segment_encoding="uri",
+    )
+
+
+def _partition_dir(period: Optional[str], platform: Optional[str]) -> Path:
+    def segment(value):
+        return NULL_PARTITION if value is None else quote(value, safe="")
+    return _dataset_dir() / f"period={segment(period)}" / f"platform={segment(platform)}"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def read_manifest(report_id: int) -> Optional[Dict[str, Any]]:
+    path = _manifest_path(report_id)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_report_files(report_id: int, rows: Sequence[tuple]) -> Dict[str, Any]:
+    """Раскладывает строки отчёта по секциям (период, площадка); имя файла — sha256 его содержимого."""
+    schema = _file_schema()
+    period_idx, platform_idx = (ARCHIVE_COLUMNS.index(name) for name in PARTITION_COLUMNS)
+    file_columns = [ARCHIVE_COLUMNS.index(name) for name in schema.names]
+
+    groups: Dict[tuple, List[tuple]] = {}
+    for row in rows:
+        groups.setdefault((row[period_idx], row[platform_idx]), []).append(row)
+
+    files = []
+    for (period, platform), group in sorted(groups.items(), key=lambda kv: (str(kv[0][0]), str(kv[0][1]))):
+        table = pa.Table.from_arrays(
+            [pa.array([row[i] for row in group], type=field.type) for i, field in zip(file_columns, schema)],
+            schema=schema,
+        )
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink, compression="zstd")
+        data = sink.getvalue().to_pybytes()
+        digest = hashlib.sha256(data).hexdigest()
+        path = _partition_dir(period, platform) / f"{digest}.parquet"
+        if not path.exists():  # одинаковое содержимое уже лежит в хранилище
+            _atomic_write(path, data)
+        files.append({
+            "path": path.relative_to(_root()).as_posix(),
+            "sha256": digest,
+            "rows": len(group),
+            "period": period,
+            "platform": platform,
+        })
+
+    # Повторная выгрузка: файлы прошлой версии, которых нет в новой, убираем
+    previous = read_manifest(report_id)
+    if previous:
+        current = {f["path"] for f in files}
+        for stale in previous["files"]:
+            if stale["path"] not in current:
+                (_root() / stale["path"]).unlink(missing_ok=True)
+
+    manifest = {
+        "report_id": int(report_id),
+        "rows": len(rows),
+        "files": files,
+        "exported_at": datetime.utcnow().isoformat(),
+    }
+    _atomic_write(_manifest_path(report_id), json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    return manifest
+
+
+async def export_report(session: AsyncSession, report_id: int) -> Dict[str, Any]:
+    """Выгружает строки отчёта в архив Parquet; запись файлов — в отдельном потоке."""
+    result = await session.execute(
+        select(*raw_usage_data_decoded.columns)
+        .where(raw_usage_data_decoded.c.excel_report_id == report_id)
+        .order_by(raw_usage_data_decoded.c.row_index)
+    )
+    rows = result.all()
+    return await asyncio.to_thread(_write_report_files, report_id, rows)
+
+
+def _remove_report_files(report_id: int) -> None:
+    manifest = read_manifest(report_id)
+    if manifest is None:
+        return
+    for entry in manifest["files"]:
+        (_root() / entry["path"]).unlink(missing_ok=True)
+    _manifest_path(report_id).unlink(missing_ok=True)
+
+
+async def remove_report_archive(report_id: int) -> None:
+    await asyncio.to_thread(_remove_report_files, report_id)
+
+
+def _query(group_by: Sequence[str], filters: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    if not _dataset_dir().exists():
+        return []
+    dataset = ds.dataset(_dataset_dir(), format="parquet", partitioning=_partitioning())
+
+    # Фильтр по period/platform отсекает каталоги, остальные — группы строк по статистике Parquet
+    expression = None
+    for name, values in filters.items():
+        condition = ds.field(name).isin(list(values))
+        expression = condition if expression is None else expression & condition
+
+    table = dataset.to_table(
+        columns=list(dict.fromkeys([*group_by, *METRIC_COLUMNS, "excel_report_id"])),
+        filter=expression,
+    )
+    if not group_by:
+        totals = {name: pc.sum(table[name]).as_py() for name in METRIC_COLUMNS}
+        return [{**totals, "rows": table.num_rows}]
+
+    aggregated = table.group_by(list(group_by)).aggregate(
+        [(name, "sum") for name in METRIC_COLUMNS] + [("excel_report_id", "count")]
+    )
+    renamed = {f"{name}_sum": name for name in METRIC_COLUMNS}
+    renamed["excel_report_id_count"] = "rows"
+    aggregated = aggregated.rename_columns([renamed.get(name, name) for name in aggregated.column_names])
+    return aggregated.sort_by([(name, "ascending") for name in group_by]).to_pylist()
+
+
+async def query_archive(group_by: Sequence[str], filters: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Агрегаты (суммы метрик и число строк) по архиву с группировкой по group_by."""
+    return await asyncio.to_thread(_query, group_by, filters)
@@ -1,6 +1,63 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+from app.settings import settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
+# bcrypt (~100–300 мс на операцию) — в отдельном ограниченном пуле потоков, а не в цикле событий:
+# не больше PASSWORD_HASH_WORKERS операций одновременно, остальные ждут в очереди пула по порядку прихода
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_queued = 0  # операций в пуле (выполняются + ждут); меняется только из цикла событий
+
+
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+async def run_password_hashing(func: Callable[..., T], *args) -> T:
+    """Выполняет func в пуле хэширования; при переполненной очереди — 503 вместо бесконечного ожидания."""
+    global _queued
+    if _queued >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent login attempts, retry later",
+            headers={"Retry-After": "1"},
+        )
+    loop = asyncio.get_running_loop()
+    future = _hash_executor.submit(func, *args)
+    _queued += 1
+    # Место освобождается, когда операция завершилась в пуле, а не когда ожидающий запрос ушёл:
+    # отменённый логин (клиент отключился), который уже выполняется, занимает поток до конца bcrypt
+    future.add_done_callback(lambda _: _release_slot(loop))
+    return await asyncio.wrap_future(future)
+
+
+def _decrement_queued() -> None:
+    global _queued
+    _queued -= 1
+
+
+def _release_slot(loop: asyncio.AbstractEventLoop) -> None:
+    # Колбэк вызывается из потока пула — счётчик меняем только в цикле событий
+    try:
+        loop.call_soon_threadsafe(_decrement_queued)
+    except RuntimeError:  # цикл уже закрыт (остановка приложения)
+        pass
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_password_hashing(get_password_hash, password)
+
+
+def shutdown_password_hashing() -> None:
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
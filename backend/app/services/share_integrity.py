@@ -0,0 +1,217 @@
+# app/services/share_integrity.py
+import asyncio
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.sqlmodels import Person, Track, TrackArtist, TrackArtistShare, TrackPersonShare
+
+try:
+    import numpy as np
+except ImportError:  # без numpy проверка долей недоступна, остальное приложение работает
+    np = None
+
+# Погрешность сравнения сумм процентов (доли хранятся с двумя знаками)
+EPSILON = 0.005
+# Предел суммы долей, если объём прав у трека не указан
+FULL_SCOPE = 100.0
+
+# Колонки TrackPersonShare, каждая из которых — процент в диапазоне 0..100
+PERSON_SHARE_COLUMNS = (
+    "share_of_monetization_of_copyrights",
+    "share_of_monetization_of_related_rights",
+    "copyrights",
+    "related_rights",
+)
+
+# Коды нарушений
+SHARE_OUT_OF_RANGE = "share_out_of_range"
+SCOPE_OUT_OF_RANGE = "scope_out_of_range"
+AUTHOR_SUM_EXCEEDS_SCOPE = "author_sum_exceeds_scope"
+NEIGHBORING_SUM_EXCEEDS_SCOPE = "neighboring_sum_exceeds_scope"
+ARTIST_SUM_EXCEEDS_100 = "artist_sum_exceeds_100"
+ORPHAN_PERSON_SHARE = "orphan_person_share"
+ORPHAN_ARTIST_SHARE = "orphan_artist_share"
+
+
+def integrity_check_available() -> bool:
+    return np is not None
+
+
+@dataclass
+class ShareViolation:
+    code: str
+    track_id: int
+    person_id: Optional[int] = None
+    artist_id: Optional[int] = None
+    field: Optional[str] = None
+    value: Optional[float] = None
+    limit: Optional[float] = None
+
+
+@dataclass
+class ShareMatrix:
+    """Все доли каталога в виде массивов numpy — по массиву на колонку."""
+    track_id: Any
+    scope_of_copyright: Any
+    scope_of_related_rights: Any
+    person_id: Any  # id существующих персон
+    share_track_id: Any
+    share_person_id: Any
+    share_columns: Dict[str, Any]
+    link_track_id: Any  # связи TrackArtist
+    link_artist_id: Any
+    artist_share_track_id: Any
+    artist_share_artist_id: Any
+    artist_share_percent: Any
+
+
+@dataclass
+class ShareIntegrityReport:
+    tracks_checked: int
+    links_checked: int
+    violations: List[ShareViolation]
+
+    def counts_by_code(self) -> Dict[str, int]:
+        return dict(Counter(violation.code for violation in self.violations))
+
+
+def _columns(rows: List[tuple], width: int, dtypes: tuple) -> list:
+    """Строки запроса → по массиву на колонку; NULL в числовых колонках становится NaN."""
+    if not rows:
+        return [np.empty(0, dtype=dtype) for dtype in dtypes]
+    table = np.array([tuple(row) for row in rows], dtype=float).reshape(len(rows), width)
+    return [table[:, i].astype(dtype) for i, dtype in enumerate(dtypes)]
+
+
+async def load_share_matrix(session: AsyncSession) -> ShareMatrix:
+    """Пять запросов на весь каталог; дальше проверка идёт по массивам без обращений к БД."""
+    tracks = (await session.execute(
+        select(Track.id, Track.scope_of_copyright, Track.scope_of_related_rights).order_by(Track.id)
+    )).all()
+    persons = (await session.execute(select(Person.id))).scalars().all()
+    shares = (await session.execute(
+        select(TrackPersonShare.track_id, TrackPersonShare.person_id,
+               *(getattr(TrackPersonShare, name) for name in PERSON_SHARE_COLUMNS))
+    )).all()
+    links = (await session.execute(select(TrackArtist.track_id, TrackArtist.artist_id))).all()
+    artist_shares = (await session.execute(
+        select(TrackArtistShare.track_id, TrackArtistShare.artist_id, TrackArtistShare.percent)
+    )).all()
+
+    track_id, scope_copyright, scope_related = _columns(tracks, 3, (np.int64, float, float))
+    share_track_id, share_person_id, *share_values = _columns(
+        shares, 2 + len(PERSON_SHARE_COLUMNS), (np.int64, np.int64) + (float,) * len(PERSON_SHARE_COLUMNS)
+    )
+    link_track_id, link_artist_id = _columns(links, 2, (np.int64, np.int64))
+    as_track_id, as_artist_id, as_percent = _columns(artist_shares, 3, (np.int64, np.int64, float))
+
+    return ShareMatrix(
+        track_id=track_id,
+        scope_of_copyright=scope_copyright,
+        scope_of_related_rights=scope_related,
+        person_id=np.array(sorted(persons), dtype=np.int64),
+        share_track_id=share_track_id,
+        share_person_id=share_person_id,
+        share_columns=dict(zip(PERSON_SHARE_COLUMNS, share_values)),
+        link_track_id=link_track_id,
+        link_artist_id=link_artist_id,
+        artist_share_track_id=as_track_id,
+        artist_share_artist_id=as_artist_id,
+        artist_share_percent=as_percent,
+    )
+
+
+def _track_positions(track_ids, ids):
+    """Позиции ids в отсортированном track_ids и маска «трек существует»."""
+    if len(track_ids) == 0:
+        return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+    positions = np.minimum(np.searchsorted(track_ids, ids), len(track_ids) - 1)
+    return positions, track_ids[positions] == ids
+
+
+def _pair_keys(first, second):
+    return first.astype(np.int64) * (1 << 32) + second.astype(np.int64)
+
+
+def validate_share_matrix(matrix: ShareMatrix) -> ShareIntegrityReport:
+    """Все проверки — векторные операции над массивами; Python-объекты создаются только для нарушений."""
+    m = matrix
+    violations: List[ShareViolation] = []
+    n_tracks = len(m.track_id)
+
+    # Объём прав трека: 0..100, не указан — считаем 100
+    for field, scope in (("scope_of_copyright", m.scope_of_copyright),
+                         ("scope_of_related_rights", m.scope_of_related_rights)):
+        for i in np.flatnonzero((scope < 0) | (scope > FULL_SCOPE)):
+            violations.append(ShareViolation(
+                SCOPE_OUT_OF_RANGE, int(m.track_id[i]), field=field, value=float(scope[i]), limit=FULL_SCOPE,
+            ))
+
+    # Каждая доля персоны — в 0..100
+    for field, values in m.share_columns.items():
+        for i in np.flatnonzero((values < 0) | (values > FULL_SCOPE)):
+            violations.append(ShareViolation(
+                SHARE_OUT_OF_RANGE, int(m.share_track_id[i]), person_id=int(m.share_person_id[i]),
+                field=field, value=float(values[i]), limit=FULL_SCOPE,
+            ))
+
+    # Доли без трека или без персоны
+    positions, track_exists = _track_positions(m.track_id, m.share_track_id)
+    person_exists = np.isin(m.share_person_id, m.person_id)
+    for i in np.flatnonzero(~track_exists | ~person_exists):
+        violations.append(ShareViolation(
+            ORPHAN_PERSON_SHARE, int(m.share_track_id[i]), person_id=int(m.share_person_id[i]),
+        ))
+
+    # Суммы долей персон по трекам не больше объёма прав трека
+    valid = track_exists
+    for code, field, scope in (
+        (AUTHOR_SUM_EXCEEDS_SCOPE, "share_of_monetization_of_copyrights", m.scope_of_copyright),
+        (NEIGHBORING_SUM_EXCEEDS_SCOPE, "share_of_monetization_of_related_rights", m.scope_of_related_rights),
+    ):
+        totals = np.bincount(positions[valid], weights=m.share_columns[field][valid], minlength=n_tracks)
+        limits = np.where(np.isnan(scope), FULL_SCOPE, scope)
+        for i in np.flatnonzero(totals > limits + EPSILON):
+            violations.append(ShareViolation(
+                code, int(m.track_id[i]), field=field, value=round(float(totals[i]), 4), limit=float(limits[i]),
+            ))
+
+    # Доли артистов: только у артистов трека, в сумме не больше 100
+    link_keys = _pair_keys(m.link_track_id, m.link_artist_id)
+    share_keys = _pair_keys(m.artist_share_track_id, m.artist_share_artist_id)
+    linked = np.isin(share_keys, link_keys)
+    for i in np.flatnonzero(~linked):
+        violations.append(ShareViolation(
+            ORPHAN_ARTIST_SHARE, int(m.artist_share_track_id[i]), artist_id=int(m.artist_share_artist_id[i]),
+        ))
+    artist_positions, artist_track_exists = _track_positions(m.track_id, m.artist_share_track_id)
+    counted = linked & artist_track_exists
+    artist_totals = np.bincount(
+        artist_positions[counted], weights=m.artist_share_percent[counted], minlength=n_tracks,
+    )
+    for i in np.flatnonzero(artist_totals > FULL_SCOPE + EPSILON):
+        violations.append(ShareViolation(
+            ARTIST_SUM_EXCEEDS_100, int(m.track_id[i]), field="percent",
+            value=round(float(artist_totals[i]), 4), limit=FULL_SCOPE,
+        ))
+
+    violations.sort(key=lambda v: (v.track_id, v.code, v.person_id or 0, v.artist_id or 0))
+    return ShareIntegrityReport(
+        tracks_checked=n_tracks,
+        links_checked=len(m.share_track_id) + len(m.artist_share_track_id),
+        violations=violations,
+    )
+
+
+async def check_share_integrity(session: AsyncSession) -> ShareIntegrityReport:
+    """Загружает матрицу долей и проверяет её в отдельном потоке, не блокируя цикл событий."""
+    matrix = await load_share_matrix(session)
+    return await asyncio.to_thread(validate_share_matrix, matrix)
+
+
+def violation_dict(violation: ShareViolation) -> Dict[str, Any]:
+    return {key: value for key, value in asdict(violation).items() if value is not None}
@@ -0,0 +1,103 @@
+# app/services/sql_logging.py
+import logging
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("app.sql")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|\?|__\[POSTCOMPILE_\w+\]")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"VALUES\s*\(\?\)(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Нормализованный текст запроса без параметров и литералов:
+    одинаковые по форме запросы (в т.ч. с IN-списками и multi-row VALUES разной длины) дают один отпечаток.
+    """
+    text = _STRING_LITERAL.sub("?", statement)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _PLACEHOLDER_LIST.sub("(?)", text)
+    text = _VALUES_LIST.sub("VALUES (?)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class SQLStatementStats:
+    """Агрегаты по отпечаткам запросов в пределах процесса-воркера."""
+
+    def __init__(self):
+        self._stats: Dict[str, List[float]] = {}  # отпечаток → [count, total_ms, max_ms]
+        self._lock = threading.Lock()
+
+    def observe(self, key: str, duration_ms: float) -> None:
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                self._stats[key] = [1, duration_ms, duration_ms]
+                return
+            entry[0] += 1
+            entry[1] += duration_ms
+            if duration_ms > entry[2]:
+                entry[2] = duration_ms
+
+    def top(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda kv: kv[1][1], reverse=True)[:limit]
+        return [
+            {
+                "fingerprint": key,
+                "count": int(count),
+                "total_ms": round(total_ms, 3),
+                "avg_ms": round(total_ms / count, 3),
+                "max_ms": round(max_ms, 3),
+            }
+            for key, (count, total_ms, max_ms) in items
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+sql_statement_stats = SQLStatementStats()
+
+
+def install_sql_instrumentation(engine: Engine, sample_rate: float, slow_query_ms: float) -> None:
+    """
+    Вместо echo=True: на каждый запрос — отпечаток и длительность в агрегаты,
+    медленные запросы — warning, остальные — в лог с вероятностью sample_rate. Параметры не логируются.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        key = fingerprint(statement)
+        sql_statement_stats.observe(key, duration_ms)
+
+        if duration_ms >= slow_query_ms:
+            logger.warning("slow query %.1f ms executemany=%s: %s", duration_ms, executemany, key)
+        elif sample_rate > 0 and random.random() < sample_rate:
+            logger.info("query %.1f ms executemany=%s: %s", duration_ms, executemany, key)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # Запрос упал — снимаем отметку времени, чтобы стек не рос
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
@@ -4,7 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import AsyncSessionLocal
-from app.services.security import get_password_hash
+from app.services.security import get_password_hash_async
 from app.sqlmodels.user import User, Role
 
 
@@ -28,7 +28,7 @@ async def create_first_admin(
             # Создаём админа
             admin = User(
                 email=email,
-                hashed_password=get_password_hash(password),
+                hashed_password=await get_password_hash_async(password),
                 nickname=nickname,
                 role=Role.ADMIN,
                 is_active=True,
@@ -0,0 +1,135 @@
+# app/services/user_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.api.v1.models.user import UserResponse
+from app.settings import settings
+from app.sqlmodels.user import Role, User
+
+# Ключ в session.info: id пользователей, изменённых в текущей транзакции
+_PENDING_KEY = "user_cache_invalidate"
+# Подписанная часть JWT с данными пользователя (см. user_claim)
+CLAIM = "usr"
+
+
+class UserCache:
+    """
+    Активные пользователи по email (subject токена) с коротким TTL — в пределах процесса-воркера.
+    Изменения пользователей в этом процессе сбрасывают запись сразу, в остальных воркерах — по TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, UserResponse]]" = OrderedDict()
+        # user_id → когда его данные сброшены; подписанные данные в токенах, выданных раньше, не принимаются
+        self._invalidated_at: Dict[int, float] = {}
+        self._all_invalidated_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, email: str) -> Optional[UserResponse]:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[email]
+                return None
+            return user
+
+    def put(self, email: str, user: UserResponse) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[email] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._invalidated_at[user_id] = time.time()
+            for email in [e for e, (_, user) in self._entries.items() if user.id == user_id]:
+                del self._entries[email]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            # Неизвестно, кого затронуло массовое изменение, — не доверяем ни одному выданному ранее токену
+            self._invalidated_at.clear()
+            self._all_invalidated_at = time.time()
+
+    def invalidated_at(self, user_id: int) -> float:
+        with self._lock:
+            return max(self._invalidated_at.get(user_id, 0.0), self._all_invalidated_at)
+
+
+user_cache = UserCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_size=settings.USER_CACHE_MAX_SIZE,
+)
+
+
+def user_claim(user: User, issued_at: float) -> Dict[str, Any]:
+    """Данные пользователя для токена: первые USER_CLAIM_TTL_SECONDS после выдачи запросы обходятся без БД."""
+    return {
+        "id": user.id,
+        "role": user.role.value,
+        "iat": int(issued_at),
+        "until": int(issued_at + settings.USER_CLAIM_TTL_SECONDS),
+    }
+
+
+def user_from_claim(payload: Dict[str, Any], email: str) -> Optional[UserResponse]:
+    """Пользователь из подписанных данных токена, если они ещё действуют; иначе None — нужен поиск."""
+    claim = payload.get(CLAIM)
+    if not claim or settings.USER_CLAIM_TTL_SECONDS <= 0:
+        return None
+    try:
+        if claim["until"] < time.time() or claim["iat"] <= user_cache.invalidated_at(claim["id"]):
+            return None
+        return UserResponse(id=claim["id"], email=email, role=Role(claim["role"]), is_active=True)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    changed = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_user_statements(orm_execute_state) -> None:
+    # update(User)/delete(User) через session.execute — не знаем, кого затронуло, сбрасываем всех после commit
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and table.name == User.__tablename__:
+        orm_execute_state.session.info.setdefault(_PENDING_KEY, set()).add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    changed = session.info.pop(_PENDING_KEY, None)
+    if not changed:
+        return
+    if None in changed:
+        user_cache.clear()
+        return
+    for user_id in changed:
+        user_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_users(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
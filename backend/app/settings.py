@@ -4,12 +4,55 @@ from typing import Optional
 class Settings(BaseSettings):
     # База данных
     DATABASE_URL: str
+    # Реплика для чтения (GET-запросы, отчёты). Не задана — всё идёт в основную БД
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # Сколько секунд после изменения данных пользователь читает из основной БД (read-your-writes)
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Пул соединений (на один воркер uvicorn; итог на PostgreSQL = воркеры × (size + overflow))
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # сек ожидания свободного соединения
+    DB_POOL_RECYCLE: int = 1800  # сек, после которых соединение переоткрывается
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WAIT_WARNING_MS: int = 100  # предупреждение в лог, если получение соединения дольше
+
+    # Логирование SQL (вместо echo=True)
+    SQL_ECHO: bool = False  # полный вывод SQLAlchemy — только для локальной отладки
+    SQL_LOG_SAMPLE_RATE: float = 0.0  # доля запросов, которые пишутся в лог (0.01 = 1%)
+    SQL_SLOW_QUERY_MS: int = 500  # запросы дольше — всегда warning
 
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # ← вот это было пропущено!
 
+    # Хэширование паролей (bcrypt) в отдельном пуле потоков
+    PASSWORD_HASH_WORKERS: int = 2  # одновременных операций на воркер
+    PASSWORD_HASH_MAX_QUEUE: int = 200  # сверх этого ожидающих логинов — 503 с Retry-After
+
+    # Кэш пользователей в get_current_user (на воркер); изменения в других воркерах видны не позже TTL
+    USER_CACHE_TTL_SECONDS: int = 30  # 0 — искать пользователя в БД на каждый запрос
+    USER_CACHE_MAX_SIZE: int = 10000
+    # >0 — токен несёт подписанные id/роль, и первые N секунд после выдачи запросы обходятся без поиска.
+    # Активность из токена не проверяется (user_from_claim считает пользователя активным): деактивация
+    # и смена роли отзывают такие токены только в своём воркере, в остальных — не позже N секунд
+    USER_CLAIM_TTL_SECONDS: int = 0
+
+    # Сжатие ответов (gzip/brotli)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # байт; меньшие ответы не сжимаем
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # кэш уже сжатых тел по ETag
+
+    # Архив отчётов в Parquet для аналитики по истории (нужен pyarrow)
+    REPORT_ARCHIVE_DIR: str = "report_archive"
+    REPORT_ARCHIVE_ON_UPLOAD: bool = True  # выгружать отчёт в архив сразу после загрузки
+    REPORT_ARCHIVE_PRUNE_AFTER_DAYS: Optional[int] = None  # строки архивированных отчётов старше — удалять из БД
+
+    # Лента изменений каталога (GET /changes)
+    CHANGES_PAGE_MAX: int = 1000  # событий журнала за один запрос
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -7,7 +7,14 @@ from .album import Album
 from .album_artist import AlbumArtist
 from .track import Track
 from .track_artist import TrackArtist
+from .track_artist_share import TrackArtistShare
 from .track_person_share import TrackPersonShare
 from .usage_report import UsageReport
 from .user import User
-from .raw_excel_data import ExcelReport, RawUsageDataStrict
\ No newline at end of file
+from .raw_excel_data import (
+    ExcelReport, RawUsageDataStrict,
+    RawPeriod, RawPlatform, RawRightType, RawTerritory,
+    RawContentType, RawUsageType, RawCopyright, RawPerformer,
+)
+from .table_version import TableVersion
+from .change_outbox import ChangeOutbox
@@ -1,11 +1,20 @@
 from typing import List, Optional
 from datetime import date
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 
 from .album_artist import AlbumArtist
 
 
 class Album(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_album_upc_approved", "upc", postgresql_where=text("is_approved"), sqlite_where=text("is_approved = 1")),
+        Index("ix_album_isrc_approved", "isrc", postgresql_where=text("is_approved"), sqlite_where=text("is_approved = 1")),
+        # Поиск альбома по названию при импорте каталога
+        Index("ix_album_title", "title"),
+        Index("ix_album_drafts", "created_by_user_id", "id", postgresql_where=text("NOT is_approved"), sqlite_where=text("is_approved = 0")),
+    )
+
     id: int = Field(default=None, primary_key=True)
     title: str
     type: str
@@ -1,7 +1,11 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 class AlbumArtist(SQLModel, table=True):
     __tablename__ = "album_artist"
+    # PK (album_id, artist_id) покрывает поиск по album_id; обратный поиск — отдельный индекс
+    __table_args__ = (Index("ix_album_artist_artist_id", "artist_id"),)
+
     album_id: int = Field(foreign_key="album.id", primary_key=True)
     artist_id: int = Field(foreign_key="artist.id", primary_key=True)
 
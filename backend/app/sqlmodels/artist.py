@@ -1,4 +1,5 @@
 from typing import List, Optional
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 
 from .artist_person import ArtistPerson
@@ -6,6 +7,13 @@ from .album_artist import AlbumArtist
 from .track_artist import TrackArtist
 
 class Artist(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_artist_isni", "isni"),
+        # Поиск артистов по имени при импорте каталога
+        Index("ix_artist_name", "name"),
+        Index("ix_artist_drafts", "created_by_user_id", "id", postgresql_where=text("NOT is_approved"), sqlite_where=text("is_approved = 0")),
+    )
+
     id: int = Field(default=None, primary_key=True)
     name: str
     isni: Optional[str] = Field(unique=True)
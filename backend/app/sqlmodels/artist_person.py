@@ -1,7 +1,11 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 
 class ArtistPerson(SQLModel, table=True):
+    # PK (artist_id, person_id) покрывает поиск по artist_id; обратный поиск — отдельный индекс
+    __table_args__ = (Index("ix_artist_person_person_id", "person_id"),)
+
     artist_id: int = Field(foreign_key="artist.id", primary_key=True)
     person_id: int = Field(foreign_key="person.id", primary_key=True)
 
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, func
+from sqlmodel import SQLModel, Field
+
+
+class ChangeOutbox(SQLModel, table=True):
+    """
+    Журнал изменений каталога (transactional outbox): строка пишется в той же транзакции,
+    что и само изменение (см. app/services/outbox.py), и читается через GET /changes?after=.
+    """
+    __tablename__ = "change_outbox"
+    __table_args__ = (
+        # Порядок ленты на PostgreSQL — (xid, id), см. read_changes
+        Index("ix_change_outbox_xid_id", "xid", "id"),
+    )
+
+    # На SQLite автоинкремент есть только у INTEGER PRIMARY KEY
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(BigInteger().with_variant(Integer(), "sqlite"), primary_key=True, autoincrement=True),
+    )
+    entity_type: str = Field(nullable=False)  # track, album, artist, person, track_person_share
+    entity_id: int = Field(nullable=False)  # для track_person_share — id трека
+    op: str = Field(nullable=False)  # upsert / delete
+    created_at: datetime = Field(
+        default=None, sa_column=Column(DateTime, nullable=False, server_default=func.now())
+    )
+
+    # PostgreSQL: id транзакции записи, pg_current_xact_id() (server default из миграции).
+    # На SQLite не заполняется — там id и так выдаются в порядке фиксации
+    xid: Optional[int] = Field(default=None, sa_column=Column(BigInteger, nullable=True))
+
+    def __repr__(self):
+        return f"<ChangeOutbox #{self.id} {self.op} {self.entity_type}:{self.entity_id}>"
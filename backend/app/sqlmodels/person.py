@@ -1,7 +1,13 @@
 from typing import List, Optional
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 
 class Person(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_person_email_approved", "email", postgresql_where=text("is_approved"), sqlite_where=text("is_approved = 1")),
+        Index("ix_person_drafts", "created_by_user_id", "id", postgresql_where=text("NOT is_approved"), sqlite_where=text("is_approved = 0")),
+    )
+
     id: int = Field(default=None, primary_key=True)
     last_name: str
     first_name: str
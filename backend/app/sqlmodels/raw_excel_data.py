@@ -2,6 +2,7 @@
 from typing import Optional, TYPE_CHECKING
 from sqlmodel import SQLModel, Field, Relationship # Импортируем из SQLModel
 from sqlalchemy import Column # Для указания специфичных типов колонок
+from sqlalchemy import Index
 from sqlalchemy import Numeric # Импортируем Numeric из SQLAlchemy
 from datetime import datetime
 from decimal import Decimal # Для денежных значений
@@ -26,29 +27,76 @@ class ExcelReport(SQLModel, table=True):
     def __repr__(self):
         return f"<ExcelReport(id={self.id}, filename='{self.filename}', original_name='{self.original_name}')>"
 
+# --- СПРАВОЧНИКИ ПОВТОРЯЮЩИХСЯ ЗНАЧЕНИЙ СЫРЫХ ДАННЫХ ---
+# В отчёте у этих колонок единицы различных значений на миллионы строк:
+# строки хранят целочисленный ключ, текст — один раз в справочнике
+class RawDimension(SQLModel):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    value: str = Field(nullable=False, unique=True)
+
+class RawPeriod(RawDimension, table=True):
+    __tablename__ = 'raw_dim_period'
+
+class RawPlatform(RawDimension, table=True):
+    __tablename__ = 'raw_dim_platform'
+
+class RawRightType(RawDimension, table=True):
+    __tablename__ = 'raw_dim_right_type'
+
+class RawTerritory(RawDimension, table=True):
+    __tablename__ = 'raw_dim_territory'
+
+class RawContentType(RawDimension, table=True):
+    __tablename__ = 'raw_dim_content_type'
+
+class RawUsageType(RawDimension, table=True):
+    __tablename__ = 'raw_dim_usage_type'
+
+class RawCopyright(RawDimension, table=True):
+    __tablename__ = 'raw_dim_copyright'
+
+class RawPerformer(RawDimension, table=True):
+    __tablename__ = 'raw_dim_performer'
+
+# Поле RawUsageDataResponse → справочник; в raw_usage_data_strict хранится <поле>_id
+RAW_DIMENSIONS = {
+    'period': RawPeriod,
+    'platform': RawPlatform,
+    'right_type': RawRightType,
+    'territory': RawTerritory,
+    'content_type': RawContentType,
+    'usage_type': RawUsageType,
+    'copyright': RawCopyright,
+    'performer_name_excel': RawPerformer,
+}
+
 # --- НОВАЯ МОДЕЛЬ СТРОГО ТИПИЗИРОВАННЫХ СЫРЫХ ДАННЫХ ---
 class RawUsageDataStrict(SQLModel, table=True): # Переименуем модель для ясности
     __tablename__ = 'raw_usage_data_strict' # Переименуем таблицу
+    __table_args__ = (
+        # Сопоставление строк отчётов с каталогом по ISRC
+        Index("ix_raw_usage_data_strict_isrc", "isrc"),
+        # Строки отчёта в порядке файла и выборки по статусу обработки внутри отчёта
+        Index("ix_raw_usage_data_strict_report_row", "excel_report_id", "row_index"),
+        Index("ix_raw_usage_data_strict_report_status", "excel_report_id", "processed_status"),
+    )
 
+    # На PostgreSQL таблица разбита на секции по excel_report_id (своя секция на отчёт, см. app/services/raw_partitions.py),
+    # и PK в БД — (excel_report_id, id); id остаётся уникальным благодаря общей последовательности
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
     excel_report_id: int = Field(nullable=False, foreign_key="excel_reports.id", index=True) # Индекс для быстрого поиска по отчету
     row_index: int = Field(nullable=False) # Индекс строки в исходном файле
 
     # --- Поля из Excel ---
-    # Период использования
-    period: Optional[str] = Field(default=None)
-    # Площадка
-    platform: Optional[str] = Field(default=None)
-    # Тип прав
-    right_type: Optional[str] = Field(default=None)
-    # Территория
-    territory: Optional[str] = Field(default=None)
-    # Тип контента
-    content_type: Optional[str] = Field(default=None)
-    # Вид использования
-    usage_type: Optional[str] = Field(default=None)
-    # Исполнитель
-    performer_name_excel: Optional[str] = Field(default=None)
+    # Период использования, площадка, тип прав, территория, тип контента, вид использования, исполнитель —
+    # ключи справочников; текстовые значения отдаёт представление raw_usage_data_strict_decoded
+    period_id: Optional[int] = Field(default=None, foreign_key="raw_dim_period.id")
+    platform_id: Optional[int] = Field(default=None, foreign_key="raw_dim_platform.id")
+    right_type_id: Optional[int] = Field(default=None, foreign_key="raw_dim_right_type.id")
+    territory_id: Optional[int] = Field(default=None, foreign_key="raw_dim_territory.id")
+    content_type_id: Optional[int] = Field(default=None, foreign_key="raw_dim_content_type.id")
+    usage_type_id: Optional[int] = Field(default=None, foreign_key="raw_dim_usage_type.id")
+    performer_name_excel_id: Optional[int] = Field(default=None, foreign_key="raw_dim_performer.id")
     # Название трека
     track_title_excel: Optional[str] = Field(default=None)
     # Название альбома
@@ -65,8 +113,8 @@ class RawUsageDataStrict(SQLModel, table=True): # Переименуем мод
     isrc: Optional[str] = Field(default=None)
     # UPC (может быть длинным числом, лучше строка)
     upc: Optional[str] = Field(default=None)
-    # Копирайт
-    copyright: Optional[str] = Field(default=None)
+    # Копирайт (ключ справочника)
+    copyright_id: Optional[int] = Field(default=None, foreign_key="raw_dim_copyright.id")
     # Количество
     quantity: Optional[int] = Field(default=None)
     # Сумма денежных средств, полученных ЛИЦЕНЗИАТОМ за авторские права
@@ -0,0 +1,12 @@
+from sqlmodel import SQLModel, Field
+
+
+class TableVersion(SQLModel, table=True):
+    """Счётчик изменений таблицы: увеличивается после каждого commit с записью в неё (см. app/services/etag.py)."""
+    __tablename__ = "table_version"
+
+    table_name: str = Field(primary_key=True)
+    version: int = Field(default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<TableVersion {self.table_name}={self.version}>"
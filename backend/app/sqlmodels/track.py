@@ -1,6 +1,7 @@
 # app/api/v1/models/track.py
 
 from typing import List, Optional
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import date # Или используйте str, если период приходит строком
 
@@ -12,6 +13,17 @@ from .record_label import RecordLabel
 # УБРАТЬ ИМПОРТ: from .usage_report import UsageReport
 
 class Track(SQLModel, table=True):
+    __table_args__ = (
+        # Проверка дубликата ISRC среди утверждённых
+        Index("ix_track_isrc_approved", "isrc", postgresql_where=text("is_approved"), sqlite_where=text("is_approved = 1")),
+        # Очередь черновиков (все / по автору)
+        Index("ix_track_drafts", "created_by_user_id", "id", postgresql_where=text("NOT is_approved"), sqlite_where=text("is_approved = 0")),
+        # Утверждённые треки по id: порядок списка и отбор треков в запросе связей с артистами.
+        # Без INCLUDE: список выбирает все колонки TrackResponse, index-only scan для него невозможен
+        Index("ix_track_approved_list", "id", postgresql_where=text("is_approved"), sqlite_where=text("is_approved = 1")),
+        Index("ix_track_album_id", "album_id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     title: str
     isrc: str  # ← убираем unique из модели (будем проверять вручную)
@@ -1,5 +1,9 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 class TrackArtist(SQLModel, table=True):
+    # PK (track_id, artist_id) покрывает поиск по track_id; обратный поиск — отдельный индекс
+    __table_args__ = (Index("ix_track_artist_artist_id", "artist_id"),)
+
     track_id: int = Field(foreign_key="track.id", primary_key=True)
     artist_id: int = Field(foreign_key="artist.id", primary_key=True)
\ No newline at end of file
@@ -0,0 +1,21 @@
+from sqlalchemy import CheckConstraint, Column, ForeignKeyConstraint, Index, Numeric
+from sqlmodel import SQLModel, Field
+
+
+class TrackArtistShare(SQLModel, table=True):
+    """Доля артиста в монетизации трека — по строке на связь TrackArtist (вместо строки «Артист: 60%, ...»)."""
+    __tablename__ = "track_artist_share"
+    __table_args__ = (
+        # Доля существует только у артиста трека; удаление связи удаляет и долю
+        ForeignKeyConstraint(
+            ["track_id", "artist_id"], ["trackartist.track_id", "trackartist.artist_id"],
+            ondelete="CASCADE",
+        ),
+        CheckConstraint("percent >= 0 AND percent <= 100", name="ck_track_artist_share_percent"),
+        # «Треки, где артист получает больше N%» — диапазон по индексу
+        Index("ix_track_artist_share_artist_percent", "artist_id", "percent"),
+    )
+
+    track_id: int = Field(primary_key=True)
+    artist_id: int = Field(primary_key=True)
+    percent: float = Field(sa_column=Column(Numeric(5, 2, asdecimal=False), nullable=False))
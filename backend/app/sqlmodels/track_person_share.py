@@ -1,8 +1,11 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 
 class TrackPersonShare(SQLModel, table=True):
     __tablename__ = "track_person_share"
+    # PK (track_id, person_id) покрывает поиск по track_id; обратный поиск — отдельный индекс
+    __table_args__ = (Index("ix_track_person_share_person_id", "person_id"),)
 
     track_id: int = Field(foreign_key="track.id", primary_key=True)
     person_id: int = Field(foreign_key="person.id", primary_key=True)
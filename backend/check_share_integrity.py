@@ -0,0 +1,66 @@
+# check_share_integrity.py
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Добавляем корень проекта в PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.database import AsyncSessionLocal
+from app.services import share_integrity
+
+
+def print_report(report: share_integrity.ShareIntegrityReport, code: str = None, as_json: bool = False) -> None:
+    violations = [v for v in report.violations if code is None or v.code == code]
+    if as_json:
+        for violation in violations:
+            print(json.dumps(share_integrity.violation_dict(violation), ensure_ascii=False))
+        return
+
+    for v in violations:
+        subject = f"трек {v.track_id}"
+        if v.person_id is not None:
+            subject += f", персона {v.person_id}"
+        if v.artist_id is not None:
+            subject += f", артист {v.artist_id}"
+        details = f" {v.field}={v.value:g}" if v.value is not None else ""
+        if v.limit is not None:
+            details += f" (предел {v.limit:g})"
+        print(f"❌ {v.code}: {subject}{details}")
+
+    print(f"\nТреков проверено: {report.tracks_checked}, долей: {report.links_checked}")
+    counts = report.counts_by_code()
+    if not counts:
+        print("✅ Нарушений не найдено")
+    for name, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+        print(f"  {name}: {count}")
+
+
+async def main(code: str = None, as_json: bool = False) -> int:
+    if not share_integrity.integrity_check_available():
+        print("Для проверки нужен numpy: pip install numpy", file=sys.stderr)
+        return 2
+    async with AsyncSessionLocal() as session:
+        started = time.perf_counter()
+        report = await share_integrity.check_share_integrity(session)
+        elapsed = time.perf_counter() - started
+    print_report(report, code, as_json)
+    if not as_json:
+        print(f"Время проверки: {elapsed:.2f} с")
+    violations = [v for v in report.violations if code is None or v.code == code]
+    return 1 if violations else 0
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Проверка долей правообладателей и артистов по всему каталогу")
+    parser.add_argument("--code", help="Показывать только нарушения с этим кодом")
+    parser.add_argument("--json", action="store_true", help="Нарушения построчно в JSON (для обработки скриптами)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(asyncio.run(main(args.code, args.json)))
@@ -1,119 +1,459 @@
 # import_tracks_async.py
+import argparse
 import asyncio
 import sys
-import os
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 # Добавляем корень проекта в PYTHONPATH
 sys.path.insert(0, str(Path(__file__).parent))
 
 import pandas as pd
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete, insert, select, tuple_, update
 
 # Импортируем модели и настройки
 from app.sqlmodels.track import Track
 from app.sqlmodels.artist import Artist
 from app.sqlmodels.album import Album
 from app.sqlmodels.track_artist import TrackArtist
+from app.sqlmodels.track_artist_share import TrackArtistShare
 from app.database import AsyncSessionLocal  # ← твой AsyncSession
 
-async def import_tracks():
+DEFAULT_FILE = "tracks_with_artists.xlsx"
+DEFAULT_SHEET = "Sheet1"
+DEFAULT_CHUNK_SIZE = 1000
+MAX_ARTISTS = 4
+# Имён в одном IN при загрузке справочников
+LOOKUP_CHUNK_SIZE = 1000
+# Колонки трека, которые берутся из файла: при повторном импорте сравниваются только они,
+# остальное (жанр, флаги, расходы) могло быть отредактировано вручную и не перезаписывается
+UPSERT_COLUMNS = ("title", "album_id", "isrc", "is_lyrics_added")
+
+
+@dataclass
+class ImportRow:
+    line: int  # номер строки в Excel (с учётом заголовка) — для отчёта
+    title: str
+    album_title: str
+    isrc: Optional[str]
+    lyrics: str
+    music: str
+    artists: List[Tuple[str, str]]  # (имя артиста, доля монетизации без «%»; пусто — доля не указана)
+
+
+@dataclass
+class ResolvedRow:
+    row: ImportRow
+    album_id: int
+    artist_ids: List[int]
+    artist_shares: Dict[int, float] = field(default_factory=dict)  # artist_id → процент (track_artist_share)
+
+
+@dataclass
+class TrackChange:
+    item: ResolvedRow
+    track_id: Optional[int]  # None — новый трек
+    changes: Dict[str, object] = field(default_factory=dict)  # колонка → новое значение
+    add_artist_ids: List[int] = field(default_factory=list)
+    remove_artist_ids: List[int] = field(default_factory=list)
+    replace_shares: bool = False  # доли артистов в файле отличаются от БД — переписать их целиком
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: Counter = field(default_factory=Counter)  # причина → число строк
+    missing_albums: Counter = field(default_factory=Counter)
+    missing_artists: Counter = field(default_factory=Counter)
+    ambiguous_albums: Counter = field(default_factory=Counter)
+    duplicate_tracks: Counter = field(default_factory=Counter)  # ключ → сколько треков с ним уже в БД
+    errors: List[str] = field(default_factory=list)
+
+    def print(self, dry_run: bool, upsert: bool = False) -> None:
+        print(f"Строк в файле: {self.total}")
+        prefix = "Будет " if dry_run else ""
+        if upsert:
+            print(f"{prefix}Добавлено: {self.inserted}, обновлено: {self.updated}, без изменений: {self.unchanged}")
+        elif dry_run:
+            print(f"Готовы к импорту: {self.total - sum(self.skipped.values())}")
+        else:
+            print(f"Добавлено треков: {self.inserted}")
+        for reason, count in self.skipped.most_common():
+            print(f"Пропущено ({reason}): {count}")
+        for title, counter in (
+            ("Альбомы не найдены", self.missing_albums),
+            ("Несколько альбомов с одним названием", self.ambiguous_albums),
+            ("Артисты не найдены", self.missing_artists),
+            ("В БД уже несколько треков с ключом (обновляется первый)", self.duplicate_tracks),
+        ):
+            if counter:
+                print(f"\n{title} ({len(counter)}):")
+                for name, count in counter.most_common():
+                    print(f"  '{name}' — строк: {count}")
+        for error in self.errors:
+            print(f"❌ {error}")
+
+
+def _text(value) -> str:
+    return "" if pd.isna(value) else str(value).strip()
+
+
+def parse_rows(df: pd.DataFrame) -> List[ImportRow]:
+    rows = []
+    for idx, row in df.iterrows():
+        artists = []
+        for i in range(1, MAX_ARTISTS + 1):
+            artist_name = _text(row.get(f"Артист_{i}"))
+            share_col = "Доля монетизации" if i == 1 else f"Доля монетизации.{i-1}"
+            if artist_name:
+                share_str = _text(row.get(share_col)).replace('%', '').strip()
+                artists.append((artist_name, share_str))
+        rows.append(ImportRow(
+            line=int(idx) + 2,
+            title=_text(row["Название трека"]),
+            album_title=_text(row["Название альбома"]),
+            isrc=_text(row.get("ISRC")) or None,
+            lyrics=_text(row.get("Автор слов")),
+            music=_text(row.get("Автор музыки")),
+            artists=artists,
+        ))
+    return rows
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def load_name_map(session, name_column, id_column, names: Iterable[str]) -> Dict[str, List[int]]:
+    """Имя → id всех записей с этим именем; по одному IN-запросу на LOOKUP_CHUNK_SIZE имён."""
+    mapping: Dict[str, List[int]] = {}
+    for chunk in _chunks(sorted(set(names)), LOOKUP_CHUNK_SIZE):
+        result = await session.execute(select(name_column, id_column).where(name_column.in_(chunk)))
+        for name, record_id in result.all():
+            mapping.setdefault(name, []).append(record_id)
+    return mapping
+
+
+def parse_shares(row_artists: List[Tuple[str, str]], artists: Dict[str, List[int]]) -> Dict[int, float]:
+    """Доли из колонок «Доля монетизации» → {artist_id: процент}; пустая ячейка — без доли."""
+    shares: Dict[int, float] = {}
+    for name, share_str in row_artists:
+        if not share_str:
+            continue
+        percent = round(float(share_str.replace(",", ".")), 2)  # как в numeric(5, 2)
+        if not 0 <= percent <= 100:
+            raise ValueError(share_str)
+        for artist_id in artists[name]:
+            shares[artist_id] = percent
+    return shares
+
+
+def resolve_rows(
+    rows: List[ImportRow],
+    albums: Dict[str, List[int]],
+    artists: Dict[str, List[int]],
+    report: ImportReport,
+    require_isrc: bool = True,
+) -> List[ResolvedRow]:
+    """Сопоставление строк с альбомами и артистами в памяти, без запросов."""
+    resolved = []
+    for row in rows:
+        if require_isrc and not row.isrc:
+            # track.isrc в БД NOT NULL
+            report.skipped["нет ISRC"] += 1
+            continue
+        album_ids = albums.get(row.album_title, [])
+        if not album_ids:
+            report.missing_albums[row.album_title] += 1
+            report.skipped["альбом не найден"] += 1
+            continue
+        if len(album_ids) > 1:
+            report.ambiguous_albums[row.album_title] += 1
+            report.skipped["несколько альбомов с таким названием"] += 1
+            continue
+        if not row.artists:
+            report.skipped["нет артистов"] += 1
+            continue
+        missing = [name for name, _share in row.artists if name not in artists]
+        if missing:
+            report.missing_artists.update(missing)
+            report.skipped["артисты не найдены"] += 1
+            continue
+        artist_ids = list(dict.fromkeys(
+            artist_id for name, _share in row.artists for artist_id in artists[name]
+        ))
+        try:
+            artist_shares = parse_shares(row.artists, artists)
+        except ValueError:
+            report.skipped["некорректная доля монетизации"] += 1
+            continue
+        resolved.append(ResolvedRow(row=row, album_id=album_ids[0], artist_ids=artist_ids, artist_shares=artist_shares))
+    return resolved
+
+
+def track_values(item: ResolvedRow) -> dict:
+    row = item.row
+    track = Track(
+        title=row.title,
+        album_id=item.album_id,
+        isrc=row.isrc,
+        genre=None,
+        is_ringtone_added=False,
+        has_video_clip=False,
+        is_lyrics_added=bool(row.lyrics and "без слов" not in row.lyrics.lower()),
+        is_karaoke_sync_added=False,
+    )
+    # Значения всех колонок с учётом умолчаний модели — для Core-вставки
+    return {column.name: getattr(track, column.name) for column in Track.__table__.columns if column.name != "id"}
+
+
+async def insert_chunk(session, chunk: Sequence[ResolvedRow]) -> None:
+    """Один многострочный INSERT треков с RETURNING id и один — связей с артистами."""
+    result = await session.execute(
+        insert(Track).returning(Track.id, sort_by_parameter_order=True),
+        [track_values(item) for item in chunk],
+    )
+    track_ids = result.scalars().all()
+    links = [
+        {"track_id": track_id, "artist_id": artist_id}
+        for track_id, item in zip(track_ids, chunk)
+        for artist_id in item.artist_ids
+    ]
+    if links:
+        await session.execute(insert(TrackArtist), links)
+    await insert_shares(session, zip(track_ids, chunk))
+
+
+async def insert_shares(session, items: Iterable[Tuple[int, ResolvedRow]]) -> None:
+    shares = [
+        {"track_id": track_id, "artist_id": artist_id, "percent": percent}
+        for track_id, item in items
+        for artist_id, percent in item.artist_shares.items()
+    ]
+    if shares:
+        await session.execute(insert(TrackArtistShare), shares)
+
+
+def track_key(isrc: Optional[str], album_id: int, title: str) -> tuple:
+    """Естественный ключ трека: ISRC, а без него — (альбом, название)."""
+    return ("isrc", isrc) if isrc else ("album_title", album_id, title)
+
+
+async def load_existing_tracks(session, resolved: List[ResolvedRow], report: ImportReport) -> Dict[tuple, dict]:
+    """Уже импортированные треки по естественному ключу — IN-запросами по ISRC и по (альбом, название)."""
+    columns = (Track.id, *(getattr(Track, name) for name in UPSERT_COLUMNS))
+    isrcs = sorted({item.row.isrc for item in resolved if item.row.isrc})
+    pairs = sorted({(item.album_id, item.row.title) for item in resolved if not item.row.isrc})
+
+    found = []
+    for chunk in _chunks(isrcs, LOOKUP_CHUNK_SIZE):
+        result = await session.execute(select(*columns).where(Track.isrc.in_(chunk)).order_by(Track.id))
+        found.extend((("isrc", row.isrc), row) for row in result.all())
+    for chunk in _chunks(pairs, LOOKUP_CHUNK_SIZE):
+        result = await session.execute(
+            select(*columns).where(tuple_(Track.album_id, Track.title).in_(chunk)).order_by(Track.id)
+        )
+        found.extend((("album_title", row.album_id, row.title), row) for row in result.all())
+
+    existing: Dict[tuple, dict] = {}
+    for key, row in found:
+        if key in existing:
+            # Дубликаты от прежних повторных импортов: обновляем самый ранний трек
+            report.duplicate_tracks[key[-1]] += 1
+            continue
+        existing[key] = dict(row._mapping)
+    return existing
+
+
+async def load_track_artists(session, track_ids: Sequence[int]) -> Tuple[Dict[int, set], Dict[int, dict]]:
+    """Связи с артистами и доли артистов треков: track_id → {artist_id}, track_id → {artist_id: процент}."""
+    links: Dict[int, set] = {}
+    shares: Dict[int, dict] = {}
+    for chunk in _chunks(sorted(track_ids), LOOKUP_CHUNK_SIZE):
+        result = await session.execute(
+            select(TrackArtist.track_id, TrackArtist.artist_id).where(TrackArtist.track_id.in_(chunk))
+        )
+        for track_id, artist_id in result.all():
+            links.setdefault(track_id, set()).add(artist_id)
+        result = await session.execute(
+            select(TrackArtistShare.track_id, TrackArtistShare.artist_id, TrackArtistShare.percent)
+            .where(TrackArtistShare.track_id.in_(chunk))
+        )
+        for track_id, artist_id, percent in result.all():
+            shares.setdefault(track_id, {})[artist_id] = float(percent)
+    return links, shares
+
+
+async def plan_upsert(session, resolved: List[ResolvedRow], report: ImportReport) -> List[TrackChange]:
+    """
+    Сравнивает строки файла с БД в памяти: новые треки, треки с изменёнными колонками/артистами.
+    Неизменённые строки только считаются — записи для них не будет.
+    """
+    existing = await load_existing_tracks(session, resolved, report)
+    links, shares = await load_track_artists(session, [track["id"] for track in existing.values()])
+
+    plan: List[TrackChange] = []
+    seen = set()
+    for item in resolved:
+        key = track_key(item.row.isrc, item.album_id, item.row.title)
+        if key in seen:
+            report.skipped["повтор в файле"] += 1
+            continue
+        seen.add(key)
+
+        track = existing.get(key)
+        if track is None:
+            if not item.row.isrc:
+                report.skipped["нет ISRC"] += 1
+                continue
+            plan.append(TrackChange(item=item, track_id=None))
+            continue
+
+        values = track_values(item)
+        changes = {
+            name: values[name] for name in UPSERT_COLUMNS
+            if values[name] != track[name] and not (name == "isrc" and not values[name])
+        }
+        current_artists = links.get(track["id"], set())
+        wanted_artists = set(item.artist_ids)
+        change = TrackChange(
+            item=item,
+            track_id=track["id"],
+            changes=changes,
+            add_artist_ids=sorted(wanted_artists - current_artists),
+            remove_artist_ids=sorted(current_artists - wanted_artists),
+            # Пустые ячейки долей не стирают доли, уже заведённые в БД
+            replace_shares=bool(item.artist_shares) and item.artist_shares != shares.get(track["id"], {}),
+        )
+        if change.changes or change.add_artist_ids or change.remove_artist_ids or change.replace_shares:
+            plan.append(change)
+        else:
+            report.unchanged += 1
+    return plan
+
+
+async def write_changes(session, chunk: Sequence[TrackChange]) -> Tuple[int, int]:
+    """Новые треки — как в insert_chunk, изменения — пакетным UPDATE по id и правкой связей с артистами."""
+    new_items = [change.item for change in chunk if change.track_id is None]
+    if new_items:
+        await insert_chunk(session, new_items)
+
+    updates = [{"id": change.track_id, **change.changes} for change in chunk if change.track_id and change.changes]
+    # Пакеты с одинаковым набором колонок — один executemany на набор
+    by_columns: Dict[tuple, list] = {}
+    for values in updates:
+        by_columns.setdefault(tuple(sorted(values)), []).append(values)
+    for batch in by_columns.values():
+        await session.execute(update(Track), batch)
+
+    added = [
+        {"track_id": change.track_id, "artist_id": artist_id}
+        for change in chunk if change.track_id for artist_id in change.add_artist_ids
+    ]
+    if added:
+        await session.execute(insert(TrackArtist), added)
+    # Доли удаляются раньше связей, на которые ссылаются
+    replaced = [change.track_id for change in chunk if change.track_id and change.replace_shares]
+    if replaced:
+        await session.execute(delete(TrackArtistShare).where(TrackArtistShare.track_id.in_(replaced)))
+    removed = [
+        (change.track_id, artist_id)
+        for change in chunk if change.track_id for artist_id in change.remove_artist_ids
+    ]
+    if removed:
+        await session.execute(
+            delete(TrackArtistShare).where(tuple_(TrackArtistShare.track_id, TrackArtistShare.artist_id).in_(removed))
+        )
+        await session.execute(
+            delete(TrackArtist).where(tuple_(TrackArtist.track_id, TrackArtist.artist_id).in_(removed))
+        )
+    await insert_shares(
+        session, ((change.track_id, change.item) for change in chunk if change.track_id and change.replace_shares)
+    )
+    return len(new_items), len(chunk) - len(new_items)
+
+
+async def import_tracks(path: str, sheet: str, chunk_size: int, dry_run: bool, upsert: bool = False) -> ImportReport:
     print("Чтение Excel-файла...")
-    df = pd.read_excel("tracks_with_artists.xlsx", sheet_name="Sheet1")
+    df = pd.read_excel(path, sheet_name=sheet)
     df = df.dropna(subset=["Название трека"])
-    print(f"Найдено {len(df)} треков для импорта.")
+    rows = parse_rows(df)
+    report = ImportReport(total=len(rows))
+    print(f"Найдено {len(rows)} треков для импорта.")
 
     async with AsyncSessionLocal() as session:
-        for idx, row in df.iterrows():
-            try:
-                title = str(row["Название трека"]).strip()
-                album_title = str(row["Название альбома"]).strip()
-                isrc = row.get("ISRC")
-                lyrics = row.get("Автор слов") or ""
-                music = row.get("Автор музыки") or ""
-
-                # Ищем альбом
-                result = await session.execute(
-                    select(Album).where(Album.title == album_title)
-                )
-                album = result.scalar_one_or_none()
-                if not album:
-                    print(f"⚠️ Альбом не найден: '{album_title}' → пропускаем трек '{title}'")
-                    continue
-
-                # Собираем артистов и доли
-                artists_info = []
-                artist_names = []
-
-                for i in range(1, 5):
-                    art_col = f"Артист_{i}"
-                    share_col = "Доля монетизации" if i == 1 else f"Доля монетизации.{i-1}"
-                    artist_name = row.get(art_col)
-                    share_val = row.get(share_col)
-
-                    if pd.notna(artist_name) and artist_name.strip():
-                        artist_name = artist_name.strip()
-                        share_str = str(share_val).replace('%', '').strip() if pd.notna(share_val) else "0"
-                        artists_info.append(f"{artist_name}:{share_str}%")
-                        artist_names.append(artist_name)
-
-                if not artist_names:
-                    print(f"⚠️ Нет артистов для трека '{title}' → пропускаем")
-                    continue
-
-                # Проверяем, что все артисты существуют
-                result = await session.execute(
-                    select(Artist).where(Artist.name.in_(artist_names))
-                )
-                db_artists = result.scalars().all()
-                found_names = {a.name for a in db_artists}
-                missing = set(artist_names) - found_names
-                if missing:
-                    print(f"⚠️ Артисты не найдены: {missing} → пропускаем трек '{title}'")
-                    continue
-
-                monetization_str = ", ".join(artists_info)
-
-                # Создаём трек
-                new_track = Track(
-                    title=title,
-                    album_id=album.id,
-                    isrc=isrc if pd.notna(isrc) else None,
-                    genre=None,
-                    music_authors=str(music),
-                    lyrics_authors=str(lyrics),
-                    artist_monetization_shares=monetization_str,
-                    is_ringtone_added=False,
-                    has_video_clip=False,
-                    is_lyrics_added=bool(lyrics and "без слов" not in str(lyrics).lower()),
-                    is_karaoke_sync_added=False,
-                    text=None,
-                    karaoke=None,
-                    synclab=None,
-                    copyright=None,
-                    related_rights=None,
-                    advance=None,
-                    marketing=None,
-                    marketing_expenses=None,
-                    advance_expenses=None,
-                )
-                session.add(new_track)
-                await session.flush()
-
-                # Связываем с артистами
-                for db_artist in db_artists:
-                    ta = TrackArtist(track_id=new_track.id, artist_id=db_artist.id)
-                    session.add(ta)
+        # Справочники — один раз на весь файл
+        albums = await load_name_map(session, Album.title, Album.id, (r.album_title for r in rows))
+        artists = await load_name_map(
+            session, Artist.name, Artist.id, (name for r in rows for name, _share in r.artists)
+        )
+        # В режиме upsert строка без ISRC может обновить трек, найденный по (альбом, название)
+        resolved = resolve_rows(rows, albums, artists, report, require_isrc=not upsert)
 
-                await session.commit()
-                print(f"✅ Добавлен трек: {title} в альбом {album_title}")
+        if upsert:
+            plan = await plan_upsert(session, resolved, report)
+            if dry_run:
+                report.inserted = sum(1 for change in plan if change.track_id is None)
+                report.updated = len(plan) - report.inserted
+                report.print(dry_run=True, upsert=True)
+                return report
+            for chunk in _chunks(plan, chunk_size):
+                try:
+                    inserted, updated = await write_changes(session, chunk)
+                    await session.commit()
+                    report.inserted += inserted
+                    report.updated += updated
+                    print(f"✅ Добавлено: {report.inserted}, обновлено: {report.updated} из {len(plan)}")
+                except Exception as e:
+                    await session.rollback()
+                    report.skipped["ошибка записи"] += len(chunk)
+                    report.errors.append(f"Строки {chunk[0].item.row.line}–{chunk[-1].item.row.line}: {e}")
+            report.print(dry_run=False, upsert=True)
+            print("✅ Импорт завершён!")
+            return report
 
+        if dry_run:
+            report.print(dry_run=True)
+            return report
+
+        for chunk in _chunks(resolved, chunk_size):
+            try:
+                await insert_chunk(session, chunk)
+                await session.commit()
+                report.inserted += len(chunk)
+                print(f"✅ Добавлено треков: {report.inserted}/{len(resolved)}")
             except Exception as e:
-                print(f"❌ Ошибка при обработке трека '{title}': {e}")
                 await session.rollback()
+                report.skipped["ошибка записи"] += len(chunk)
+                report.errors.append(f"Строки {chunk[0].row.line}–{chunk[-1].row.line}: {e}")
 
+    report.print(dry_run=False)
     print("✅ Импорт завершён!")
+    return report
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Импорт треков каталога из Excel")
+    parser.add_argument("file", nargs="?", default=DEFAULT_FILE, help="Excel-файл с треками")
+    parser.add_argument("--sheet", default=DEFAULT_SHEET, help="Лист Excel")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Треков в одной транзакции")
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Только проверить: показать ненайденные альбомы и артистов, ничего не записывая",
+    )
+    parser.add_argument(
+        "--upsert", action="store_true",
+        help="Повторный импорт: существующие треки (по ISRC или альбому и названию) обновлять, а не дублировать",
+    )
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
-    asyncio.run(import_tracks())
\ No newline at end of file
+    args = parse_args()
+    asyncio.run(import_tracks(args.file, args.sheet, args.chunk_size, args.dry_run, args.upsert))
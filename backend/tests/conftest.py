@@ -0,0 +1,148 @@
+# tests/conftest.py
+import asyncio
+import importlib.util
+import os
+import types
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Настройки читаются при импорте app.*: тестам хватает SQLite и фиктивного ключа
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import httpx  # noqa: E402
+from jose import jwt  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+import app.database  # noqa: E402,F401  (регистрирует слушатели сессий)
+from app.services.etag import TRACKED_TABLES  # noqa: E402
+from app.services.user_cache import UserCache  # noqa: E402
+from app.settings import settings  # noqa: E402
+from app.sqlmodels import TableVersion  # noqa: E402
+from app.sqlmodels.user import Role, User  # noqa: E402
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+
+
+def load_migration(revision: str):
+    """Модуль миграции alembic по номеру ревизии (файлы миграций не импортируются как пакет)."""
+    path, = MIGRATIONS_DIR.glob(f"{revision}_*.py")
+    spec = importlib.util.spec_from_file_location(f"migration_{revision}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def decoded_view_ddl() -> str:
+    """CREATE VIEW raw_usage_data_strict_decoded из миграции 7c2e4b9f1a36 — в метаданных моделей его нет."""
+    migration = load_migration("7c2e4b9f1a36")
+    statements = []
+    migration.op = types.SimpleNamespace(execute=statements.append)
+    migration._create_view()
+    return statements[0]
+
+
+def create_database(path):
+    """Файловая БД SQLite со схемой из моделей, представлением сырых данных и строками table_version."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def prepare():
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+            await connection.exec_driver_sql(decoded_view_ddl())
+            await connection.execute(
+                TableVersion.__table__.insert(),
+                [{"table_name": name, "version": 0} for name in sorted(TRACKED_TABLES)],
+            )
+
+    asyncio.run(prepare())
+    return engine
+
+
+def sessionmaker_for(engine) -> async_sessionmaker:
+    return async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+def bearer(email: str) -> dict:
+    token = jwt.encode(
+        {"sub": email, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_database(tmp_path / "test.db")
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture(autouse=True)
+def report_archive_dir(tmp_path, monkeypatch):
+    """Архив отчётов Parquet — во временном каталоге теста, а не в report_archive рабочего каталога."""
+    path = tmp_path / "report_archive"
+    monkeypatch.setattr(settings, "REPORT_ARCHIVE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def session_factory(db):
+    return sessionmaker_for(db)
+
+
+@pytest.fixture
+def point_app_at(monkeypatch):
+    """Переключает сессии приложения на тестовые БД: основную и (необязательно) реплику."""
+
+    def point(primary, replica=None):
+        primary_sessions = sessionmaker_for(primary)
+        monkeypatch.setattr(app.database, "engine", primary)
+        monkeypatch.setattr(app.database, "AsyncSessionLocal", primary_sessions)
+        monkeypatch.setattr(app.database, "replica_engine", replica)
+        monkeypatch.setattr(
+            app.database, "ReplicaSessionLocal", sessionmaker_for(replica) if replica else primary_sessions
+        )
+        monkeypatch.setattr("app.deps.AsyncSessionLocal", primary_sessions)
+        # Кэш пользователей — на процесс: пользователи прошлых тестов с теми же email не должны в него попадать
+        fresh_cache = UserCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_SIZE)
+        monkeypatch.setattr("app.services.user_cache.user_cache", fresh_cache)
+        monkeypatch.setattr("app.deps.user_cache", fresh_cache)
+
+    return point
+
+
+@pytest.fixture
+def api(db, point_app_at):
+    """Фабрика httpx-клиентов к приложению на тестовой БД (без startup-событий)."""
+    from app.main import app as fastapi_app
+
+    point_app_at(db)
+    return lambda: httpx.AsyncClient(transport=httpx.ASGITransport(app=fastapi_app), base_url="http://test")
+
+
+@pytest.fixture
+def make_user(session_factory):
+    """Создаёт пользователя; возвращает (пользователь, заголовок Authorization)."""
+
+    def create(role: Role = Role.MANAGER, email: str = None, is_active: bool = True):
+        async def insert():
+            async with session_factory() as session:
+                count = len((await session.execute(User.__table__.select())).all())
+                user = User(
+                    email=email or f"{role.value}{count}@example.com",
+                    hashed_password="x", role=role, is_active=is_active,
+                )
+                session.add(user)
+                await session.commit()
+                return user
+
+        user = asyncio.run(insert())
+        return user, bearer(user.email)
+
+    return create
@@ -0,0 +1,119 @@
+# tests/test_artist_shares.py
+"""
+Доли артистов в track_artist_share: разбор прежних строк «Артист: 60%, ...» миграцией b4e8d2a6c913
+и выборка треков по доле артиста (GET /tracks/by-artist-share).
+"""
+import asyncio
+
+import pytest
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, select, text
+from sqlmodel import SQLModel
+
+from app.sqlmodels import Album, Artist, Track, TrackArtist, TrackArtistShare
+from app.sqlmodels.user import Role
+from tests.conftest import load_migration
+
+migration = load_migration("b4e8d2a6c913")
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("A:60%, B:40%", [("A", 60.0), ("B", 40.0)]),
+    ("Artist A : 60 % , Artist B : 40 %", [("Artist A", 60.0), ("Artist B", 40.0)]),
+    ("A: 60,5%; B: 39,5", [("A", 60.5), ("B", 39.5)]),
+    ("A:60,B:40", [("A", 60.0), ("B", 40.0)]),
+    ("A:33.333%", [("A", 33.33)]),
+    ("Solo:100%,", [("Solo", 100.0)]),
+    ("", []),
+])
+def test_parse_legacy_share_strings(value, expected):
+    assert migration._parse(value) == expected
+
+
+@pytest.mark.parametrize("value", [
+    "A 60%",           # нет двоеточия
+    "A:abc",           # не число
+    "A:60% B:40%",     # нет разделителя между артистами
+    "A:-10%",          # знак не разбирается
+    ":60%",            # нет имени
+])
+def test_malformed_share_strings_are_rejected(value):
+    assert migration._parse(value) is None
+
+
+def test_migration_moves_legacy_strings_to_rows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    tables = [SQLModel.metadata.tables[name] for name in ("album", "artist", "track", "trackartist")]
+    SQLModel.metadata.create_all(engine, tables=tables)
+    with engine.begin() as connection:
+        connection.execute(text(f"ALTER TABLE track ADD COLUMN {migration.LEGACY_COLUMN} VARCHAR"))
+        connection.execute(text("CREATE TABLE table_version (table_name VARCHAR PRIMARY KEY, version INTEGER)"))
+        connection.execute(Album.__table__.insert(), [{"id": 1, "title": "Album", "type": "album"}])
+        connection.execute(Artist.__table__.insert(), [{"id": i, "name": name} for i, name in ((1, "A"), (2, "B"))])
+        legacy = {1: "A:60%, B:40%", 2: "A: 12,5%; Unknown: 87,5%", 3: "garbage", 4: "A:150%", 5: "A:10%, A:20%"}
+        for track_id, value in legacy.items():
+            connection.execute(
+                text(f"INSERT INTO track (id, title, isrc, album_id, label_share_percentage, is_approved, "
+                     f"is_ringtone_added, has_video_clip, is_lyrics_added, is_karaoke_sync_added, "
+                     f"{migration.LEGACY_COLUMN}) VALUES (:id, 'T', 'ISRC', 1, 20, 1, 0, 0, 0, 0, :value)"),
+                {"id": track_id, "value": value},
+            )
+            for artist_id in (1, 2):
+                connection.execute(TrackArtist.__table__.insert(), [{"track_id": track_id, "artist_id": artist_id}])
+
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+        rows = connection.execute(text(
+            "SELECT track_id, artist_id, percent FROM track_artist_share ORDER BY track_id, artist_id"
+        )).all()
+    engine.dispose()
+
+    # Неизвестный артист, неразборчивая строка и доля больше 100% пропускаются; повтор артиста — последняя доля
+    assert [tuple(row) for row in rows] == [(1, 1, 60), (1, 2, 40), (2, 1, 12.5), (5, 1, 20)]
+
+
+def test_tracks_by_artist_share_filters_by_percent_and_visibility(api, session_factory, make_user):
+    manager, headers = make_user(Role.MANAGER)
+    other, _ = make_user(Role.MANAGER)
+
+    async def seed():
+        async with session_factory() as session:
+            album = Album(title="Album", type="album", is_approved=True)
+            artists = [Artist(name="A", is_approved=True), Artist(name="B", is_approved=True)]
+            session.add_all([album, *artists])
+            await session.flush()
+            tracks = [
+                Track(title="Majority", isrc="I-1", album_id=album.id, is_approved=True),
+                Track(title="Exactly half", isrc="I-2", album_id=album.id, is_approved=True),
+                Track(title="Minority", isrc="I-3", album_id=album.id, is_approved=True),
+                Track(title="Own draft", isrc="I-4", album_id=album.id, created_by_user_id=manager.id),
+                Track(title="Foreign draft", isrc="I-5", album_id=album.id, created_by_user_id=other.id),
+            ]
+            session.add_all(tracks)
+            await session.flush()
+            percents = [80, 50, 20, 90, 90]
+            session.add_all(TrackArtist(track_id=t.id, artist_id=a.id) for t in tracks for a in artists)
+            await session.flush()
+            session.add_all([
+                *(TrackArtistShare(track_id=t.id, artist_id=artists[0].id, percent=p) for t, p in zip(tracks, percents)),
+                *(TrackArtistShare(track_id=t.id, artist_id=artists[1].id, percent=100 - p)
+                  for t, p in zip(tracks, percents)),
+            ])
+            await session.commit()
+            return artists[0].id, artists[1].id
+
+    first, second = asyncio.run(seed())
+
+    async def titles(artist_id, min_percent):
+        async with api() as client:
+            response = await client.get(
+                "/api/v1/tracks/by-artist-share", params={"artist_id": artist_id, "min_percent": min_percent},
+                headers=headers,
+            )
+            assert response.status_code == 200, response.text
+            return [t["title"] for t in response.json()]
+
+    assert asyncio.run(titles(first, 50)) == ["Majority", "Own draft"]
+    assert asyncio.run(titles(second, 50)) == ["Minority"]
+    assert asyncio.run(titles(second, 0)) == ["Majority", "Exactly half", "Minority", "Own draft"]
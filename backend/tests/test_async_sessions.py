@@ -0,0 +1,95 @@
+# tests/test_async_sessions.py
+"""
+Асинхронный слой БД: get_session не занимает соединение, пока запрос не обратился к БД,
+и отпускает его после commit. Бенчмарк — пропускная способность одного воркера при росте
+числа параллельных клиентов. Задержку сервера БД имитирует пауза в trace callback sqlite3:
+он выполняется в потоке соединения aiosqlite, и цикл событий в это время свободен
+(слушатели SQLAlchemy, наоборот, выполняются в цикле событий). Результаты — в выводе pytest -s.
+"""
+import asyncio
+import time
+
+from fastapi import Response
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.requests import Request
+
+from app.database import get_session
+from app.services.db_metrics import InstrumentedQueuePool
+from app.sqlmodels import Person
+
+DB_LATENCY_SECONDS = 0.02
+REQUESTS = 64
+CONCURRENCY = (1, 4, 16)
+
+
+def make_request(method: str = "GET") -> Request:
+    return Request({"type": "http", "method": method, "path": "/", "headers": [], "query_string": b""})
+
+
+def test_get_session_checks_out_lazily_and_releases_on_commit(db, point_app_at):
+    engine = create_async_engine(db.url, poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=0)
+    point_app_at(engine)
+    pool = engine.sync_engine.pool
+
+    async def scenario():
+        checked_out = []
+        dependency = get_session(make_request("POST"), Response())
+        session = await dependency.__anext__()
+        checked_out.append(pool.checkedout())  # сессия открыта, к БД не обращались
+        await session.execute(text("SELECT 1"))
+        checked_out.append(pool.checkedout())
+        await session.commit()
+        checked_out.append(pool.checkedout())  # после commit соединение вернулось в пул
+        await dependency.aclose()
+        checked_out.append(pool.checkedout())
+        await engine.dispose()
+        return checked_out
+
+    assert asyncio.run(scenario()) == [0, 1, 0, 0]
+
+
+def test_throughput_scales_with_concurrency_on_one_worker(db, session_factory, api):
+    async def seed():
+        async with session_factory() as session:
+            session.add_all(
+                Person(last_name=f"Person {i}", first_name="X", email=f"p{i}@example.com", is_approved=True)
+                for i in range(20)
+            )
+            await session.commit()
+
+    asyncio.run(seed())
+
+    def database_latency(statement):
+        time.sleep(DB_LATENCY_SECONDS)
+
+    def slow_connection(dbapi_connection, connection_record):
+        dbapi_connection.await_(dbapi_connection.driver_connection.set_trace_callback(database_latency))
+
+    async def run(concurrency: int) -> float:
+        async with api() as client:
+            queue = asyncio.Queue()
+            for _ in range(REQUESTS):
+                queue.put_nowait(None)
+
+            async def worker():
+                while not queue.empty():
+                    queue.get_nowait()
+                    response = await client.get("/api/v1/people/")
+                    assert response.status_code == 200
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return REQUESTS / (time.perf_counter() - started)
+
+    event.listen(db.sync_engine, "connect", slow_connection)
+    try:
+        throughput = {concurrency: asyncio.run(run(concurrency)) for concurrency in CONCURRENCY}
+    finally:
+        event.remove(db.sync_engine, "connect", slow_connection)
+
+    print("\nGET /people/, один воркер, задержка БД "
+          f"{DB_LATENCY_SECONDS * 1000:.0f} мс на SQL-запрос: "
+          + ", ".join(f"{c} клиент(ов) — {rps:.0f} запр/с" for c, rps in throughput.items()))
+    # Пока один запрос ждёт БД, цикл событий обслуживает остальные
+    assert throughput[16] > 3 * throughput[1]
@@ -0,0 +1,91 @@
+# tests/test_batch_endpoints.py
+"""POST /{entity}/batch: порядок запроса, без повторов и без отсутствующих/чужих черновиков; альбом — как в карточке."""
+import asyncio
+
+from app.sqlmodels import Album, AlbumArtist, Artist, Person, Track, TrackArtist
+from app.sqlmodels.user import Role
+
+MISSING = 10_000
+
+
+async def seed(session_factory, manager_id, other_id):
+    async with session_factory() as session:
+        artists = [Artist(name="Approved", is_approved=True), Artist(name="Own draft", created_by_user_id=manager_id),
+                   Artist(name="Foreign draft", created_by_user_id=other_id)]
+        people = [Person(first_name="Ivan", last_name="Petrov", email="ivan@example.com", is_approved=True),
+                  Person(first_name="Foreign", last_name="Draft", email="draft@example.com",
+                         created_by_user_id=other_id)]
+        albums = [Album(title="Album A", type="album", is_approved=True),
+                  Album(title="Album B", type="single", is_approved=True),
+                  Album(title="Foreign draft", type="single", created_by_user_id=other_id)]
+        session.add_all([*artists, *people, *albums])
+        await session.flush()
+        tracks = [
+            Track(title="A1", isrc="ISRC-A1", album_id=albums[0].id, is_approved=True),
+            Track(title="A2", isrc="ISRC-A2", album_id=albums[0].id, is_approved=True),
+            Track(title="A3 foreign draft", isrc="ISRC-A3", album_id=albums[0].id, created_by_user_id=other_id),
+            Track(title="B1", isrc="ISRC-B1", album_id=albums[1].id, is_approved=True),
+        ]
+        session.add_all(tracks)
+        await session.flush()
+        session.add_all([
+            AlbumArtist(album_id=albums[0].id, artist_id=artists[0].id),
+            TrackArtist(track_id=tracks[0].id, artist_id=artists[0].id),
+        ])
+        await session.commit()
+        return {
+            "artists": [a.id for a in artists],
+            "people": [p.id for p in people],
+            "albums": [a.id for a in albums],
+            "tracks": [t.id for t in tracks],
+        }
+
+
+def test_batch_endpoints_skip_missing_and_invisible_ids(api, session_factory, make_user):
+    manager, headers = make_user(Role.MANAGER)
+    other, _ = make_user(Role.MANAGER)
+    ids = asyncio.run(seed(session_factory, manager.id, other.id))
+
+    async def batch(client, entity, requested):
+        response = await client.post(f"/api/v1/{entity}/batch", json={"ids": requested}, headers=headers)
+        assert response.status_code == 200, response.text
+        return [item["id"] for item in response.json()]
+
+    async def scenario():
+        async with api() as client:
+            approved, own, foreign = ids["artists"]
+            person, foreign_person = ids["people"]
+            album_a, album_b, foreign_album = ids["albums"]
+            a1, a2, a3, b1 = ids["tracks"]
+            return {
+                "artists": (await batch(client, "artists", [own, MISSING, approved, foreign, own]), [own, approved]),
+                "people": (await batch(client, "people", [MISSING, foreign_person, person]), [person]),
+                "albums": (await batch(client, "albums", [album_b, foreign_album, MISSING, album_a]),
+                           [album_b, album_a]),
+                "tracks": (await batch(client, "tracks", [b1, a3, MISSING, a1, b1]), [b1, a1]),
+            }
+
+    for entity, (returned, expected) in asyncio.run(scenario()).items():
+        assert returned == expected, entity
+
+
+def test_album_batch_includes_tracks_like_album_detail(api, session_factory, make_user):
+    _, headers = make_user(Role.MANAGER)
+    other, _ = make_user(Role.MANAGER)
+    ids = asyncio.run(seed(session_factory, None, other.id))
+    album_a, album_b, _ = ids["albums"]
+
+    async def scenario():
+        async with api() as client:
+            batch = await client.post("/api/v1/albums/batch", json={"ids": [album_a, album_b]}, headers=headers)
+            detail = await client.get(f"/api/v1/albums/{album_a}", headers=headers)
+            assert detail.status_code == 200, detail.text
+            return batch.json(), detail.json()
+
+    batch, detail = asyncio.run(scenario())
+    a1, a2, _, b1 = ids["tracks"]
+    assert [t["id"] for t in batch[0]["tracks"]] == [a1, a2]  # чужой черновик трека не виден
+    assert [t["id"] for t in batch[1]["tracks"]] == [b1]
+    assert batch[0]["tracks"] == detail["tracks"]
+    assert [a["name"] for a in batch[0]["artists"]] == ["Approved"]
+    assert batch[0]["tracks"][0]["artists"][0]["name"] == "Approved"
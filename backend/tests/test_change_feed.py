@@ -0,0 +1,39 @@
+# tests/test_change_feed.py
+"""
+Лента изменений на SQLite: события пишутся в транзакции изменения, а чтение страницами
+по курсору next_after отдаёт каждое событие ровно один раз.
+"""
+import asyncio
+
+from app.services.outbox import read_changes
+from app.sqlmodels import Artist
+
+
+async def write_and_read(session_factory):
+    async with session_factory() as session:
+        artists = [Artist(name=f"Artist {i}") for i in range(5)]
+        session.add_all(artists)
+        await session.commit()
+        artists[0].name = "Renamed"
+        await session.commit()
+        await session.delete(artists[1])
+        await session.commit()
+
+    async with session_factory() as session:
+        pages, after, has_more = [], 0, True
+        while has_more:
+            changes, after, has_more = await read_changes(session, after, limit=2)
+            pages.append(changes)
+        return [a.id for a in artists], pages, after
+
+
+def test_cursor_pages_cover_every_event_once(db, session_factory):
+    artist_ids, pages, last = asyncio.run(write_and_read(session_factory))
+
+    events = [(c["entity_id"], c["op"]) for page in pages for c in page]
+    change_ids = [c["change_id"] for page in pages for c in page]
+    # 5 вставок, переименование, удаление; страница по 2 события
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    assert events == [(i, "upsert") for i in artist_ids] + [(artist_ids[0], "upsert"), (artist_ids[1], "delete")]
+    assert change_ids == sorted(change_ids)
+    assert last == change_ids[-1]
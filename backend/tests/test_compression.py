@@ -0,0 +1,81 @@
+# tests/test_compression.py
+"""Сжатие ответов: выбор кодировки по Accept-Encoding, свой ETag у каждого представления, Vary."""
+import asyncio
+import gzip
+import json
+
+import brotli
+import pytest
+
+from app.services.compression import negotiate_encoding
+from app.sqlmodels import Artist
+from app.sqlmodels.user import Role
+
+ARTISTS_URL = "/api/v1/artists/"
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate_encoding(accept, expected):
+    assert negotiate_encoding(accept) == expected
+
+
+def test_each_encoding_gets_its_own_etag_and_vary(api, session_factory, make_user):
+    _, headers = make_user(Role.MANAGER)
+
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all(Artist(name=f"Artist {i}", is_approved=True) for i in range(100))
+            await session.commit()
+        async with api() as client:
+            responses = {}
+            for accept in ("identity", "gzip", "br"):
+                # Сырой поток: httpx не распаковывает тело и не подставляет свой Accept-Encoding
+                request = client.build_request("GET", ARTISTS_URL, headers={**headers, "Accept-Encoding": accept})
+                response = await client.send(request, stream=True)
+                responses[accept] = (response, b"".join([chunk async for chunk in response.aiter_raw()]))
+                await response.aclose()
+            repeat = await client.get(
+                ARTISTS_URL,
+                headers={**headers, "Accept-Encoding": "gzip", "If-None-Match": responses["gzip"][0].headers["etag"]},
+            )
+            return responses, repeat
+
+    responses, repeat = asyncio.run(scenario())
+    plain, plain_body = responses["identity"]
+    gzipped, gzip_body = responses["gzip"]
+    brotlied, brotli_body = responses["br"]
+
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert brotlied.headers["content-encoding"] == "br"
+    assert json.loads(gzip.decompress(gzip_body)) == json.loads(plain_body)
+    assert json.loads(brotli.decompress(brotli_body)) == json.loads(plain_body)
+
+    etags = {plain.headers["etag"], gzipped.headers["etag"], brotlied.headers["etag"]}
+    assert len(etags) == 3
+    assert gzipped.headers["etag"].endswith('-gzip"') and brotlied.headers["etag"].endswith('-br"')
+    for response in (gzipped, brotlied):
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(plain_body)
+
+    # Клиент хранит gzip-представление — 304 возвращает именно его ETag
+    assert repeat.status_code == 304
+    assert repeat.headers["etag"] == gzipped.headers["etag"]
+
+
+def test_small_responses_are_not_compressed(api):
+    async def scenario():
+        async with api() as client:
+            return await client.get("/", headers={"Accept-Encoding": "gzip, br"})
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
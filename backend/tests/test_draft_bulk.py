@@ -0,0 +1,118 @@
+# tests/test_draft_bulk.py
+"""Массовое утверждение и отклонение черновиков: связи удаляются вместе с черновиком, утверждённое не трогается."""
+import asyncio
+
+from sqlalchemy import select
+
+from app.sqlmodels import Album, Artist, ArtistPerson, Person, Track, TrackArtist, TrackArtistShare, TrackPersonShare
+from app.sqlmodels.user import Role
+
+MISSING = 10_000
+
+
+async def seed(session_factory, author_id, other_id):
+    async with session_factory() as session:
+        album = Album(title="Album", type="album", is_approved=True)
+        person = Person(last_name="Petrov", first_name="Ivan", email="p@example.com", is_approved=True)
+        used_artist = Artist(name="Used draft", created_by_user_id=author_id)
+        free_artist = Artist(name="Free draft", created_by_user_id=author_id)
+        session.add_all([album, person, used_artist, free_artist])
+        await session.flush()
+        tracks = {
+            "draft": Track(title="Draft", isrc="ISRC-1", album_id=album.id, created_by_user_id=author_id),
+            "bare draft": Track(title="Bare draft", isrc="ISRC-2", album_id=album.id, created_by_user_id=author_id),
+            "approved": Track(title="Approved", isrc="ISRC-3", album_id=album.id, created_by_user_id=author_id,
+                              is_approved=True),
+            "other's draft": Track(title="Other", isrc="ISRC-4", album_id=album.id, created_by_user_id=other_id),
+        }
+        session.add_all(tracks.values())
+        await session.flush()
+        session.add_all([
+            TrackArtist(track_id=tracks["draft"].id, artist_id=used_artist.id),
+            TrackPersonShare(track_id=tracks["draft"].id, person_id=person.id),
+            TrackArtist(track_id=tracks["approved"].id, artist_id=used_artist.id),
+            TrackPersonShare(track_id=tracks["approved"].id, person_id=person.id),
+            ArtistPerson(artist_id=free_artist.id, person_id=person.id),
+        ])
+        await session.flush()
+        session.add_all([
+            TrackArtistShare(track_id=tracks["draft"].id, artist_id=used_artist.id, percent=100),
+            TrackArtistShare(track_id=tracks["approved"].id, artist_id=used_artist.id, percent=100),
+        ])
+        await session.commit()
+        return {name: t.id for name, t in tracks.items()}, used_artist.id, free_artist.id
+
+
+async def rows(session_factory, *columns):
+    async with session_factory() as session:
+        return sorted((await session.execute(select(*columns))).all())
+
+
+def post(api, headers, url, payload):
+    async def scenario():
+        async with api() as client:
+            response = await client.post(url, json=payload, headers=headers)
+            assert response.status_code == 200, response.text
+            return response.json()
+
+    return asyncio.run(scenario())
+
+
+def test_reject_tracks_deletes_their_links_and_reports_skipped_ids(api, session_factory, make_user):
+    _, admin = make_user(Role.ADMIN)
+    author, _ = make_user(Role.MANAGER)
+    other, _ = make_user(Role.MANAGER)
+    tracks, _, _ = asyncio.run(seed(session_factory, author.id, other.id))
+
+    result = post(api, admin, "/api/v1/drafts/tracks/reject",
+                  {"ids": [tracks["draft"], tracks["bare draft"], tracks["approved"], MISSING]})
+
+    assert result == {
+        "processed": 2,
+        "ids": sorted([tracks["draft"], tracks["bare draft"]]),
+        "skipped_ids": sorted([tracks["approved"], MISSING]),
+    }
+    assert asyncio.run(rows(session_factory, Track.id)) == sorted(
+        [(tracks["approved"],), (tracks["other's draft"],)]
+    )
+    # Связи и доли остались только у утверждённого трека
+    assert {t for t, in asyncio.run(rows(session_factory, TrackArtist.track_id))} == {tracks["approved"]}
+    assert {t for t, in asyncio.run(rows(session_factory, TrackPersonShare.track_id))} == {tracks["approved"]}
+    assert {t for t, in asyncio.run(rows(session_factory, TrackArtistShare.track_id))} == {tracks["approved"]}
+
+
+def test_reject_skips_referenced_drafts_and_cascades_the_rest(api, session_factory, make_user):
+    _, admin = make_user(Role.ADMIN)
+    author, _ = make_user(Role.MANAGER)
+    _, used_artist, free_artist = asyncio.run(seed(session_factory, author.id, author.id))
+
+    result = post(api, admin, "/api/v1/drafts/artists/reject", {"ids": [used_artist, free_artist]})
+
+    # На артиста ссылаются треки — он остаётся черновиком и попадает в skipped_ids
+    assert (result["ids"], result["skipped_ids"]) == ([free_artist], [used_artist])
+    assert asyncio.run(rows(session_factory, Artist.id)) == [(used_artist,)]
+    assert asyncio.run(rows(session_factory, ArtistPerson.artist_id)) == []
+
+
+def test_creator_filter_leaves_approved_rows_and_other_authors_alone(api, session_factory, make_user):
+    _, admin = make_user(Role.ADMIN)
+    author, _ = make_user(Role.MANAGER)
+    other, _ = make_user(Role.MANAGER)
+    tracks, _, _ = asyncio.run(seed(session_factory, author.id, other.id))
+    before = asyncio.run(rows(session_factory, Track.id, Track.title, Track.is_approved))
+
+    approved = post(api, admin, "/api/v1/drafts/tracks/approve", {"created_by_user_id": author.id})
+
+    assert approved == {"processed": 2, "ids": sorted([tracks["draft"], tracks["bare draft"]]), "skipped_ids": []}
+    after = {track_id: is_approved for track_id, _, is_approved in
+             asyncio.run(rows(session_factory, Track.id, Track.title, Track.is_approved))}
+    assert after == {
+        tracks["draft"]: True, tracks["bare draft"]: True, tracks["approved"]: True, tracks["other's draft"]: False,
+    }
+    assert len(before) == len(after)
+
+    # Черновиков автора больше нет — отклонение по автору не трогает его утверждённые треки
+    rejected = post(api, admin, "/api/v1/drafts/tracks/reject", {"created_by_user_id": author.id})
+    assert rejected == {"processed": 0, "ids": [], "skipped_ids": []}
+    assert len(asyncio.run(rows(session_factory, Track.id))) == 4
+    assert len(asyncio.run(rows(session_factory, TrackArtist.track_id))) == 2
@@ -0,0 +1,131 @@
+# tests/test_draft_closure.py
+"""Утверждение трека/альбома вместе с черновиками, от которых он зависит: предпросмотр и утверждение."""
+import asyncio
+
+from sqlalchemy import select
+
+from app.sqlmodels import (
+    Album, AlbumArtist, Artist, ArtistPerson, Person, TableVersion, Track, TrackArtist, TrackPersonShare,
+)
+from app.sqlmodels.user import Role
+
+MODELS = {"tracks": Track, "albums": Album, "artists": Artist, "persons": Person}
+
+
+def person(name, approved=False):
+    return Person(last_name=name, first_name="X", email=f"{name}@example.com", is_approved=approved)
+
+
+async def seed(session_factory, author_id):
+    """
+    Черновик трека → черновик альбома → черновик артиста альбома → его участник-черновик;
+    доля трека у другой персоны-черновика; утверждённый артист трека с участником-черновиком;
+    посторонние черновики, которые не должны попасть в замыкание.
+    """
+    async with session_factory() as session:
+        draft = {"created_by_user_id": author_id}
+        album = Album(title="Draft album", type="album", **draft)
+        album_artist = Artist(name="Draft artist", **draft)
+        approved_artist = Artist(name="Approved artist", is_approved=True)
+        member = person("member")
+        approved_artist_member = person("approved_artist_member")
+        share_holder = person("share_holder")
+        approved_member = person("approved_member", approved=True)
+        unrelated = [Artist(name="Unrelated draft", **draft), person("unrelated"),
+                     Album(title="Unrelated album", type="single", **draft)]
+        session.add_all([album, album_artist, approved_artist, member, approved_artist_member, share_holder,
+                         approved_member, *unrelated])
+        await session.flush()
+        track = Track(title="Draft track", isrc="ISRC-1", album_id=album.id, **draft)
+        session.add(track)
+        await session.flush()
+        session.add_all([
+            AlbumArtist(album_id=album.id, artist_id=album_artist.id),
+            ArtistPerson(artist_id=album_artist.id, person_id=member.id),
+            ArtistPerson(artist_id=album_artist.id, person_id=approved_member.id),
+            TrackArtist(track_id=track.id, artist_id=approved_artist.id),
+            ArtistPerson(artist_id=approved_artist.id, person_id=approved_artist_member.id),
+            TrackPersonShare(track_id=track.id, person_id=share_holder.id),
+        ])
+        await session.commit()
+        closure = {
+            "tracks": [track.id],
+            "albums": [album.id],
+            "artists": [album_artist.id],
+            "persons": sorted([member.id, approved_artist_member.id, share_holder.id]),
+        }
+        return track.id, album.id, closure, member.id
+
+
+async def approval_state(session_factory):
+    async with session_factory() as session:
+        state = {
+            name: dict((await session.execute(select(model.id, model.is_approved))).all())
+            for name, model in MODELS.items()
+        }
+        state["versions"] = dict((await session.execute(select(TableVersion.table_name, TableVersion.version))).all())
+        return state
+
+
+def call(api, headers, method, url):
+    async def scenario():
+        async with api() as client:
+            response = await client.request(method, url, headers=headers)
+            assert response.status_code == 200, response.text
+            return response.json()
+
+    return asyncio.run(scenario())
+
+
+def test_preview_returns_the_closure_and_writes_nothing(api, session_factory, make_user):
+    _, admin = make_user(Role.ADMIN)
+    author, _ = make_user(Role.MANAGER)
+    track_id, album_id, closure, member_id = asyncio.run(seed(session_factory, author.id))
+    before = asyncio.run(approval_state(session_factory))
+
+    preview = call(api, admin, "GET", f"/api/v1/drafts/tracks/{track_id}/dependencies")
+
+    assert preview == closure
+    assert asyncio.run(approval_state(session_factory)) == before
+    # От альбома трек не зависит: в обход не входят ни артисты трека, ни его доли
+    album_preview = call(api, admin, "GET", f"/api/v1/drafts/albums/{album_id}/dependencies")
+    assert album_preview == {"tracks": [], "albums": [album_id], "artists": closure["artists"], "persons": [member_id]}
+
+
+def test_approve_flips_exactly_the_closure(api, session_factory, make_user):
+    _, admin = make_user(Role.ADMIN)
+    author, _ = make_user(Role.MANAGER)
+    track_id, _, closure, _ = asyncio.run(seed(session_factory, author.id))
+    before = asyncio.run(approval_state(session_factory))
+
+    approved = call(api, admin, "POST", f"/api/v1/drafts/tracks/{track_id}/approve-with-dependencies")
+
+    assert approved == closure
+    after = asyncio.run(approval_state(session_factory))
+    for name in MODELS:
+        flipped = sorted(i for i, is_approved in after[name].items() if is_approved != before[name][i])
+        assert flipped == closure[name], name
+        assert all(after[name][i] for i in closure[name])
+    # Повторное утверждение: черновиков в замыкании не осталось
+    assert call(api, admin, "POST", f"/api/v1/drafts/tracks/{track_id}/approve-with-dependencies") == {
+        "tracks": [], "albums": [], "artists": [], "persons": [],
+    }
+
+
+def test_approved_intermediates_are_traversed_but_not_returned(api, session_factory, make_user):
+    _, admin = make_user(Role.ADMIN)
+    author, _ = make_user(Role.MANAGER)
+    track_id, _, closure, _ = asyncio.run(seed(session_factory, author.id))
+
+    preview = call(api, admin, "GET", f"/api/v1/drafts/tracks/{track_id}/dependencies")
+
+    async def names():
+        async with session_factory() as session:
+            artists = (await session.execute(select(Artist.name).where(Artist.id.in_(preview["artists"])))).scalars()
+            people = (await session.execute(select(Person.last_name).where(Person.id.in_(preview["persons"])))).scalars()
+            return sorted(artists), sorted(people)
+
+    artists, people = asyncio.run(names())
+    # Утверждённый артист трека не возвращается, но его участник-черновик найден через него
+    assert artists == ["Draft artist"]
+    assert people == ["approved_artist_member", "member", "share_holder"]
@@ -0,0 +1,68 @@
+# tests/test_draft_summary.py
+"""GET /drafts/summary: число черновиков по типам и по авторам, утверждённые не считаются."""
+import asyncio
+
+from app.sqlmodels import Album, Artist, Person, Track
+from app.sqlmodels.user import Role
+
+
+def test_summary_counts_drafts_per_entity_and_creator(api, session_factory, make_user):
+    _, admin_headers = make_user(Role.ADMIN)
+    _, manager_headers = make_user(Role.MANAGER)
+    first, _ = make_user(Role.MANAGER)
+    second, _ = make_user(Role.MANAGER)
+
+    async def seed():
+        async with session_factory() as session:
+            album = Album(title="Approved", type="album", is_approved=True, created_by_user_id=first.id)
+            session.add_all([
+                album,
+                Album(title="Draft", type="album", created_by_user_id=first.id),
+                *(Person(last_name=f"P{i}", first_name="X", email=f"p{i}@example.com", created_by_user_id=first.id)
+                  for i in range(3)),
+                Person(last_name="Approved", first_name="X", email="a@example.com", is_approved=True,
+                       created_by_user_id=second.id),
+                Artist(name="Second's draft", created_by_user_id=second.id),
+                Artist(name="Imported draft"),  # без автора — отдельная строка с created_by_user_id = null
+            ])
+            await session.flush()
+            session.add_all([
+                Track(title="T1", isrc="I-1", album_id=album.id, created_by_user_id=second.id),
+                Track(title="T2", isrc="I-2", album_id=album.id, created_by_user_id=second.id),
+                Track(title="T3", isrc="I-3", album_id=album.id, created_by_user_id=first.id, is_approved=True),
+            ])
+            await session.commit()
+
+    asyncio.run(seed())
+
+    async def scenario():
+        async with api() as client:
+            return (
+                await client.get("/api/v1/drafts/summary", headers=admin_headers),
+                await client.get("/api/v1/drafts/summary", headers=manager_headers),
+            )
+
+    summary, forbidden = asyncio.run(scenario())
+    assert forbidden.status_code == 403
+    assert summary.status_code == 200, summary.text
+    body = summary.json()
+    assert body["total"] == 8
+    assert body["by_entity"] == {"persons": 3, "artists": 2, "albums": 1, "tracks": 2}
+    # По убыванию числа черновиков
+    assert body["by_creator"] == [
+        {"created_by_user_id": first.id, "persons": 3, "artists": 0, "albums": 1, "tracks": 0, "total": 4},
+        {"created_by_user_id": second.id, "persons": 0, "artists": 1, "albums": 0, "tracks": 2, "total": 3},
+        {"created_by_user_id": None, "persons": 0, "artists": 1, "albums": 0, "tracks": 0, "total": 1},
+    ]
+
+
+def test_summary_is_empty_without_drafts(api, make_user):
+    _, admin = make_user(Role.ADMIN)
+
+    async def scenario():
+        async with api() as client:
+            return (await client.get("/api/v1/drafts/summary", headers=admin)).json()
+
+    assert asyncio.run(scenario()) == {
+        "total": 0, "by_entity": {"persons": 0, "artists": 0, "albums": 0, "tracks": 0}, "by_creator": [],
+    }
@@ -0,0 +1,143 @@
+# tests/test_etag.py
+"""
+Условные GET: 304 только для тех, кто получил бы 200; счётчики таблиц растут вместе с изменением
+(в той же транзакции, без второго соединения из пула). Время 304 против полного ответа — в выводе pytest -s.
+"""
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.sqlmodels import Artist, TableVersion
+from app.sqlmodels.user import Role
+
+ARTISTS_URL = "/api/v1/artists/"
+ARTISTS = 300
+REQUESTS = 50
+
+
+async def seed_artists(session_factory, count=ARTISTS):
+    async with session_factory() as session:
+        session.add_all(Artist(name=f"Artist {i}", is_approved=True) for i in range(count))
+        await session.commit()
+
+
+async def artist_version(session_factory) -> int:
+    async with session_factory() as session:
+        return (await session.execute(
+            select(TableVersion.version).where(TableVersion.table_name == "artist")
+        )).scalar_one()
+
+
+def test_matching_etag_gets_304_and_changes_after_write(api, session_factory, make_user):
+    _, headers = make_user(Role.MANAGER)
+    asyncio.run(seed_artists(session_factory))
+
+    async def scenario():
+        async with api() as client:
+            first = await client.get(ARTISTS_URL, headers=headers)
+            etag = first.headers["etag"]
+            cached = await client.get(ARTISTS_URL, headers={**headers, "If-None-Match": etag})
+            await seed_artists(session_factory, 1)
+            changed = await client.get(ARTISTS_URL, headers={**headers, "If-None-Match": etag})
+            return first, cached, changed
+
+    first, cached, changed = asyncio.run(scenario())
+    assert first.status_code == 200
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == first.headers["etag"]
+    assert cached.content == b""
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert len(changed.json()) == ARTISTS + 1
+
+
+def test_304_requires_the_same_authorization_as_200(api, session_factory, make_user):
+    _, manager = make_user(Role.MANAGER)
+    _, admin = make_user(Role.ADMIN)
+    _, deactivated = make_user(Role.MANAGER, is_active=False)
+    asyncio.run(seed_artists(session_factory, 3))
+
+    async def scenario():
+        async with api() as client:
+            etag = (await client.get(ARTISTS_URL, headers=manager)).headers["etag"]
+            conditional = {"If-None-Match": etag}
+            drafts_etag = (await client.get("/api/v1/drafts/persons", headers=admin)).headers["etag"]
+            return {
+                "anonymous": await client.get(ARTISTS_URL, headers=conditional),
+                "junk token": await client.get(
+                    ARTISTS_URL, headers={**conditional, "Authorization": "Bearer junk"}
+                ),
+                "deactivated": await client.get(ARTISTS_URL, headers={**conditional, **deactivated}),
+                "manager on admin route": await client.get(
+                    "/api/v1/drafts/persons", headers={**manager, "If-None-Match": "*"}
+                ),
+                "admin on admin route": await client.get(
+                    "/api/v1/drafts/persons", headers={**admin, "If-None-Match": drafts_etag}
+                ),
+            }
+
+    responses = asyncio.run(scenario())
+    assert responses["anonymous"].status_code == 403
+    assert responses["junk token"].status_code == 401
+    assert responses["deactivated"].status_code == 401
+    assert responses["manager on admin route"].status_code == 403
+    assert responses["admin on admin route"].status_code == 304
+    assert all("etag" not in r.headers for name, r in responses.items() if r.status_code != 304)
+
+
+def test_version_bump_commits_and_rolls_back_with_the_change(session_factory):
+    async def scenario():
+        async with session_factory() as session:
+            session.add(Artist(name="Rolled back"))
+            await session.flush()
+            await session.rollback()
+        after_rollback = await artist_version(session_factory)
+        await seed_artists(session_factory, 1)
+        return after_rollback, await artist_version(session_factory)
+
+    assert asyncio.run(scenario()) == (0, 1)
+
+
+def test_commit_does_not_check_out_a_second_connection(db, tmp_path):
+    # Пул из одного соединения без переполнения: второе соединение на commit ждало бы вечно
+    engine = create_async_engine(
+        db.url, poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0, pool_timeout=1,
+    )
+    sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def scenario():
+        try:
+            await seed_artists(sessions, 1)
+            return await artist_version(sessions)
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_304_versus_full_response_time(api, session_factory, make_user):
+    _, headers = make_user(Role.MANAGER)
+    asyncio.run(seed_artists(session_factory))
+
+    async def timed(client, extra):
+        samples = []
+        for _ in range(REQUESTS):
+            started = time.perf_counter()
+            response = await client.get(ARTISTS_URL, headers={**headers, **extra})
+            samples.append(time.perf_counter() - started)
+        return response, statistics.median(samples)
+
+    async def scenario():
+        async with api() as client:
+            full, full_time = await timed(client, {})
+            cached, cached_time = await timed(client, {"If-None-Match": full.headers["etag"]})
+            return full, full_time, cached, cached_time
+
+    full, full_time, cached, cached_time = asyncio.run(scenario())
+    assert (full.status_code, cached.status_code) == (200, 304)
+    print(f"\nGET {ARTISTS_URL} ({ARTISTS} артистов, {len(full.content)} байт): "
+          f"200 — {full_time * 1000:.2f} мс, 304 — {cached_time * 1000:.2f} мс (медиана из {REQUESTS})")
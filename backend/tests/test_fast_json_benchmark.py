@@ -0,0 +1,112 @@
+# tests/test_fast_json_benchmark.py
+"""
+Микробенчмарк FastJSONResponse против пути FastAPI по умолчанию для больших списков.
+По умолчанию контроллер строит модели, FastAPI повторно валидирует их по response_model,
+прогоняет через jsonable_encoder и кодирует stdlib json. Быстрый путь кодирует dict из строк запроса.
+Результаты — в выводе pytest -s.
+"""
+import json
+import time
+from decimal import Decimal
+from typing import Callable, List
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.api.v1.models.artist import ArtistDetailResponse
+from app.api.v1.models.raw_data import RawUsageDataResponse
+from app.api.v1.models.track import TrackResponse
+from app.responses import FastJSONResponse
+
+ROWS = 5000
+
+
+def track_row(i: int) -> dict:
+    return {
+        "id": i, "title": f"Track {i}", "isrc": f"RU-A00-24-{i:05d}", "genre": "pop",
+        "label_id": None, "label_share_percentage": None,
+        "scope_of_copyright": 100.0, "scope_of_related_rights": 50.0,
+        "neighboring_rights_share": 25.5, "label_rights_share": None, "label_monetization_share": None,
+        "marketing_expenses": 1200.5, "advance_expenses": None,
+        "is_approved": True, "created_by_user_id": 1,
+        "is_ringtone_added": False, "has_video_clip": True, "is_lyrics_added": False, "is_karaoke_sync_added": False,
+        "text": None, "karaoke": None, "synclab": None, "copyright": "Label", "related_rights": None,
+        "advance": None, "marketing": None,
+        "album_id": i // 10, "album_title": f"Album {i // 10}",
+        "artists": [
+            {"id": i * 2 + n, "name": f"Artist {i * 2 + n}", "isni": None, "is_approved": True, "created_by_user_id": 1}
+            for n in range(2)
+        ],
+        "artist_ids": [i * 2, i * 2 + 1],
+    }
+
+
+def artist_row(i: int) -> dict:
+    return {
+        "id": i, "name": f"Artist {i}", "isni": f"0000000{i:09d}",
+        "members": [
+            {
+                "id": i * 3 + n, "last_name": "Иванов", "first_name": "Иван", "middle_name": None,
+                "email": f"person{i * 3 + n}@example.com", "phone": None,
+                "is_approved": True, "created_by_user_id": 1,
+            }
+            for n in range(3)
+        ],
+    }
+
+
+def raw_usage_row(i: int) -> dict:
+    return {
+        "id": i, "row_index": i, "period": "2024-01", "platform": "Yandex", "right_type": "author",
+        "territory": "RU", "content_type": "audio", "usage_type": "stream",
+        "performer_name_excel": f"Artist {i % 100}", "track_title_excel": f"Track {i}",
+        "album_title_excel": f"Album {i // 10}", "author_words_name_excel": None, "author_music_name_excel": None,
+        "licensor_share_author_percent": Decimal("50.00"), "licensor_share_neighboring_percent": Decimal("25.00"),
+        "isrc": f"RU-A00-24-{i:05d}", "upc": None, "copyright": None, "quantity": i % 1000,
+        "total_royalty_author": Decimal("12.3456"), "total_royalty_neighboring": Decimal("1.5"),
+        "licensor_share_author_licensor_percent": None, "licensor_share_neighboring_licensor_percent": None,
+        "calculated_royalty_author": Decimal("6.1728"), "calculated_royalty_neighboring": None,
+        "calculated_total_royalty": Decimal("6.1728"), "processed_status": "processed",
+    }
+
+
+def default_path(model, rows: List[dict]) -> bytes:
+    """Контроллер строит модели → FastAPI валидирует по response_model → jsonable_encoder → json."""
+    models = [model.model_validate(row) for row in rows]
+    validated = TypeAdapter(List[model]).validate_python(models, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def fast_path(rows: List[dict]) -> bytes:
+    return FastJSONResponse(rows).body
+
+
+def best_of(runs: int, func: Callable[[], bytes]) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+@pytest.mark.parametrize("model, make_row", [
+    (TrackResponse, track_row),
+    (ArtistDetailResponse, artist_row),
+    (RawUsageDataResponse, raw_usage_row),
+], ids=["TrackResponse", "ArtistDetailResponse", "RawUsageDataResponse"])
+def test_fast_json_response_matches_and_beats_default(model, make_row):
+    rows = [make_row(i) for i in range(ROWS)]
+
+    # Быстрый путь отдаёт тот же JSON, что и путь по умолчанию
+    assert json.loads(fast_path(rows)) == json.loads(default_path(model, rows))
+
+    default_seconds = best_of(3, lambda: default_path(model, rows))
+    fast_seconds = best_of(3, lambda: fast_path(rows))
+    print(
+        f"\n{model.__name__} × {ROWS}: по умолчанию {default_seconds * 1000:.1f} мс, "
+        f"FastJSONResponse {fast_seconds * 1000:.1f} мс ({default_seconds / fast_seconds:.1f}×)"
+    )
+    assert fast_seconds < default_seconds
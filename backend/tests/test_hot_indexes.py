@@ -0,0 +1,156 @@
+# tests/test_hot_indexes.py
+"""
+EXPLAIN-проверка индексов из миграции 8f4c2a7d1e5b: горячие запросы на заполненной базе
+должны идти по индексам, а не полным просмотром таблицы.
+По умолчанию — SQLite; с TEST_POSTGRES_URL (postgresql://...) те же проверки идут и на PostgreSQL.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlmodel import SQLModel
+
+from app.sqlmodels import (
+    Album, AlbumArtist, Artist, ArtistPerson, ExcelReport, Person, RawUsageDataStrict, Track, TrackArtist,
+    TrackArtistShare,
+)
+
+TRACKS = 2000
+
+# Индексы ограничений UNIQUE на SQLite / PostgreSQL: по уникальным колонкам подходят и они
+ARTIST_ISNI_UNIQUE = ("sqlite_autoindex_artist_1", "artist_isni_key")
+PERSON_EMAIL_UNIQUE = ("sqlite_autoindex_person_1", "person_email_key")
+
+# (описание, запрос, индексы, один из которых должен оказаться в плане)
+HOT_QUERIES = [
+    ("дубликат ISRC среди утверждённых треков",
+     select(Track.id).where(Track.isrc == "RU-X-00042", Track.is_approved == True),
+     ("ix_track_isrc_approved",)),
+    ("очередь черновиков треков автора",
+     select(Track.id).where(Track.is_approved == False, Track.created_by_user_id == 3).order_by(Track.id),
+     ("ix_track_drafts",)),
+    ("треки альбома",
+     select(Track.id).where(Track.album_id == 7),
+     ("ix_track_album_id",)),
+    ("дубликат UPC среди утверждённых альбомов",
+     select(Album.id).where(Album.upc == "UPC-00042", Album.is_approved == True),
+     ("ix_album_upc_approved",)),
+    ("дубликат ISRC среди утверждённых альбомов",
+     select(Album.id).where(Album.isrc == "ALB-00042", Album.is_approved == True),
+     ("ix_album_isrc_approved",)),
+    ("поиск альбома по названию (импортер)",
+     select(Album.id).where(Album.title == "Album 42"),
+     ("ix_album_title",)),
+    ("очередь черновиков альбомов",
+     select(Album.id).where(Album.is_approved == False, Album.created_by_user_id == 3),
+     ("ix_album_drafts",)),
+    ("дубликат ISNI артиста",
+     select(Artist.id).where(Artist.isni == "ISNI-00042", Artist.is_approved == True),
+     ("ix_artist_isni",) + ARTIST_ISNI_UNIQUE),
+    ("поиск артиста по имени",
+     select(Artist.id).where(Artist.name == "Artist 42"),
+     ("ix_artist_name",)),
+    ("дубликат email утверждённой персоны",
+     select(Person.id).where(Person.email == "person42@example.com", Person.is_approved == True),
+     ("ix_person_email_approved",) + PERSON_EMAIL_UNIQUE),
+    ("треки артиста",
+     select(TrackArtist.track_id).where(TrackArtist.artist_id == 42),
+     ("ix_track_artist_artist_id",)),
+    ("альбомы артиста",
+     select(AlbumArtist.album_id).where(AlbumArtist.artist_id == 42),
+     ("ix_album_artist_artist_id",)),
+    ("артисты персоны",
+     select(ArtistPerson.artist_id).where(ArtistPerson.person_id == 42),
+     ("ix_artist_person_person_id",)),
+    ("треки, где доля артиста больше N% (GET /tracks/by-artist-share)",
+     select(TrackArtistShare.track_id).where(TrackArtistShare.artist_id == 42, TrackArtistShare.percent > 50),
+     ("ix_track_artist_share_artist_percent",)),
+    ("строки отчётов по ISRC",
+     select(RawUsageDataStrict.id).where(RawUsageDataStrict.isrc == "RU-X-00042"),
+     ("ix_raw_usage_data_strict_isrc",)),
+    ("необработанные строки отчёта",
+     select(RawUsageDataStrict.id).where(
+         RawUsageDataStrict.excel_report_id == 1, RawUsageDataStrict.processed_status == "pending",
+     ),
+     ("ix_raw_usage_data_strict_report_status",)),
+]
+
+
+def _seed(connection) -> None:
+    albums = TRACKS // 10
+    connection.execute(Person.__table__.insert(), [
+        {"id": i, "last_name": f"Last {i}", "first_name": "First", "email": f"person{i}@example.com",
+         "is_approved": i % 5 != 0, "created_by_user_id": i % 7}
+        for i in range(1, albums + 1)
+    ])
+    connection.execute(Artist.__table__.insert(), [
+        {"id": i, "name": f"Artist {i}", "isni": f"ISNI-{i:05d}", "is_approved": i % 5 != 0,
+         "created_by_user_id": i % 7}
+        for i in range(1, albums + 1)
+    ])
+    connection.execute(ArtistPerson.__table__.insert(), [
+        {"artist_id": i, "person_id": i} for i in range(1, albums + 1)
+    ])
+    connection.execute(Album.__table__.insert(), [
+        {"id": i, "title": f"Album {i}", "type": "album", "upc": f"UPC-{i:05d}", "isrc": f"ALB-{i:05d}",
+         "is_approved": i % 5 != 0, "created_by_user_id": i % 7}
+        for i in range(1, albums + 1)
+    ])
+    connection.execute(AlbumArtist.__table__.insert(), [
+        {"album_id": i, "artist_id": i} for i in range(1, albums + 1)
+    ])
+    connection.execute(Track.__table__.insert(), [
+        {"id": i, "title": f"Track {i}", "isrc": f"RU-X-{i:05d}", "album_id": i % albums + 1,
+         "label_share_percentage": 20.0, "is_approved": i % 5 != 0, "created_by_user_id": i % 7,
+         "is_ringtone_added": False, "has_video_clip": False, "is_lyrics_added": False,
+         "is_karaoke_sync_added": False}
+        for i in range(1, TRACKS + 1)
+    ])
+    connection.execute(TrackArtist.__table__.insert(), [
+        {"track_id": i, "artist_id": i % albums + 1} for i in range(1, TRACKS + 1)
+    ])
+    connection.execute(TrackArtistShare.__table__.insert(), [
+        {"track_id": i, "artist_id": i % albums + 1, "percent": i % 101} for i in range(1, TRACKS + 1)
+    ])
+    connection.execute(ExcelReport.__table__.insert(), [{"id": 1, "filename": "report.xlsx", "original_name": "report.xlsx"}])
+    connection.execute(RawUsageDataStrict.__table__.insert(), [
+        {"excel_report_id": 1, "row_index": i, "isrc": f"RU-X-{i % TRACKS:05d}",
+         "processed_status": "pending" if i % 10 == 0 else "processed"}
+        for i in range(TRACKS * 2)
+    ])
+
+
+def _backends():
+    backends = [pytest.param("sqlite://", id="sqlite")]
+    if os.environ.get("TEST_POSTGRES_URL"):
+        backends.append(pytest.param(os.environ["TEST_POSTGRES_URL"], id="postgresql"))
+    return backends
+
+
+@pytest.fixture(scope="module", params=_backends())
+def seeded(request):
+    engine = create_engine(request.param)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        _seed(connection)
+        connection.execute(text("ANALYZE"))
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _plan(engine, query) -> str:
+    sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            # На тестовом объёме полный просмотр может оказаться дешевле — проверяем, что индекс применим
+            connection.execute(text("SET enable_seqscan = off"))
+            return "\n".join(row[0] for row in connection.execute(text("EXPLAIN " + sql)))
+        return "\n".join(row[-1] for row in connection.execute(text("EXPLAIN QUERY PLAN " + sql)))
+
+
+@pytest.mark.parametrize("description, query, indexes", HOT_QUERIES, ids=[q[2][0] for q in HOT_QUERIES])
+def test_hot_query_uses_index(seeded, description, query, indexes):
+    plan = _plan(seeded, query)
+    assert any(index in plan for index in indexes), f"{description}: ожидался {indexes[0]}, план:\n{plan}"
@@ -0,0 +1,122 @@
+# tests/test_import_tracks.py
+"""Импорт каталога из Excel (import_tracks_async.py) на небольшой книге, собранной в памяти."""
+import asyncio
+import io
+
+import openpyxl
+import pytest
+from sqlalchemy import func, select
+
+import import_tracks_async
+from app.sqlmodels import Album, Artist, Track, TrackArtist
+
+HEADER = ["Название трека", "Название альбома", "ISRC", "Автор слов", "Автор музыки",
+          "Артист_1", "Доля монетизации", "Артист_2", "Доля монетизации"]
+ROWS = [
+    ["Song 1", "Album", "RU-A00-24-00001", "Author", "Composer", "Band", "60%", "Solo", "40%"],
+    ["Song 2", "Album", "RU-A00-24-00002", "без слов", "Composer", "Band", "100", None, None],
+    ["Song 3", "Album", "RU-A00-24-00003", None, None, "Solo", None, None, None],
+    ["Lost", "No such album", "RU-A00-24-00004", None, None, "Band", None, None, None],
+    ["Stranger", "Album", "RU-A00-24-00005", None, None, "Unknown artist", None, None, None],
+    ["No ISRC", "Album", None, None, None, "Band", None, None, None],
+]
+
+
+def workbook(rows=ROWS) -> bytes:
+    book = openpyxl.Workbook()
+    sheet = book.active
+    sheet.title = "Sheet1"
+    for row in [HEADER, *rows]:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    book.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def catalog(session_factory, monkeypatch):
+    monkeypatch.setattr(import_tracks_async, "AsyncSessionLocal", session_factory)
+
+    async def seed():
+        async with session_factory() as session:
+            session.add_all([Album(title="Album", type="album", is_approved=True),
+                             Artist(name="Band", is_approved=True), Artist(name="Solo", is_approved=True)])
+            await session.commit()
+
+    asyncio.run(seed())
+    return session_factory
+
+
+async def counts(session_factory):
+    async with session_factory() as session:
+        tracks = await session.scalar(select(func.count()).select_from(Track))
+        links = await session.scalar(select(func.count()).select_from(TrackArtist))
+        return tracks, links
+
+
+def run_import(data: bytes, **options):
+    return asyncio.run(import_tracks_async.import_tracks(io.BytesIO(data), "Sheet1", 2, **options))
+
+
+def test_dry_run_writes_nothing_and_reports_problems(catalog):
+    report = run_import(workbook(), dry_run=True)
+
+    assert asyncio.run(counts(catalog)) == (0, 0)
+    assert report.total == len(ROWS)
+    assert report.inserted == 0
+    assert dict(report.missing_albums) == {"No such album": 1}
+    assert dict(report.missing_artists) == {"Unknown artist": 1}
+    assert report.skipped["нет ISRC"] == 1
+
+
+def test_import_inserts_tracks_with_artist_links(catalog):
+    report = run_import(workbook(), dry_run=False)
+
+    assert report.inserted == 3 and not report.errors
+    assert asyncio.run(counts(catalog)) == (3, 4)
+
+    async def lyrics_flags():
+        async with catalog() as session:
+            return dict((await session.execute(select(Track.title, Track.is_lyrics_added))).all())
+
+    assert asyncio.run(lyrics_flags()) == {"Song 1": True, "Song 2": False, "Song 3": False}
+
+
+def test_upsert_dry_run_writes_nothing_and_rerun_is_unchanged(catalog):
+    data = workbook()
+    planned = run_import(data, dry_run=True, upsert=True)
+    assert asyncio.run(counts(catalog)) == (0, 0)
+    assert (planned.inserted, planned.updated) == (3, 0)
+
+    first = run_import(data, dry_run=False, upsert=True)
+    second = run_import(data, dry_run=False, upsert=True)
+
+    assert (first.inserted, first.updated, first.unchanged) == (3, 0, 0)
+    # Повторный запуск на том же файле: всё без изменений, ни дублей, ни записей
+    assert (second.inserted, second.updated, second.unchanged) == (0, 0, 3)
+    assert asyncio.run(counts(catalog)) == (3, 4)
+
+
+def test_upsert_updates_changed_rows_only(catalog):
+    run_import(workbook(), dry_run=False, upsert=True)
+    changed = [list(row) for row in ROWS]
+    changed[0][0] = "Song 1 (remastered)"
+    changed[2][5] = "Band"
+
+    report = run_import(workbook(changed), dry_run=False, upsert=True)
+
+    assert (report.inserted, report.updated, report.unchanged) == (0, 2, 1)
+
+    async def song_artists():
+        async with catalog() as session:
+            result = await session.execute(
+                select(Track.title, Artist.name)
+                .join(TrackArtist, TrackArtist.track_id == Track.id)
+                .join(Artist, Artist.id == TrackArtist.artist_id)
+                .where(Track.isrc.in_(["RU-A00-24-00001", "RU-A00-24-00003"]))
+            )
+            return sorted(result.all())
+
+    assert asyncio.run(song_artists()) == [
+        ("Song 1 (remastered)", "Band"), ("Song 1 (remastered)", "Solo"), ("Song 3", "Band"),
+    ]
@@ -0,0 +1,48 @@
+# tests/test_metrics.py
+"""GET /metrics/db-pool: состояние пула и гистограмма ожидания соединения — у основной БД и у реплики."""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.services.db_metrics import InstrumentedQueuePool
+from app.settings import settings
+from app.sqlmodels.user import Role
+
+
+def test_db_pool_endpoint_reports_primary_and_replica(db, monkeypatch, make_user, api):
+    _, admin = make_user(Role.ADMIN)
+    _, manager = make_user(Role.MANAGER)
+    primary = create_async_engine(db.url, poolclass=InstrumentedQueuePool, pool_size=3, max_overflow=2)
+    replica = create_async_engine(db.url, poolclass=NullPool)
+    monkeypatch.setattr("app.api.v1.routers.metrics.engine", primary)
+    monkeypatch.setattr("app.api.v1.routers.metrics.replica_engine", replica)
+
+    async def scenario():
+        try:
+            for _ in range(4):
+                async with primary.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            async with api() as client:
+                return (
+                    await client.get("/api/v1/metrics/db-pool", headers=admin),
+                    await client.get("/api/v1/metrics/db-pool", headers=manager),
+                )
+        finally:
+            await primary.dispose()
+            await replica.dispose()
+
+    response, forbidden = asyncio.run(scenario())
+    assert forbidden.status_code == 403
+    assert response.status_code == 200, response.text
+    stats = response.json()
+    assert stats["pool_class"] == "InstrumentedQueuePool"
+    assert (stats["size"], stats["checked_out"]) == (3, 0)
+    assert stats["pool_size_setting"] == settings.DB_POOL_SIZE
+    assert stats["checkout_wait"]["count"] == 4
+    assert sum(stats["checkout_wait"]["buckets"].values()) == 4
+    # У NullPool нет очереди: счётчиков и ожиданий нет, но пул реплики виден отдельно
+    assert stats["replica"]["pool_class"] == "NullPool"
+    assert stats["replica"]["size"] is None
+    assert stats["replica"]["checkout_wait"]["count"] == 0
@@ -0,0 +1,88 @@
+# tests/test_password_hashing.py
+"""
+Всплеск логинов: пул хэширования принимает не больше PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE
+операций, остальные сразу получают 503 с Retry-After, а цикл событий продолжает обслуживать запросы.
+Вместо bcrypt — time.sleep той же длительности: важна блокировка потока, а не сам хэш.
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import security
+from app.settings import settings
+
+LOGINS = 50
+HASH_SECONDS = 0.05
+MAX_QUEUE = 10
+
+
+def fake_bcrypt(password: str) -> str:
+    time.sleep(HASH_SECONDS)
+    return f"hashed:{password}"
+
+
+async def attempt(i: int):
+    try:
+        return await security.run_password_hashing(fake_bcrypt, f"secret-{i}")
+    except HTTPException as exc:
+        return exc
+
+
+async def measure_loop_lag(stop: asyncio.Event) -> float:
+    """Наибольшая задержка asyncio.sleep(0.01) за время всплеска."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - started - 0.01)
+    return worst
+
+
+async def burst():
+    stop = asyncio.Event()
+    lag = asyncio.create_task(measure_loop_lag(stop))
+    results = await asyncio.gather(*(attempt(i) for i in range(LOGINS)))
+    stop.set()
+    # Счётчик уменьшается колбэком из потока пула — даём циклу его выполнить
+    await asyncio.sleep(0.05)
+    return results, await lag
+
+
+@pytest.fixture
+def small_queue(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_QUEUE", MAX_QUEUE)
+
+
+def test_burst_beyond_capacity_gets_503_and_loop_stays_responsive(small_queue):
+    capacity = settings.PASSWORD_HASH_WORKERS + MAX_QUEUE
+    assert LOGINS > capacity
+
+    results, worst_lag = asyncio.run(burst())
+
+    hashed = [r for r in results if isinstance(r, str)]
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(hashed) == capacity
+    assert len(rejected) == LOGINS - capacity
+    assert all(r.status_code == 503 and r.headers["Retry-After"] for r in rejected)
+    # Хэширование идёт в пуле: цикл событий не ждёт bcrypt
+    assert worst_lag < 0.1, f"event loop stalled for {worst_lag * 1000:.0f} ms"
+    assert security._queued == 0
+    print(f"\n{LOGINS} логинов: {len(hashed)} выполнено, {len(rejected)} × 503, "
+          f"макс. задержка цикла {worst_lag * 1000:.1f} мс")
+
+
+def test_cancelled_login_keeps_slot_until_hash_finishes(small_queue):
+    async def scenario():
+        running = asyncio.create_task(attempt(0))
+        await asyncio.sleep(HASH_SECONDS / 5)  # операция уже выполняется в пуле
+        running.cancel()
+        await asyncio.sleep(0)
+        held = security._queued
+        await asyncio.sleep(HASH_SECONDS * 2)
+        return held, security._queued
+
+    held, released = asyncio.run(scenario())
+    assert held == 1
+    assert released == 0
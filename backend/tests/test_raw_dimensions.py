@@ -0,0 +1,60 @@
+# tests/test_raw_dimensions.py
+"""Справочники сырых данных: строки отчёта, сохранённые ключами, читаются через представление с исходным текстом."""
+import asyncio
+import json
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from app.api.v1.controllers.raw_data_controller import RawDataController
+from app.services.raw_dimensions import DimensionEncoder
+from app.sqlmodels.raw_excel_data import RAW_DIMENSIONS, ExcelReport, RawPlatform, RawUsageDataStrict
+
+ROWS = [
+    dict(row_index=0, period="2024-01", platform="Yandex Music", right_type="Смежные", territory="RU",
+         content_type="audio", usage_type="stream", performer_name_excel="Группа «Ёлка»", copyright="℗ Label",
+         track_title_excel="Песня", isrc="RU-A00-24-00001", quantity=100, total_royalty_author=Decimal("12.5000")),
+    dict(row_index=1, period="2024-01", platform="VK Music", right_type="Смежные", territory="RU",
+         content_type="audio", usage_type="download", performer_name_excel="Группа «Ёлка»", copyright="℗ Label",
+         track_title_excel="Песня 2", isrc="RU-A00-24-00002", quantity=3, total_royalty_author=Decimal("0.7500")),
+    dict(row_index=2, period="2024-02", platform="Yandex Music", right_type=None, territory="KZ",
+         content_type="video", usage_type="stream", performer_name_excel=None, copyright=None,
+         track_title_excel=None, isrc=None, quantity=0, total_royalty_author=None),
+]
+
+
+async def ingest(session_factory, rows, filename="report.xlsx"):
+    async with session_factory() as session:
+        report = ExcelReport(filename=filename, original_name=filename)
+        session.add(report)
+        await session.flush()
+        encoder = DimensionEncoder(session)
+        await encoder.load({name: {r.get(name) for r in rows} for name in RAW_DIMENSIONS})
+        session.add_all(RawUsageDataStrict(excel_report_id=report.id, **encoder.encode(r)) for r in rows)
+        await session.commit()
+        return report.id
+
+
+def test_rows_round_trip_through_the_decoded_view(session_factory):
+    async def scenario():
+        first = await ingest(session_factory, ROWS)
+        # Вторая загрузка с теми же значениями справочников новых строк в них не добавляет
+        second = await ingest(session_factory, ROWS[:2], "again.xlsx")
+        async with session_factory() as session:
+            response = await RawDataController(session).get_raw_data_by_report_id(first)
+            platforms = await session.scalar(select(func.count()).select_from(RawPlatform))
+            stored = (await session.execute(
+                select(RawUsageDataStrict).where(RawUsageDataStrict.excel_report_id == second)
+            )).scalars().all()
+        return json.loads(response.body), platforms, stored
+
+    decoded, platforms, stored = asyncio.run(scenario())
+    assert platforms == 2
+    assert len(decoded) == len(ROWS)
+    for original, row in zip(ROWS, decoded):
+        for name, value in original.items():
+            returned = Decimal(str(row[name])) if isinstance(value, Decimal) else row[name]
+            assert returned == value, name
+    # В самой таблице вместо текста — ключи справочников, общие для обеих загрузок
+    assert stored[0].platform_id != stored[1].platform_id
+    assert all(s.period_id == stored[0].period_id for s in stored)
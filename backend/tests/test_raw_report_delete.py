@@ -0,0 +1,91 @@
+# tests/test_raw_report_delete.py
+"""
+Удаление строк отчёта без секционирования (SQLite): обычный DELETE по excel_report_id, без DDL секций.
+На PostgreSQL тот же путь отсоединяет и удаляет секцию отчёта (app/services/raw_partitions.py).
+"""
+import asyncio
+
+from sqlalchemy import event, func, select
+
+from app.api.v1.controllers.raw_data_controller import RawDataController
+from app.services import raw_partitions
+from app.sqlmodels.raw_excel_data import ExcelReport, RawUsageDataStrict
+
+PARTITION_DDL = ("DETACH", "DROP", "TO_REGCLASS", "PARTITION")
+
+
+async def seed(session_factory, rows_per_report=(3, 2)):
+    async with session_factory() as session:
+        reports = [ExcelReport(filename=f"r{i}.xlsx", original_name=f"r{i}.xlsx") for i in range(len(rows_per_report))]
+        session.add_all(reports)
+        await session.flush()
+        session.add_all(
+            RawUsageDataStrict(excel_report_id=report.id, row_index=index)
+            for report, count in zip(reports, rows_per_report)
+            for index in range(count)
+        )
+        await session.commit()
+        return [report.id for report in reports]
+
+
+async def rows_by_report(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(RawUsageDataStrict.excel_report_id, func.count()).group_by(RawUsageDataStrict.excel_report_id)
+        )
+        return dict(result.all())
+
+
+def capture_statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    return statements, lambda: event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_delete_report_uses_plain_delete_without_partitions(db, session_factory):
+    deleted, kept = asyncio.run(seed(session_factory))
+    statements, stop = capture_statements(db)
+
+    async def scenario():
+        async with session_factory() as session:
+            assert raw_partitions.is_partitioned(session) is False
+            return await RawDataController(session).delete_report(deleted)
+
+    try:
+        response = asyncio.run(scenario())
+    finally:
+        stop()
+
+    assert response.deleted_report_id == deleted
+    assert asyncio.run(rows_by_report(session_factory)) == {kept: 2}
+    deletes = [s for s in statements if s.lstrip().upper().startswith("DELETE FROM RAW_USAGE_DATA_STRICT")]
+    assert len(deletes) == 1 and "excel_report_id" in deletes[0]
+    assert not [s for s in statements if any(word in s.upper() for word in PARTITION_DDL)]
+
+
+def test_failed_upload_on_sqlite_only_marks_the_report(db, session_factory):
+    report_id, _ = asyncio.run(seed(session_factory))
+    statements, stop = capture_statements(db)
+
+    async def scenario():
+        async with session_factory() as session:
+            await RawDataController(session)._mark_report_failed(report_id)
+        async with session_factory() as session:
+            return (await session.get(ExcelReport, report_id)).upload_status
+
+    try:
+        status = asyncio.run(scenario())
+    finally:
+        stop()
+
+    assert status == "failed"
+    assert not [s for s in statements if any(word in s.upper() for word in PARTITION_DDL)]
+
+
+def test_partition_name_is_per_report():
+    assert raw_partitions.partition_name(42) == "raw_usage_data_strict_p42"
+    assert raw_partitions.partition_name("7") == "raw_usage_data_strict_p7"
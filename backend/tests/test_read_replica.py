@@ -0,0 +1,98 @@
+# tests/test_read_replica.py
+"""
+Чтение с реплики: GET идёт в реплику, запись — в основную БД, и READ_YOUR_WRITES_SECONDS после записи
+чтения клиента (по токену в этом воркере, по cookie — в любом) остаются на основной БД.
+Основная БД и реплика — разные файлы SQLite с разными данными: по ответу видно, откуда он прочитан.
+"""
+import asyncio
+import time
+import types
+
+import pytest
+
+import app.database
+from app.database import PRIMARY_COOKIE
+from app.settings import settings
+from app.sqlmodels import Person
+from app.sqlmodels.user import Role
+from tests.conftest import create_database, sessionmaker_for
+
+PEOPLE_URL = "/api/v1/people/"
+
+
+async def add_person(session_factory, last_name):
+    async with session_factory() as session:
+        session.add(Person(last_name=last_name, first_name="X", email=f"{last_name}@example.com", is_approved=True))
+        await session.commit()
+
+
+@pytest.fixture
+def replica(tmp_path, db, session_factory, api, point_app_at, monkeypatch):
+    replica_engine = create_database(tmp_path / "replica.db")
+    asyncio.run(add_person(session_factory, "Primary"))
+    asyncio.run(add_person(sessionmaker_for(replica_engine), "Replica"))
+    # После фикстуры api: она направляет приложение только в основную БД
+    point_app_at(db, replica_engine)
+    monkeypatch.setattr(app.database, "_recent_writers", {})
+    yield replica_engine
+    asyncio.run(replica_engine.dispose())
+
+
+def names(response):
+    assert response.status_code == 200, response.text
+    return sorted(p["last_name"] for p in response.json())
+
+
+def test_reads_go_to_replica_and_stick_to_primary_after_write(replica, api, make_user, monkeypatch):
+    _, admin = make_user(Role.ADMIN)
+    _, manager = make_user(Role.MANAGER)
+
+    async def scenario():
+        async with api() as reader:
+            before = await reader.get(PEOPLE_URL, headers=admin)
+        async with api() as writer:
+            created = await writer.post(
+                PEOPLE_URL, headers=admin,
+                json={"last_name": "Written", "first_name": "X", "email": "written@example.com"},
+            )
+        # Новые клиенты без cookie: основную БД выбирает только отметка по токену
+        async with api() as same_token:
+            by_token = await same_token.get(PEOPLE_URL, headers=admin)
+        async with api() as other_token:
+            other = await other_token.get(PEOPLE_URL, headers=manager)
+        async with api() as with_cookie:
+            with_cookie.cookies.set(PRIMARY_COOKIE, created.cookies[PRIMARY_COOKIE])
+            by_cookie = await with_cookie.get(PEOPLE_URL, headers=manager)
+        return before, created, by_token, other, by_cookie
+
+    before, created, by_token, other, by_cookie = asyncio.run(scenario())
+    assert names(before) == ["Replica"]
+    assert created.status_code == 200, created.text
+    assert float(created.cookies[PRIMARY_COOKIE]) > time.time()
+    assert names(by_token) == ["Primary", "Written"]
+    assert names(other) == ["Replica"]
+    assert names(by_cookie) == ["Primary", "Written"]
+
+    # Окно read-your-writes истекло — снова реплика, и по токену, и по cookie
+    later = time.time() + settings.READ_YOUR_WRITES_SECONDS + 2
+    monkeypatch.setattr(app.database, "time", types.SimpleNamespace(time=lambda: later))
+
+    async def after_window():
+        async with api() as expired:
+            expired.cookies.set(PRIMARY_COOKIE, created.cookies[PRIMARY_COOKIE])
+            return await expired.get(PEOPLE_URL, headers=admin)
+
+    assert names(asyncio.run(after_window())) == ["Replica"]
+
+
+def test_without_replica_reads_use_primary(api, session_factory, make_user):
+    _, manager = make_user(Role.MANAGER)
+    asyncio.run(add_person(session_factory, "Primary"))
+
+    async def scenario():
+        async with api() as client:
+            return await client.get(PEOPLE_URL, headers=manager)
+
+    response = asyncio.run(scenario())
+    assert names(response) == ["Primary"]
+    assert PRIMARY_COOKIE not in response.cookies
@@ -0,0 +1,90 @@
+# tests/test_report_archive.py
+"""Архив отчётов: выгрузка в Parquet, аналитика по архиву и удаление выгруженных строк из БД."""
+import asyncio
+import json
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from app.api.v1.controllers.raw_data_controller import RawDataController
+from app.services import report_archive
+from app.services.raw_dimensions import DimensionEncoder
+from app.sqlmodels.raw_excel_data import RAW_DIMENSIONS, ExcelReport, RawUsageDataStrict
+
+
+def usage_row(index, period, platform, quantity, royalty):
+    return dict(row_index=index, period=period, platform=platform, isrc=f"ISRC-{index}",
+                quantity=quantity, calculated_total_royalty=Decimal(royalty))
+
+
+REPORT_ROWS = [
+    usage_row(0, "2024-01", "Yandex Music", 10, "1.5000"),
+    usage_row(1, "2024-01", "Yandex Music", 5, "0.2500"),
+    usage_row(2, "2024-01", "VK Music", 7, "2.0000"),
+    usage_row(3, "2024-02", None, 1, "0.1000"),
+]
+
+
+async def ingest(session_factory, rows):
+    async with session_factory() as session:
+        report = ExcelReport(filename="report.xlsx", original_name="report.xlsx")
+        session.add(report)
+        await session.flush()
+        encoder = DimensionEncoder(session)
+        await encoder.load({name: {r.get(name) for r in rows} for name in RAW_DIMENSIONS})
+        session.add_all(RawUsageDataStrict(excel_report_id=report.id, **encoder.encode(r)) for r in rows)
+        await session.commit()
+        return report.id
+
+
+def test_archive_query_and_prune_round_trip(session_factory, report_archive_dir):
+    async def controller_call(method, *args):
+        async with session_factory() as session:
+            return await getattr(RawDataController(session), method)(*args)
+
+    async def scenario():
+        archived = await ingest(session_factory, REPORT_ROWS)
+        not_archived = await ingest(session_factory, REPORT_ROWS[:1])
+        exported = await controller_call("archive_report", archived)
+        by_platform = await controller_call("query_archive", ["platform"], {"period": ["2024-01"]})
+        pruned = await controller_call("prune_archived_reports", 0)
+        after_prune = await controller_call("query_archive", [], {})
+        async with session_factory() as session:
+            rows_left = dict((await session.execute(
+                select(RawUsageDataStrict.excel_report_id, func.count()).group_by(RawUsageDataStrict.excel_report_id)
+            )).all())
+            statuses = {r.id: r.upload_status for r in (await session.execute(select(ExcelReport))).scalars()}
+        return archived, not_archived, exported, by_platform, pruned, after_prune, rows_left, statuses
+
+    archived, not_archived, exported, by_platform, pruned, after_prune, rows_left, statuses = asyncio.run(scenario())
+
+    assert (exported.rows, exported.files) == (4, 3)  # секции (период, площадка), NULL — своя секция
+    assert report_archive.read_manifest(archived)["rows"] == 4
+    assert list((report_archive_dir / "dataset").glob("period=2024-02/platform=__HIVE_DEFAULT_PARTITION__/*.parquet"))
+
+    groups = {row["platform"]: row for row in json.loads(by_platform.body)}
+    assert set(groups) == {"VK Music", "Yandex Music"}
+    assert (groups["Yandex Music"]["quantity"], groups["Yandex Music"]["rows"]) == (15, 2)
+    assert Decimal(str(groups["Yandex Music"]["calculated_total_royalty"])) == Decimal("1.75")
+
+    # Строки удалены только у выгруженного отчёта; аналитика по архиву после этого не меняется
+    assert pruned.pruned_report_ids == [archived]
+    assert rows_left == {not_archived: 1}
+    assert statuses == {archived: "archived", not_archived: "completed"}
+    totals, = json.loads(after_prune.body)
+    assert (totals["rows"], totals["quantity"]) == (4, 23)
+
+
+def test_prune_skips_reports_whose_archive_is_incomplete(session_factory):
+    async def scenario():
+        report_id = await ingest(session_factory, REPORT_ROWS)
+        async with session_factory() as session:
+            await RawDataController(session).archive_report(report_id)
+        # Строка, добавленная после выгрузки, в архив не попала — удалять строки отчёта нельзя
+        async with session_factory() as session:
+            session.add(RawUsageDataStrict(excel_report_id=report_id, row_index=99))
+            await session.commit()
+        async with session_factory() as session:
+            return await RawDataController(session).prune_archived_reports(0)
+
+    assert asyncio.run(scenario()).pruned_report_ids == []
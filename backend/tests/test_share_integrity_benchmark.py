@@ -0,0 +1,94 @@
+# tests/test_share_integrity_benchmark.py
+"""
+Бенчмарк проверки долей без БД: синтетическая матрица на 100 000 треков
+(3 доли персон и 2 артиста с долями на трек) с несколькими внесёнными нарушениями.
+Проверяется, что validate_share_matrix укладывается в секунды и находит ровно внесённые нарушения.
+Результаты — в выводе pytest -s.
+"""
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services import share_integrity  # noqa: E402
+from app.services.share_integrity import PERSON_SHARE_COLUMNS, ShareMatrix  # noqa: E402
+
+TRACKS = 100_000
+PERSONS_PER_TRACK = 3
+ARTISTS_PER_TRACK = 2
+PERSONS = 20_000
+ARTISTS = 10_000
+TIME_LIMIT_SECONDS = 5.0
+
+
+def synthetic_matrix() -> ShareMatrix:
+    """Корректный каталог: доли персон в сумме 90% объёма прав, доли артистов — 60 + 40."""
+    rng = np.random.default_rng(0)
+    track_id = np.arange(1, TRACKS + 1, dtype=np.int64)
+    scope = np.full(TRACKS, 100.0)
+    scope[::10] = np.nan  # объём не указан — считается 100
+
+    share_track_id = np.repeat(track_id, PERSONS_PER_TRACK)
+    share_person_id = rng.integers(1, PERSONS + 1, size=len(share_track_id), dtype=np.int64)
+    share_columns = {name: np.full(len(share_track_id), 30.0) for name in PERSON_SHARE_COLUMNS}
+
+    link_track_id = np.repeat(track_id, ARTISTS_PER_TRACK)
+    link_artist_id = rng.integers(1, ARTISTS + 1, size=len(link_track_id), dtype=np.int64)
+    # Два разных артиста на трек
+    link_artist_id[1::2] = (link_artist_id[0::2] % ARTISTS) + 1
+    artist_share_percent = np.tile([60.0, 40.0], TRACKS)
+
+    return ShareMatrix(
+        track_id=track_id,
+        scope_of_copyright=scope.copy(),
+        scope_of_related_rights=scope.copy(),
+        person_id=np.arange(1, PERSONS + 1, dtype=np.int64),
+        share_track_id=share_track_id,
+        share_person_id=share_person_id,
+        share_columns=share_columns,
+        link_track_id=link_track_id,
+        link_artist_id=link_artist_id,
+        artist_share_track_id=link_track_id.copy(),
+        artist_share_artist_id=link_artist_id.copy(),
+        artist_share_percent=artist_share_percent,
+    )
+
+
+def inject_violations(m: ShareMatrix) -> set:
+    """Портит несколько строк; возвращает ожидаемые (код, track_id)."""
+    m.scope_of_copyright[99] = 120.0  # трек 100
+    m.share_columns["copyrights"][3 * 499] = -5.0  # трек 500
+    m.share_columns["share_of_monetization_of_copyrights"][3 * 1999] = 50.0  # трек 2000: 50 + 30 + 30 > 100
+    m.share_person_id[3 * 4999] = PERSONS + 1  # трек 5000: персоны нет
+    m.artist_share_artist_id[2 * 9999] = ARTISTS + 1  # трек 10000: артист не связан с треком
+    m.artist_share_percent[2 * 49999] = 70.0  # трек 50000: 70 + 40 > 100
+    return {
+        (share_integrity.SCOPE_OUT_OF_RANGE, 100),
+        (share_integrity.SHARE_OUT_OF_RANGE, 500),
+        (share_integrity.AUTHOR_SUM_EXCEEDS_SCOPE, 2000),
+        (share_integrity.ORPHAN_PERSON_SHARE, 5000),
+        (share_integrity.ORPHAN_ARTIST_SHARE, 10000),
+        (share_integrity.ARTIST_SUM_EXCEEDS_100, 50000),
+    }
+
+
+def test_clean_catalog_has_no_violations():
+    report = share_integrity.validate_share_matrix(synthetic_matrix())
+    assert report.tracks_checked == TRACKS
+    assert report.violations == []
+
+
+def test_100k_tracks_validated_in_seconds_with_injected_violations():
+    matrix = synthetic_matrix()
+    expected = inject_violations(matrix)
+
+    started = time.perf_counter()
+    report = share_integrity.validate_share_matrix(matrix)
+    elapsed = time.perf_counter() - started
+
+    assert report.tracks_checked == TRACKS
+    assert report.links_checked == TRACKS * (PERSONS_PER_TRACK + ARTISTS_PER_TRACK)
+    assert {(v.code, v.track_id) for v in report.violations} == expected
+    assert elapsed < TIME_LIMIT_SECONDS
+    print(f"\nvalidate_share_matrix: {TRACKS} треков, {report.links_checked} долей — {elapsed * 1000:.0f} мс")
@@ -0,0 +1,43 @@
+# tests/test_sql_fingerprint.py
+"""Отпечатки SQL: запросы одной формы с разными литералами, параметрами и длиной списков сводятся к одному."""
+import pytest
+
+from app.services.sql_logging import fingerprint
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ("SELECT * FROM person WHERE last_name = 'O''Brien' AND id = 42",
+     "SELECT * FROM person WHERE last_name = ? AND id = ?"),
+    ("SELECT * FROM track WHERE share > 0.25", "SELECT * FROM track WHERE share > ?"),
+    ("SELECT * FROM track WHERE id = $1 AND album_id = $2", "SELECT * FROM track WHERE id = ? AND album_id = ?"),
+    ("SELECT * FROM track WHERE id = %(id_1)s OR isrc = %s", "SELECT * FROM track WHERE id = ? OR isrc = ?"),
+    ("SELECT *\n  FROM   track\tWHERE id = ?", "SELECT * FROM track WHERE id = ?"),
+    # Цифры внутри идентификаторов — не литералы
+    ("SELECT * FROM raw_usage_data_strict_p12 WHERE report_id = 7",
+     "SELECT * FROM raw_usage_data_strict_p12 WHERE report_id = ?"),
+    ("SELECT * FROM track WHERE id IN (__[POSTCOMPILE_id_1])", "SELECT * FROM track WHERE id IN (?)"),
+])
+def test_literals_and_placeholders_are_replaced(statement, expected):
+    assert fingerprint(statement) == expected
+
+
+def test_in_lists_of_any_length_share_a_fingerprint():
+    statements = [
+        "SELECT * FROM track WHERE id IN (1)",
+        "SELECT * FROM track WHERE id IN (1, 2, 3)",
+        "SELECT * FROM track WHERE id IN ($1, $2, $3, $4)",
+        "SELECT * FROM track WHERE id IN (?,?)",
+        "SELECT * FROM track WHERE id IN ('A', 'B')",
+    ]
+    assert {fingerprint(s) for s in statements} == {"SELECT * FROM track WHERE id IN (?)"}
+
+
+def test_multi_row_values_collapse_to_one_row():
+    one = fingerprint("INSERT INTO track_artist (track_id, artist_id) VALUES (1, 2)")
+    many = fingerprint("INSERT INTO track_artist (track_id, artist_id) VALUES ($1, $2), ($3, $4), ($5, $6)")
+    assert one == many == "INSERT INTO track_artist (track_id, artist_id) VALUES (?)"
+
+
+def test_different_shapes_keep_different_fingerprints():
+    assert fingerprint("SELECT * FROM track WHERE id = 1") != fingerprint("SELECT * FROM album WHERE id = 1")
+    assert fingerprint("SELECT * FROM track WHERE id = 1") != fingerprint("SELECT * FROM track WHERE id > 1")
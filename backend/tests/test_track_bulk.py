@@ -0,0 +1,106 @@
+# tests/test_track_bulk.py
+"""POST /tracks/bulk: связи и доли создаются у каждого трека, а ошибка записи откатывает всю пачку."""
+import asyncio
+
+from sqlalchemy import func, select, text
+
+from app.sqlmodels import Album, Artist, Person, Track, TrackArtist, TrackPersonShare
+from app.sqlmodels.user import Role
+
+BULK_URL = "/api/v1/tracks/bulk"
+
+
+async def seed(session_factory):
+    async with session_factory() as session:
+        album = Album(title="Album", type="album", is_approved=True)
+        artists = [Artist(name="Band", is_approved=True), Artist(name="Solo", is_approved=True)]
+        people = [Person(last_name=f"Person {i}", first_name="X", email=f"p{i}@example.com", is_approved=True)
+                  for i in range(3)]
+        session.add_all([album, *artists, *people])
+        await session.commit()
+        return album.id, [a.id for a in artists], [p.id for p in people]
+
+
+def track_item(index, album_id, artist_ids, person_ids):
+    return {
+        "title": f"Song {index}",
+        "album_id": album_id,
+        "isrc": f"RU-A00-24-{index:05d}",
+        "artist_ids": artist_ids,
+        "author_rights": [{"person_id": p, "share": 50, "licensor_share": 100} for p in person_ids],
+        # Персона с авторской и смежной долей получает одну строку — авторская приоритетнее
+        "neighboring_rights": [{"person_id": person_ids[0], "share": 30, "licensor_share": 100}],
+    }
+
+
+async def table_counts(session_factory):
+    async with session_factory() as session:
+        return {
+            model.__name__: await session.scalar(select(func.count()).select_from(model))
+            for model in (Track, TrackArtist, TrackPersonShare)
+        }
+
+
+def test_bulk_creates_links_and_shares_for_every_track(api, session_factory, make_user):
+    _, admin = make_user(Role.ADMIN)
+    album_id, artist_ids, person_ids = asyncio.run(seed(session_factory))
+    items = [track_item(i, album_id, artist_ids, person_ids[:2]) for i in range(3)]
+    items.insert(1, track_item(9, album_id + 100, artist_ids, person_ids[:1]))
+
+    async def scenario():
+        async with api() as client:
+            return await client.post(BULK_URL, json={"tracks": items}, headers=admin)
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["created"], body["failed"]) == (3, 1)
+    assert [r["status"] for r in body["results"]] == ["created", "error", "created", "created"]
+    assert body["results"][1]["error"] == "Album not found"
+
+    async def relations():
+        async with session_factory() as session:
+            links = (await session.execute(select(TrackArtist.track_id, TrackArtist.artist_id))).all()
+            shares = (await session.execute(
+                select(TrackPersonShare.track_id, TrackPersonShare.person_id,
+                       TrackPersonShare.share_of_monetization_of_copyrights)
+            )).all()
+            return links, shares
+
+    links, shares = asyncio.run(relations())
+    track_ids = [r["track_id"] for r in body["results"] if r["status"] == "created"]
+    assert sorted(links) == sorted((t, a) for t in track_ids for a in artist_ids)
+    assert sorted(shares) == sorted((t, p, 50.0) for t in track_ids for p in person_ids[:2])
+
+
+def test_bulk_rolls_back_every_track_when_one_row_fails_to_write(api, db, session_factory, make_user):
+    _, admin = make_user(Role.ADMIN)
+    album_id, artist_ids, person_ids = asyncio.run(seed(session_factory))
+    bad_person = person_ids[2]
+
+    async def fail_share_insert():
+        # Строка проходит проверки контроллера, но отвергается БД при вставке долей
+        async with db.begin() as connection:
+            await connection.execute(text(
+                "CREATE TRIGGER reject_share BEFORE INSERT ON track_person_share "
+                f"WHEN NEW.person_id = {bad_person} BEGIN SELECT RAISE(ABORT, 'rejected share'); END"
+            ))
+
+    asyncio.run(fail_share_insert())
+    before = asyncio.run(table_counts(session_factory))
+    items = [
+        track_item(0, album_id, artist_ids, person_ids[:1]),
+        track_item(1, album_id, artist_ids, [person_ids[0], bad_person]),
+        track_item(2, album_id, artist_ids, person_ids[:1]),
+    ]
+
+    async def scenario():
+        async with api() as client:
+            return await client.post(BULK_URL, json={"tracks": items}, headers=admin)
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 500
+    assert "rejected share" in response.json()["detail"]
+    assert asyncio.run(table_counts(session_factory)) == before == {
+        "Track": 0, "TrackArtist": 0, "TrackPersonShare": 0,
+    }
@@ -0,0 +1,141 @@
+# tests/test_track_detail.py
+"""
+Карточка трека: имена правообладателей и участники артистов приходят в ответе, без запросов клиента
+за каждой персоной. Бенчмарк под параллельной нагрузкой сравнивает загрузку в несколько запросов
+с прежней схемой «запрос на каждую связь» (альбом, связи, артисты, участники, доли, персоны).
+Результаты — в выводе pytest -s.
+"""
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event, select
+
+from app.api.v1.controllers.track import TrackController
+from app.sqlmodels import Album, Artist, ArtistPerson, Person, Track, TrackArtist, TrackPersonShare
+from app.sqlmodels.user import Role
+
+WORKERS = 20
+REQUESTS_PER_WORKER = 10
+
+
+async def seed(session_factory) -> int:
+    async with session_factory() as session:
+        album = Album(title="Album", type="album", is_approved=True)
+        people = [
+            Person(last_name="Petrov", first_name="Ivan", middle_name="Ivanovich", email="p0@example.com",
+                   is_approved=True),
+            Person(last_name="Sidorova", first_name="Anna", email="p1@example.com", is_approved=True),
+            Person(last_name="Kuznetsov", first_name="Oleg", email="p2@example.com", is_approved=True),
+        ]
+        artists = [Artist(name="Band", is_approved=True), Artist(name="Solo", is_approved=True)]
+        session.add_all([album, *people, *artists])
+        await session.flush()
+        track = Track(title="Song", isrc="RU-A00-24-00001", album_id=album.id, is_approved=True)
+        session.add(track)
+        await session.flush()
+        session.add_all([
+            TrackArtist(track_id=track.id, artist_id=artists[0].id),
+            TrackArtist(track_id=track.id, artist_id=artists[1].id),
+            ArtistPerson(artist_id=artists[0].id, person_id=people[0].id),
+            ArtistPerson(artist_id=artists[0].id, person_id=people[1].id),
+            ArtistPerson(artist_id=artists[1].id, person_id=people[2].id),
+            *(
+                TrackPersonShare(
+                    track_id=track.id, person_id=p.id,
+                    share_of_monetization_of_copyrights=30, share_of_monetization_of_related_rights=20,
+                )
+                for p in people
+            ),
+        ])
+        await session.commit()
+        return track.id
+
+
+async def load_per_relation(session, track_id: int) -> dict:
+    """Прежняя схема загрузки карточки: отдельный запрос на каждую связь и на каждую персону."""
+    track = (await session.execute(select(Track).where(Track.id == track_id))).scalar_one()
+    album = await session.get(Album, track.album_id)
+    artist_ids = (await session.execute(
+        select(TrackArtist.artist_id).where(TrackArtist.track_id == track_id)
+    )).scalars().all()
+    artists = (await session.execute(select(Artist).where(Artist.id.in_(artist_ids)))).scalars().all()
+    members = {}
+    for artist in artists:
+        person_ids = (await session.execute(
+            select(ArtistPerson.person_id).where(ArtistPerson.artist_id == artist.id)
+        )).scalars().all()
+        members[artist.id] = (await session.execute(select(Person).where(Person.id.in_(person_ids)))).scalars().all()
+    shares = (await session.execute(
+        select(TrackPersonShare).where(TrackPersonShare.track_id == track_id)
+    )).scalars().all()
+    names = {share.person_id: await session.get(Person, share.person_id) for share in shares}
+    return {"track": track, "album": album, "artists": artists, "members": members, "names": names}
+
+
+def test_detail_includes_person_names_and_members(api, session_factory, make_user):
+    _, headers = make_user(Role.MANAGER)
+    track_id = asyncio.run(seed(session_factory))
+
+    async def scenario():
+        async with api() as client:
+            return await client.get(f"/api/v1/tracks/{track_id}", headers=headers)
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200, response.text
+    detail = response.json()
+    assert detail["album_title"] == "Album"
+    assert sorted(s["person_name"] for s in detail["track_person_shares"]) == [
+        "Kuznetsov Oleg", "Petrov Ivan Ivanovich", "Sidorova Anna",
+    ]
+    members = {a["name"]: sorted(m["last_name"] for m in a["members"]) for a in detail["artists"]}
+    assert members == {"Band": ["Petrov", "Sidorova"], "Solo": ["Kuznetsov"]}
+
+
+def test_detail_query_count_does_not_grow_with_relations(db, session_factory, make_user):
+    admin, _ = make_user(Role.ADMIN)
+    track_id = asyncio.run(seed(session_factory))
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def scenario():
+        async with session_factory() as session:
+            event.listen(db.sync_engine, "before_cursor_execute", count)
+            try:
+                return await TrackController(session).get_track_by_id(track_id, admin)
+            finally:
+                event.remove(db.sync_engine, "before_cursor_execute", count)
+
+    detail = asyncio.run(scenario())
+    assert len(detail.track_person_shares) == 3
+    # Трек с альбомом и долями, артисты с участниками, доли артистов
+    assert len(statements) == 3
+
+
+def test_detail_latency_under_concurrent_load(session_factory, make_user):
+    admin, _ = make_user(Role.ADMIN)
+    track_id = asyncio.run(seed(session_factory))
+
+    async def run(load):
+        async def worker():
+            samples = []
+            for _ in range(REQUESTS_PER_WORKER):
+                started = time.perf_counter()
+                async with session_factory() as session:
+                    await load(session)
+                samples.append(time.perf_counter() - started)
+            return samples
+
+        started = time.perf_counter()
+        samples = sorted(s for batch in await asyncio.gather(*(worker() for _ in range(WORKERS))) for s in batch)
+        return statistics.median(samples), samples[int(len(samples) * 0.95)], len(samples) / (time.perf_counter() - started)
+
+    current = asyncio.run(run(lambda session: TrackController(session).get_track_by_id(track_id, admin)))
+    previous = asyncio.run(run(lambda session: load_per_relation(session, track_id)))
+
+    for name, (p50, p95, rps) in (("запрос на связь", previous), ("eager-загрузка", current)):
+        print(f"\nкарточка трека, {name}: p50 {p50 * 1000:.1f} мс, p95 {p95 * 1000:.1f} мс, "
+              f"{rps:.0f} карточек/с ({WORKERS} параллельных клиентов)", end="")
+    print()
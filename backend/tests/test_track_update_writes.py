@@ -0,0 +1,113 @@
+# tests/test_track_update_writes.py
+"""
+Повторное сохранение трека без изменений не должно писать в таблицы связей:
+ни DELETE + INSERT всех артистов и долей, ни UPDATE с теми же значениями.
+Запросы считаются слушателем before_cursor_execute на SQLite.
+"""
+import asyncio
+import re
+from collections import Counter
+
+from sqlalchemy import event, select
+
+from app.api.v1.controllers.track import TrackController
+from app.api.v1.models.track import TrackArtistShareItem, TrackUpdateRequest
+from app.sqlmodels import Album, Artist, Track, TrackArtist
+from app.sqlmodels.track_artist_share import TrackArtistShare
+from app.sqlmodels.user import Role, User
+
+LINK_TABLES = ("trackartist", "track_artist_share")
+WRITE = re.compile(r"^\s*(INSERT INTO|UPDATE|DELETE FROM)\s+\"?(\w+)", re.IGNORECASE)
+SAVES = 20
+
+
+class WriteCounter:
+    def __init__(self):
+        self.writes = Counter()
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        match = WRITE.match(statement)
+        if match and match.group(2) in LINK_TABLES:
+            self.writes[(match.group(1).split()[0].upper(), match.group(2))] += 1
+
+
+async def seed(session_factory):
+    async with session_factory() as session:
+        admin = User(email="admin@example.com", hashed_password="x", role=Role.ADMIN)
+        album = Album(title="Album", type="single", is_approved=True)
+        artists = [Artist(name=f"Artist {i}", is_approved=True) for i in range(3)]
+        session.add_all([admin, album, *artists])
+        await session.flush()
+        track = Track(title="Track", isrc="RU-A00-24-00001", album_id=album.id, is_approved=True)
+        session.add(track)
+        await session.flush()
+        session.add_all(TrackArtist(track_id=track.id, artist_id=a.id) for a in artists)
+        session.add_all(
+            TrackArtistShare(track_id=track.id, artist_id=a.id, percent=p)
+            for a, p in zip(artists, (50.0, 33.33, 16.67))
+        )
+        await session.commit()
+        return admin, track.id, [a.id for a in artists]
+
+
+async def save(session_factory, admin, track_id, data):
+    async with session_factory() as session:
+        await TrackController(session).update_track(track_id, data, admin)
+
+
+async def shares(session_factory, track_id):
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(TrackArtistShare.artist_id, TrackArtistShare.percent).where(TrackArtistShare.track_id == track_id)
+        )
+        return dict(rows.all())
+
+
+def test_repeated_noop_updates_do_not_touch_link_tables(db, session_factory):
+    admin, track_id, artist_ids = asyncio.run(seed(session_factory))
+    # Форма сохраняет трек целиком: те же артисты и доли (33.333 хранится как 33.33)
+    unchanged = TrackUpdateRequest(
+        title="Track",
+        artist_ids=artist_ids,
+        artist_shares=[
+            TrackArtistShareItem(artist_id=a, percent=p) for a, p in zip(artist_ids, (50, 33.333, 16.67))
+        ],
+    )
+
+    counter = WriteCounter()
+    event.listen(db.sync_engine, "before_cursor_execute", counter)
+    try:
+        for _ in range(SAVES):
+            asyncio.run(save(session_factory, admin, track_id, unchanged))
+    finally:
+        event.remove(db.sync_engine, "before_cursor_execute", counter)
+
+    print(f"\n{SAVES} сохранений без изменений: записи в связи {dict(counter.writes) or 0}")
+    assert counter.writes == Counter()
+
+
+def test_changed_shares_write_only_the_difference(db, session_factory):
+    admin, track_id, artist_ids = asyncio.run(seed(session_factory))
+    first, second, third = artist_ids
+    # Третий артист убран, доля второго изменена
+    data = TrackUpdateRequest(
+        artist_ids=[first, second],
+        artist_shares=[
+            TrackArtistShareItem(artist_id=first, percent=50),
+            TrackArtistShareItem(artist_id=second, percent=50),
+        ],
+    )
+
+    counter = WriteCounter()
+    event.listen(db.sync_engine, "before_cursor_execute", counter)
+    try:
+        asyncio.run(save(session_factory, admin, track_id, data))
+    finally:
+        event.remove(db.sync_engine, "before_cursor_execute", counter)
+
+    assert asyncio.run(shares(session_factory, track_id)) == {first: 50.0, second: 50.0}
+    assert counter.writes == Counter({
+        ("DELETE", "trackartist"): 1,
+        ("DELETE", "track_artist_share"): 1,
+        ("UPDATE", "track_artist_share"): 1,
+    })
@@ -0,0 +1,137 @@
+# tests/test_user_cache.py
+"""
+Кэш пользователей get_current_user: изменения пользователя в этом воркере сразу отзывают кэш и подписанные
+данные в ранее выданных токенах. Бенчмарк p50 простого авторизованного запроса — в выводе pytest -s.
+"""
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from jose import jwt
+from sqlalchemy import update
+
+from app.api.v1.controllers.managers import UserController
+from app.services import user_cache as user_cache_module
+from app.services.user_cache import CLAIM, UserCache, user_claim, user_from_claim
+from app.settings import settings
+from app.sqlmodels.user import Role, User
+
+DEBUG_URL = "/debug-test"
+REQUESTS = 200
+
+
+def claim_token(user: User, issued_at: float) -> dict:
+    token = jwt.encode(
+        {"sub": user.email, "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+         CLAIM: user_claim(user, issued_at)},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_deactivation_and_role_change_invalidate_cached_user(api, session_factory, make_user):
+    admin, _ = make_user(Role.ADMIN)
+    manager, manager_headers = make_user(Role.MANAGER)
+    promoted, promoted_headers = make_user(Role.MANAGER)
+
+    async def scenario():
+        async with api() as client:
+            warm = [await client.get(DEBUG_URL, headers=h) for h in (manager_headers, promoted_headers)]
+            assert user_cache_module.user_cache.get(manager.email) is not None
+            async with session_factory() as session:
+                await UserController(session).deactivate_manager(manager.id, admin)
+            async with session_factory() as session:
+                user = await session.get(User, promoted.id)
+                user.role = Role.ADMIN
+                await session.commit()
+            return warm, await client.get(DEBUG_URL, headers=manager_headers), \
+                await client.get(DEBUG_URL, headers=promoted_headers)
+
+    warm, deactivated, changed_role = asyncio.run(scenario())
+    assert [r.status_code for r in warm] == [200, 200]
+    assert deactivated.status_code == 401
+    assert changed_role.json()["user_role"] == Role.ADMIN.value
+
+
+def test_bulk_update_clears_the_whole_cache(api, session_factory, make_user):
+    manager, headers = make_user(Role.MANAGER)
+
+    async def scenario():
+        async with api() as client:
+            await client.get(DEBUG_URL, headers=headers)
+            async with session_factory() as session:
+                await session.execute(update(User).where(User.id == manager.id).values(is_active=False))
+                await session.commit()
+            return await client.get(DEBUG_URL, headers=headers)
+
+    assert asyncio.run(scenario()).status_code == 401
+
+
+def test_claim_issued_before_invalidation_is_rejected(api, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "USER_CLAIM_TTL_SECONDS", 60)
+    manager, _ = make_user(Role.MANAGER)
+    other, _ = make_user(Role.MANAGER)
+    cache = user_cache_module.user_cache
+    issued = time.time() - 10
+    payload = {"sub": manager.email, CLAIM: user_claim(manager, issued)}
+    other_payload = {"sub": other.email, CLAIM: user_claim(other, issued)}
+
+    assert user_from_claim(payload, manager.email).id == manager.id
+    cache.invalidate_user(manager.id)
+    assert user_from_claim(payload, manager.email) is None
+    # Сброс одного пользователя не трогает токены остальных
+    assert user_from_claim(other_payload, other.email).id == other.id
+    # Токен, выданный после сброса (iat — целые секунды), снова принимается без поиска
+    fresh = {"sub": manager.email, CLAIM: user_claim(manager, time.time() + 1)}
+    assert user_from_claim(fresh, manager.email).role == Role.MANAGER
+    # Массовое изменение пользователей отзывает подписанные данные во всех ранее выданных токенах
+    cache.clear()
+    assert user_from_claim(other_payload, other.email) is None
+
+
+def test_deactivated_user_with_a_live_claim_gets_401_in_this_worker(api, session_factory, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "USER_CLAIM_TTL_SECONDS", 60)
+    admin, _ = make_user(Role.ADMIN)
+    manager, _ = make_user(Role.MANAGER)
+    headers = claim_token(manager, time.time() - 1)
+
+    async def scenario():
+        async with api() as client:
+            before = await client.get(DEBUG_URL, headers=headers)
+            async with session_factory() as session:
+                await UserController(session).deactivate_manager(manager.id, admin)
+            return before, await client.get(DEBUG_URL, headers=headers)
+
+    before, after = asyncio.run(scenario())
+    assert (before.status_code, after.status_code) == (200, 401)
+
+
+def test_authenticated_request_p50_with_and_without_cache(api, make_user, monkeypatch):
+    manager, headers = make_user(Role.MANAGER)
+
+    async def p50(request_headers) -> float:
+        async with api() as client:
+            samples = []
+            for _ in range(REQUESTS):
+                started = time.perf_counter()
+                response = await client.get(DEBUG_URL, headers=request_headers)
+                samples.append(time.perf_counter() - started)
+                assert response.status_code == 200
+            return statistics.median(samples)
+
+    def use_cache(ttl_seconds):
+        cache = UserCache(ttl_seconds, settings.USER_CACHE_MAX_SIZE)
+        monkeypatch.setattr("app.services.user_cache.user_cache", cache)
+        monkeypatch.setattr("app.deps.user_cache", cache)
+
+    use_cache(0)
+    uncached = asyncio.run(p50(headers))
+    use_cache(settings.USER_CACHE_TTL_SECONDS)
+    cached = asyncio.run(p50(headers))
+    monkeypatch.setattr(settings, "USER_CLAIM_TTL_SECONDS", 60)
+    claimed = asyncio.run(p50(claim_token(manager, time.time())))
+
+    print(f"\nGET {DEBUG_URL}, p50 из {REQUESTS}: поиск в БД — {uncached * 1000:.2f} мс, "
+          f"кэш — {cached * 1000:.2f} мс, подписанные данные в токене — {claimed * 1000:.2f} мс")